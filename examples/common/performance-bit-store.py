@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+'''
+Pymodbus Bit Datastore Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the packed bit datastore
+against the list backed sequential datastore for a full coil table: the
+memory each takes, and the time to serve a read coils request (which
+is executed against the datastore and encoded) and a write coils
+request (which is decoded and executed against the datastore).
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import sys
+from pymodbus.datastore import ModbusSlaveContext
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusBitDataBlock
+from pymodbus.bit_read_message import ReadCoilsRequest
+from pymodbus.bit_write_message import WriteMultipleCoilsRequest
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+count  = 10000
+blocks = [('list', ModbusSequentialDataBlock), ('packed', ModbusBitDataBlock)]
+write  = WriteMultipleCoilsRequest(0x03, [True, False] * 400).encode()
+
+def size(block):
+    ''' The bytes used by the values of a datastore (the bools are shared) '''
+    if hasattr(block, 'memory'): return sys.getsizeof(block.memory)
+    return sys.getsizeof(block.values)
+
+def read(context):
+    ''' Serves a read of the most coils allowed '''
+    ReadCoilsRequest(0x03, 2000).execute(context).encode()
+
+def written(context):
+    ''' Serves a write of 800 coils '''
+    request = WriteMultipleCoilsRequest()
+    request.decode(write)
+    request.execute(context)
+
+def measure(method, context):
+    ''' Returns the time per call of the supplied method '''
+    start = time()
+    for _ in xrange(count): method(context)
+    return (time() - start) * 1e6 / count
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+for name, block in blocks:
+    store   = block.create()
+    context = ModbusSlaveContext(co=store)
+    print "%-6s: %7d bytes/table, read %.2f us, write %.2f us" % (name,
+        size(store), measure(read, context), measure(written, context))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+'''
+Pymodbus Bit Packing Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the bit packing functions
+used by the coil and discrete input messages against the previous bit at
+a time versions on a full (2000 bit) frame.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+from pymodbus.utilities import pack_bitstring, unpack_bitstring
+from time import time
+
+#---------------------------------------------------------------------------#
+# the previous implementation
+#---------------------------------------------------------------------------#
+def pack_bitstring_baseline(bits):
+    ''' Packs the bits a bit at a time '''
+    ret = ''
+    i = packed = 0
+    for bit in bits:
+        if bit: packed += 128
+        i += 1
+        if i == 8:
+            ret += chr(packed)
+            i = packed = 0
+        else: packed >>= 1
+    if i > 0 and i < 8:
+        packed >>= (7 - i)
+        ret += chr(packed)
+    return ret
+
+def unpack_bitstring_baseline(string):
+    ''' Unpacks the bits a bit at a time '''
+    bits = []
+    for byte in range(len(string)):
+        value = ord(string[byte])
+        for bit in range(8):
+            bits.append((value & 1) == 1)
+            value >>= 1
+    return bits
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+count  = 10000
+bits   = [(i * 7) % 3 == 0 for i in range(2000)]
+packed = pack_bitstring(bits)
+assert packed == pack_bitstring_baseline(bits)
+assert unpack_bitstring(packed) == unpack_bitstring_baseline(packed)
+
+tests = [
+    ('pack baseline',    pack_bitstring_baseline,   bits),
+    ('pack',             pack_bitstring,            bits),
+    ('unpack baseline',  unpack_bitstring_baseline, packed),
+    ('unpack',           unpack_bitstring,          packed),
+    ('unpack compact',   lambda s: unpack_bitstring(s, compact=True), packed),
+]
+for name, method, data in tests:
+    start = time()
+    for _ in xrange(count): method(data)
+    stop  = time()
+    print "%-16s: %.2f us/2000 bits" % (name, (stop - start) * 1e6 / count)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+'''
+Pymodbus Checked Read Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of serving a read of ten
+holding registers by validating and then reading the values (the two
+calls a context that does not override getValuesChecked falls back to)
+against validating and reading them in one pass, for:
+
+* a local slave context
+* a remote slave context talking to a server on this machine (where
+  every call is a request to that server)
+* a database slave context on an in memory sqlite database (where every
+  call is a query, this one needs sqlalchemy)
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import threading
+from pymodbus.interfaces import IModbusSlaveContext
+from pymodbus.datastore import ModbusServerContext, ModbusSlaveContext
+from pymodbus.datastore.remote import RemoteSlaveContext
+from pymodbus.server.sync import ModbusTcpServer
+from pymodbus.client.sync import ModbusTcpClient
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+address = ('127.0.0.1', 0)     # the server picks a free port
+
+def separate(context):
+    ''' Validates and then reads the values with two calls '''
+    return IModbusSlaveContext.getValuesChecked(context, 3, 0x10, 10)
+
+def checked(context):
+    ''' Validates and reads the values in one pass '''
+    return context.getValuesChecked(3, 0x10, 10)
+
+def measure(method, context, count):
+    ''' Returns the time per call of the supplied method '''
+    assert method(context) == checked(context)
+    start = time()
+    for _ in xrange(count): method(context)
+    return (time() - start) * 1e6 / count
+
+def local():
+    ''' A local slave context '''
+    return ModbusSlaveContext()
+
+def remote():
+    ''' A remote slave context to a server on this machine '''
+    server = ModbusTcpServer(ModbusServerContext(slaves=ModbusSlaveContext()),
+        address=address)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    client = ModbusTcpClient(*server.server_address)
+    client.connect()
+    return RemoteSlaveContext(client)
+
+def database():
+    ''' A database slave context on an in memory database '''
+    from pymodbus.datastore.database import DatabaseSlaveContext
+    context = DatabaseSlaveContext(database='sqlite://')
+    context.setValues(3, 0x00, range(100))
+    return context
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+for name, build, count in [('local', local, 100000), ('remote', remote, 2000),
+    ('database', database, 2000)]:
+    try: context = build()
+    except ImportError, ex:
+        print "%-8s: skipped (%s)" % (name, ex)
+        continue
+    print "%-8s: separate %8.2f us, checked %8.2f us" % (name,
+        measure(separate, context, count), measure(checked, context, count))
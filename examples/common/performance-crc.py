@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+'''
+Pymodbus CRC Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the crc16 used by the rtu
+and binary framers against the previous character at a time version for
+a short (8 byte) request frame and a full (256 byte) rtu frame.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+from pymodbus.utilities import computeCRC, updateCRC
+from time import time
+
+#---------------------------------------------------------------------------#
+# the previous implementation
+#---------------------------------------------------------------------------#
+def generate_table():
+    ''' Generates the crc16 byte lookup table '''
+    result = []
+    for byte in range(256):
+        crc = 0x0000
+        for bit in range(8):
+            if (byte ^ crc) & 0x0001:
+                crc = (crc >> 1) ^ 0xa001
+            else: crc >>= 1
+            byte >>= 1
+        result.append(crc)
+    return result
+table = generate_table()
+
+def computeCRCBaseline(data):
+    ''' The character at a time crc16 '''
+    crc = 0xffff
+    for a in data:
+        idx = table[(crc ^ ord(a)) & 0xff];
+        crc = ((crc >> 8) & 0xff) ^ idx
+    return ((crc << 8) & 0xff00) | ((crc >> 8) & 0x00ff)
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+count = 100000
+for size in [8, 256]:
+    frame = ''.join(chr((i * 37 + 11) & 0xff) for i in range(size))
+    assert computeCRC(frame) == computeCRCBaseline(frame)
+    computeCRC(frame)    # build the lookup tables before timing
+
+    for name, method in [('baseline', computeCRCBaseline), ('computeCRC', computeCRC)]:
+        start = time()
+        for _ in xrange(count): method(frame)
+        stop  = time()
+        print "%3d bytes %-10s: %.2f us/frame" % (size, name,
+            (stop - start) * 1e6 / count)
+
+    #-----------------------------------------------------------------------#
+    # the frame arriving in 64 byte chunks
+    #-----------------------------------------------------------------------#
+    chunks = [frame[i:i + 64] for i in range(0, size, 64)]
+    start = time()
+    for _ in xrange(count):
+        crc = 0xffff
+        for chunk in chunks: crc = updateCRC(crc, chunk)
+    stop  = time()
+    print "%3d bytes %-10s: %.2f us/frame" % (size, 'updateCRC',
+        (stop - start) * 1e6 / count)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+'''
+Pymodbus Framer Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the socket framer when
+a burst of back to back MBAP frames arrives in a single recv (say from
+a master that pipelines its requests). The framer should scale linearly
+with the size of the burst.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+from pymodbus.factory import ServerDecoder
+from pymodbus.transaction import ModbusSocketFramer
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+frame = "\x00\x01\x00\x00\x00\x06\x01\x03\x00\x0a\x00\x01"
+total = 16 * 1024 * 1024    # bytes to push through the framer per burst size
+
+def callback(request):
+    ''' Counts each decoded request '''
+    callback.count += 1
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+for size in [64 * 1024, 1024 * 1024]:
+    burst  = frame * (size / len(frame))
+    framer = ModbusSocketFramer(ServerDecoder())
+    callback.count = 0
+    start  = time()
+    for _ in xrange(total / size):
+        framer.processIncomingPacket(burst, callback)
+    stop   = time()
+
+    #-----------------------------------------------------------------------#
+    # check our results
+    #-----------------------------------------------------------------------#
+    print "%4d KB burst: %d frames/second, %.2f MB/second" % (size / 1024,
+        (1.0 * callback.count) / (stop - start),
+        (1.0 * len(burst) * (total / size)) / (stop - start) / 2**20)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+'''
+Pymodbus Logging Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of what the debug logging in
+the hot paths costs per request while debug logging is turned off. The
+previous unguarded calls are compared with the guarded tracer, first for
+the log statements alone and then for a whole request going through the
+framer, decoder, and datastore with tracing off and on.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import logging
+from pymodbus import trace
+from pymodbus.factory import ServerDecoder
+from pymodbus.transaction import ModbusSocketFramer
+from pymodbus.datastore import ModbusSlaveContext
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+count   = 100000
+frame   = "\x00\x01\x00\x00\x00\x06\x01\x03\x00\x0a\x00\x01"
+context = ModbusSlaveContext()
+_logger = logging.getLogger('pymodbus.benchmark')
+_trace  = trace.getTracer('pymodbus.benchmark')
+trace.disable()
+
+def unguarded():
+    ''' The log statements of a request as they were '''
+    _logger.debug(" ".join([hex(ord(x)) for x in frame]))
+    _logger.debug("Factory Request[%d]" % 3)
+    _logger.debug("getValues[%d] %d:%d" % (3, 11, 1))
+
+def guarded():
+    ''' The log statements of a request behind the tracer '''
+    if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in frame]))
+    if _trace.enabled: _trace.debug("Factory Request[%d]", 3)
+    if _trace.enabled: _trace.debug("getValues[%d] %d:%d", 3, 11, 1)
+
+def request():
+    ''' Frames, decodes, and executes a single request '''
+    for message in framer.processIncomingFrames(frame):
+        message.execute(context)
+
+def measure(name, method):
+    ''' Prints the time per call of the supplied method '''
+    start = time()
+    for _ in xrange(count): method()
+    stop  = time()
+    print "%-24s: %.2f us/request" % (name, (stop - start) * 1e6 / count)
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+framer = ModbusSocketFramer(ServerDecoder())
+measure('log statements (before)', unguarded)
+measure('log statements (after)', guarded)
+measure('request (tracing off)', request)
+
+logging.getLogger('pymodbus').addHandler(logging.NullHandler())
+trace.enable()
+measure('request (tracing on)', request)
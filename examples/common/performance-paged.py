@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+'''
+Pymodbus Paged Datastore Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of a server context with 247
+slaves: how long it takes to create and how much memory its datastores
+take with list backed sequential datastores, the default (packed bit and
+register array) datastores, and lazily allocated paged datastores. The
+memory is measured again after a few hundred registers of every slave
+were written, and the time to serve a read is measured against that.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import sys
+from pymodbus.datastore import ModbusServerContext, ModbusSlaveContext
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusPagedDataBlock
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+slaves = 247
+count  = 10000
+tables = {'di': False, 'co': False, 'ir': 0x00, 'hr': 0x00}
+
+def sequential():
+    ''' A slave with list backed datastores '''
+    return ModbusSlaveContext(**dict((name, ModbusSequentialDataBlock.create())
+        for name in tables))
+
+def paged():
+    ''' A slave with lazily allocated datastores '''
+    return ModbusSlaveContext(**dict((name, ModbusPagedDataBlock.create(value))
+        for name, value in tables.items()))
+
+def size(context):
+    ''' The bytes used by the values of the datastores of every slave '''
+    total = 0
+    for _, slave in context:
+        for block in slave.store.values():
+            if hasattr(block, 'pages'):
+                total += sys.getsizeof(block.pages)
+                total += sum(sys.getsizeof(page) for page in block.pages.values())
+            elif hasattr(block, 'memory'): total += sys.getsizeof(block.memory)
+            else: total += sys.getsizeof(block.values)
+    return total
+
+def read(slave):
+    ''' Serves a read of 100 holding registers '''
+    ReadHoldingRegistersRequest(0x100, 100).execute(slave).encode()
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+for name, build in [('list', sequential), ('default', ModbusSlaveContext), ('paged', paged)]:
+    start   = time()
+    context = ModbusServerContext(slaves=dict((unit, build())
+        for unit in range(1, slaves + 1)), single=False)
+    created = time() - start
+    empty   = size(context)
+    for _, slave in context:
+        slave.setValues(3, 0x100, range(300))
+        slave.setValues(1, 0x100, [True] * 300)
+    start   = time()
+    for _ in xrange(count): read(context[1])
+    latency = (time() - start) * 1e6 / count
+    print "%-8s: created in %6.3f s, %10d bytes, %10d bytes used, read %.2f us" % (
+        name, created, empty, size(context), latency)
+    del context
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+'''
+Pymodbus PDU Allocation Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of creating, encoding and
+decoding the request and response messages now that they are slotted,
+against the same messages with an instance dictionary added back (which
+is what every message carried before).
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import sys
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+from pymodbus.register_read_message import ReadHoldingRegistersResponse
+from time import time
+
+#---------------------------------------------------------------------------#
+# the previous (dictionary backed) messages
+#---------------------------------------------------------------------------#
+class DictRequest(ReadHoldingRegistersRequest):
+    ''' A holding register request with an instance dictionary '''
+
+class DictResponse(ReadHoldingRegistersResponse):
+    ''' A holding register response with an instance dictionary '''
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+count  = 100000
+packet = ReadHoldingRegistersResponse(range(10)).encode()
+
+def run(request, response):
+    ''' Builds a request, its response and decodes the response '''
+    for _ in xrange(count):
+        request(1, 10, unit=1).encode()
+        response().decode(packet)
+
+for name, request, response in [
+        ('dictionary', DictRequest, DictResponse),
+        ('slotted',    ReadHoldingRegistersRequest, ReadHoldingRegistersResponse)]:
+    start = time()
+    run(request, response)
+    stop  = time()
+
+    #-----------------------------------------------------------------------#
+    # check our results
+    #-----------------------------------------------------------------------#
+    size = sys.getsizeof(request(1, 10))
+    if hasattr(request(1, 10), '__dict__'):
+        size += sys.getsizeof(request(1, 10).__dict__)
+    print "%-10s: %d messages/second, %d bytes/request" % (name,
+        (2.0 * count) / (stop - start), size)
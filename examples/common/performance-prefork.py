@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+'''
+Pymodbus Prefork Server Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the prefork tcp server
+with one server process up to one per core. The load is generated by
+a client process per core (so the clients are not held back by the
+interpreter lock either), each of which keeps a few connections busy.
+Every other request is a write, so the server processes have to share
+the datastore; the test finally checks that a read through any of the
+processes sees the last value that was written.
+
+With the server and the clients on the same machine the numbers only
+scale up to half the cores; run the clients from another machine
+(pointing `address` at the server) to see the whole curve.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import socket
+import multiprocessing
+from pymodbus.datastore import ModbusServerContext, ModbusSlaveContext
+from pymodbus.datastore import ModbusSharedDataBlock
+from pymodbus.server.sync import ModbusPreforkTcpServer
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+cores       = multiprocessing.cpu_count()
+total       = 20000     # requests to send from each client process
+connections = 4         # connections kept busy by each client process
+address     = ('127.0.0.1', 5020)
+read        = "\x00\x01\x00\x00\x00\x06\x00\x03\x00\x0a\x00\x01"
+write       = "\x00\x02\x00\x00\x00\x06\x00\x06\x00\x0a\x12\x34"
+
+def receive(connection, size):
+    ''' Reads a single response of the given size '''
+    data = ''
+    while len(data) < size:
+        data += connection.recv(size - len(data))
+    return data
+
+def client(_):
+    ''' Sends the requests of a single client process '''
+    sockets = [socket.create_connection(address) for _ in range(connections)]
+    for count in xrange(total / connections):
+        request, size = (write, 12) if count & 1 else (read, 11)
+        for connection in sockets: connection.sendall(request)
+        for connection in sockets: receive(connection, size)
+    values = []
+    for connection in sockets:
+        connection.sendall(read)
+        values.append(receive(connection, 11)[-2:])
+        connection.close()
+    return values
+
+def run(processes, clients):
+    ''' Runs the load test against a number of server processes '''
+    slave   = ModbusSlaveContext(hr=ModbusSharedDataBlock.create())
+    context = ModbusServerContext(slaves=slave)
+    server  = ModbusPreforkTcpServer(context, address=address,
+        processes=processes, backend='selector')
+    start   = time()
+    values  = sum(clients.map(client, range(cores)), [])
+    stop    = time()
+    server.server_close()
+    assert set(values) == set(["\x12\x34"]), "a write was not shared"
+    return (total * cores) / (stop - start)
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+clients = multiprocessing.Pool(cores)
+for processes in sorted(set([1, 2, cores / 2 or 1, cores])):
+    print "%3d processes: %d requests/second" % (processes,
+        run(processes, clients))
+clients.close()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+'''
+Pymodbus Prepared Request Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of building the packet for
+the same poll request over and over, against building it from a request
+that was prepared once (which only patches the transaction id in).
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+from pymodbus.factory import ClientDecoder
+from pymodbus.transaction import ModbusSocketFramer, ModbusRtuFramer
+from pymodbus.transaction import ModbusPreparedRequest
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+from time import time
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+count = 100000
+
+for framer in [ModbusSocketFramer(ClientDecoder()), ModbusRtuFramer(ClientDecoder())]:
+    request  = ReadHoldingRegistersRequest(0, 10, unit=1)
+    prepared = ModbusPreparedRequest(request, framer)
+    for name, message in [('request', request), ('prepared', prepared)]:
+        start = time()
+        for tid in xrange(count):
+            message.transaction_id = tid & 0xffff
+            framer.buildPacket(message)
+        stop  = time()
+
+        #-------------------------------------------------------------------#
+        # check our results
+        #-------------------------------------------------------------------#
+        print "%-20s %-8s: %.2f us/packet" % (framer.__class__.__name__,
+            name, (stop - start) * 1e6 / count)
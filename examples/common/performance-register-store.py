@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+'''
+Pymodbus Register Datastore Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the array backed register
+datastore against the list backed sequential datastore: the memory of a
+slave with all four full tables, and the time to serve a read of the
+most holding registers allowed (which is executed against the datastore
+and encoded).
+
+The list sizes only count the references; registers that are not small
+numbers each take another int object on top of that.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import sys
+from pymodbus.datastore import ModbusSlaveContext
+from pymodbus.datastore import ModbusSequentialDataBlock
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+count = 100000
+
+def size(context):
+    ''' The bytes used by the values of the datastores of a slave '''
+    total = 0
+    for block in context.store.values():
+        values = block.memory if hasattr(block, 'memory') else block.values
+        total += sys.getsizeof(values)
+    return total
+
+def read(context):
+    ''' Serves a read of 125 holding registers '''
+    ReadHoldingRegistersRequest(0x03, 125).execute(context).encode()
+
+def measure(method, context):
+    ''' Returns the time per call of the supplied method '''
+    start = time()
+    for _ in xrange(count): method(context)
+    return (time() - start) * 1e6 / count
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+tables = ['di', 'co', 'ir', 'hr']
+slaves = [
+    ('list',  ModbusSlaveContext(**dict((t, ModbusSequentialDataBlock.create()) for t in tables))),
+    ('array', ModbusSlaveContext()),
+]
+for name, context in slaves:
+    context.setValues(3, 0x00, range(1000, 1200))
+    print "%-6s: %8d bytes/slave, read %.2f us" % (name, size(context),
+        measure(read, context))
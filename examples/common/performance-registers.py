@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+'''
+Pymodbus Register Codec Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of encoding and decoding a
+full (125 register) read response against the previous register at a
+time versions.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import struct
+from pymodbus.register_read_message import ReadHoldingRegistersResponse
+from time import time
+
+#---------------------------------------------------------------------------#
+# the previous implementation
+#---------------------------------------------------------------------------#
+def encode_baseline(registers):
+    ''' Encodes the registers one at a time '''
+    result = chr(len(registers) * 2)
+    for register in registers:
+        result += struct.pack('>H', register)
+    return result
+
+def decode_baseline(data):
+    ''' Decodes the registers one at a time '''
+    byte_count = ord(data[0])
+    registers = []
+    for i in range(1, byte_count + 1, 2):
+        registers.append(struct.unpack('>H', data[i:i + 2])[0])
+    return registers
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+count    = 10000
+listed   = ReadHoldingRegistersResponse(range(0, 1250, 10))
+response = ReadHoldingRegistersResponse(range(0, 1250, 10))
+packet   = response.encode()
+assert packet == encode_baseline(response.registers)
+response.decode(packet)
+assert response.registers == decode_baseline(packet)
+
+tests = [
+    ('encode baseline', lambda: encode_baseline(response.registers)),
+    ('encode (list)',   listed.encode),
+    ('encode (array)',  response.encode),
+    ('decode baseline', lambda: decode_baseline(packet)),
+    ('decode',          lambda: response.decode(packet)),
+]
+for name, method in tests:
+    start = time()
+    for _ in xrange(count): method()
+    stop  = time()
+    print "%-16s: %.2f us/125 registers" % (name, (stop - start) * 1e6 / count)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+'''
+Pymodbus Server Backend Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of the threaded (a thread per
+client) and selector (a single event loop) synchronous tcp servers. Each
+round a request is sent on every connection and then every response is
+read back, for 10, 100, and 1000 concurrent connections.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+import socket
+import threading
+import resource
+from pymodbus.datastore import ModbusServerContext, ModbusSlaveContext
+from pymodbus.server.sync import ModbusTcpServer, ModbusSelectorTcpServer
+from time import time
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+total   = 20000     # requests to send for each connection count
+request = "\x00\x01\x00\x00\x00\x06\x00\x03\x00\x0a\x00\x01"
+context = ModbusServerContext(slaves=ModbusSlaveContext())
+
+soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+resource.setrlimit(resource.RLIMIT_NOFILE, (min(4096, hard), hard))
+
+def receive(connection, size=11):
+    ''' Reads a single (11 byte) response '''
+    data = ''
+    while len(data) < size:
+        data += connection.recv(size - len(data))
+    return data
+
+def run(server, count):
+    ''' Runs the load test against the supplied server '''
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    connections = [socket.create_connection(server.server_address)
+        for _ in xrange(count)]
+    start = time()
+    for _ in xrange(max(1, total / count)):
+        for connection in connections: connection.sendall(request)
+        for connection in connections: receive(connection)
+    stop  = time()
+    for connection in connections: connection.close()
+    server.shutdown()
+    server.server_close()
+    return (max(1, total / count) * count) / (stop - start)
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+for count in [10, 100, 1000]:
+    for name, build in [('threaded', ModbusTcpServer), ('selector', ModbusSelectorTcpServer)]:
+        server = build(context, address=('127.0.0.1', 0))
+        print "%-8s %4d connections: %d requests/second" % (name, count,
+            run(server, count))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+'''
+Pymodbus Sparse Datastore Performance Example
+--------------------------------------------------------------------------
+
+The following is a quick performance check of serving a request from a
+sparse datastore with 50000 points (in runs of ten addresses with gaps
+between them), against the previous version that checked every request
+against a set of all of the populated addresses.
+'''
+#---------------------------------------------------------------------------#
+# import the necessary modules
+#---------------------------------------------------------------------------#
+from pymodbus.datastore import ModbusSparseDataBlock
+from time import time
+
+#---------------------------------------------------------------------------#
+# the previous implementation
+#---------------------------------------------------------------------------#
+class BaselineSparseDataBlock(object):
+    ''' The sparse datastore as it was '''
+
+    def __init__(self, values):
+        self.values = values
+
+    def validate(self, address, count=1):
+        if count == 0: return False
+        handle = set(range(address, address + count))
+        return handle.issubset(set(self.values.iterkeys()))
+
+    def getValues(self, address, count=1):
+        return [self.values[i] for i in range(address, address + count)]
+
+#---------------------------------------------------------------------------#
+# initialize the test
+#---------------------------------------------------------------------------#
+points  = dict((run * 16 + offset, offset) for run in range(5000) for offset in range(10))
+reads   = [(run * 16 + 2, 8) for run in range(0, 5000, 50)]
+
+def measure(block, count):
+    ''' Returns the time to serve (validate and read) one request '''
+    start = time()
+    for _ in xrange(count):
+        for address, size in reads:
+            if block.validate(address, size):
+                block.getValues(address, size)
+    return (time() - start) * 1e6 / (count * len(reads))
+
+#---------------------------------------------------------------------------#
+# perform the test
+#---------------------------------------------------------------------------#
+print "%d points" % len(points)
+print "%-10s: %.2f us/request" % ('baseline', measure(BaselineSparseDataBlock(points), 1))
+print "%-10s: %.2f us/request" % ('indexed', measure(ModbusSparseDataBlock(points), 1000))
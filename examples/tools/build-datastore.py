@@ -76,7 +76,7 @@ def build_conversion(option, opt, value, parser):
                         for vk,vv in enumerate(dv.values)]))
 
             # handle sparse
-            elif isinstance(data[k].values, dict):
+            elif hasattr(dv.values, 'iteritems'):
                 output.write("\n".join(["[%d] = %d" % (vk,vv)
                         for vk,vv in dv.values.iteritems()]))
             else: raise ConfigurationException("Datastore is corrupted %s" % value)
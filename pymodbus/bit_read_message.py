@@ -12,6 +12,7 @@ from pymodbus.utilities import pack_bitstring, unpack_bitstring
 
 class ReadBitsRequestBase(ModbusRequest):
     ''' Base class for Messages Requesting bit values '''
+    __slots__ = ('address', 'count')
 
     _rtu_frame_size = 8
 
@@ -48,7 +49,15 @@ class ReadBitsRequestBase(ModbusRequest):
 
 
 class ReadBitsResponseBase(ModbusResponse):
-    ''' Base class for Messages responding to bit-reading values '''
+    ''' Base class for Messages responding to bit-reading values
+
+    A decoded response only keeps (a view of) the packed bits and unpacks
+    them the first time they are used. Until then, `getBit` reads just
+    the requested bit and `encode` hands back the packed bits. A response
+    created from a BitArray (as read from a ModbusBitDataBlock) is
+    encoded without packing the bits either.
+    '''
+    __slots__ = ('__bits', '__raw', 'byte_count')
 
     _rtu_byte_count_pos = 2
 
@@ -60,12 +69,37 @@ class ReadBitsResponseBase(ModbusResponse):
         ModbusResponse.__init__(self, **kwargs)
         self.bits = values or []
 
+    #-----------------------------------------------------------------------#
+    # Bit Properties
+    #-----------------------------------------------------------------------#
+    def _getBits(self):
+        ''' Returns the bits, unpacking them on first use
+
+        :returns: The response bits
+        '''
+        if self.__bits is None:
+            self.__bits = unpack_bitstring(self.__raw)
+            self.__raw = None
+        return self.__bits
+
+    def _setBits(self, values):
+        ''' Sets the bits (dropping any packed data)
+
+        :param values: The new bit values
+        '''
+        self.__bits, self.__raw = values, None
+
+    bits = property(_getBits, _setBits)
+
     def encode(self):
         ''' Encodes response pdu
 
         :returns: The encoded packet message
         '''
-        result = pack_bitstring(self.bits)
+        if self.__bits is None:
+            result = self.__raw
+            if isinstance(result, memoryview): result = result.tobytes()
+        else: result = pack_bitstring(self.__bits)
         packet = struct.pack(">B", len(result)) + result
         return packet
 
@@ -75,7 +109,7 @@ class ReadBitsResponseBase(ModbusResponse):
         :param data: The packet data to decode
         '''
         self.byte_count = struct.unpack(">B", data[0])[0]
-        self.bits = unpack_bitstring(data[1:])
+        self.__bits, self.__raw = None, data[1:]
 
     def setBit(self, address, value=1):
         ''' Helper function to set the specified bit
@@ -98,6 +132,8 @@ class ReadBitsResponseBase(ModbusResponse):
         :param address: The bit to query
         :returns: The value of the requested bit
         '''
+        if self.__bits is None and 0 <= address < len(self.__raw) * 8:
+            return (ord(self.__raw[address >> 3]) >> (address & 7)) & 1 == 1
         return self.bits[address]
 
     def __str__(self):
@@ -116,6 +152,7 @@ class ReadCoilsRequest(ReadBitsRequestBase):
     coils. In the PDU Coils are addressed starting at zero. Therefore coils
     numbered 1-16 are addressed as 0-15.
     '''
+    __slots__ = ()
     function_code = 1
 
     def __init__(self, address=None, count=None, **kwargs):
@@ -138,9 +175,9 @@ class ReadCoilsRequest(ReadBitsRequestBase):
         '''
         if not (1 <= self.count <= 0x7d0):
             return self.doException(merror.IllegalValue)
-        if not context.validate(self.function_code, self.address, self.count):
+        values = self.readValues(context, self.address, self.count)
+        if values is None:
             return self.doException(merror.IllegalAddress)
-        values = context.getValues(self.function_code, self.address, self.count)
         return ReadCoilsResponse(values)
 
 
@@ -157,6 +194,7 @@ class ReadCoilsResponse(ReadBitsResponseBase):
     (toward the high order end of the byte). The Byte Count field specifies
     the quantity of complete bytes of data.
     '''
+    __slots__ = ()
     function_code = 1
 
     def __init__(self, values=None, **kwargs):
@@ -175,6 +213,7 @@ class ReadDiscreteInputsRequest(ReadBitsRequestBase):
     number of inputs. In the PDU Discrete Inputs are addressed starting at
     zero. Therefore Discrete inputs numbered 1-16 are addressed as 0-15.
     '''
+    __slots__ = ()
     function_code = 2
 
     def __init__(self, address=None, count=None, **kwargs):
@@ -197,9 +236,9 @@ class ReadDiscreteInputsRequest(ReadBitsRequestBase):
         '''
         if not (1 <= self.count <= 0x7d0):
             return self.doException(merror.IllegalValue)
-        if not context.validate(self.function_code, self.address, self.count):
+        values = self.readValues(context, self.address, self.count)
+        if values is None:
             return self.doException(merror.IllegalAddress)
-        values = context.getValues(self.function_code, self.address, self.count)
         return ReadDiscreteInputsResponse(values)
 
 
@@ -216,6 +255,7 @@ class ReadDiscreteInputsResponse(ReadBitsResponseBase):
     (toward the high order end of the byte). The Byte Count field specifies
     the quantity of complete bytes of data.
     '''
+    __slots__ = ()
     function_code = 2
 
     def __init__(self, values=None, **kwargs):
@@ -9,7 +9,7 @@ from pymodbus.constants import ModbusStatus
 from pymodbus.pdu import ModbusRequest
 from pymodbus.pdu import ModbusResponse
 from pymodbus.pdu import ModbusExceptions as merror
-from pymodbus.utilities import pack_bitstring, unpack_bitstring
+from pymodbus.utilities import pack_bitstring, BitArray
 
 #---------------------------------------------------------------------------#
 # Local Constants
@@ -37,6 +37,7 @@ class WriteSingleCoilRequest(ModbusRequest):
     0X0000 requests the coil to be off. All other values are illegal and
     will not affect the coil.
     '''
+    __slots__ = ('address', 'value')
     function_code = 5
     _rtu_frame_size = 8
 
@@ -96,6 +97,7 @@ class WriteSingleCoilResponse(ModbusResponse):
     The normal response is an echo of the request, returned after the coil
     state has been written.
     '''
+    __slots__ = ('address', 'value')
     function_code = 5
     _rtu_frame_size = 8
 
@@ -146,6 +148,7 @@ class WriteMultipleCoilsRequest(ModbusRequest):
     data field. A logical '1' in a bit position of the field requests the
     corresponding output to be ON. A logical '0' requests it to be OFF."
     '''
+    __slots__ = ('address', 'values', 'byte_count')
     function_code = 15
     _rtu_byte_count_pos = 6
 
@@ -176,11 +179,15 @@ class WriteMultipleCoilsRequest(ModbusRequest):
     def decode(self, data):
         ''' Decodes a write coils request
 
+        The values are kept packed (as a BitArray), so they can be written
+        to a ModbusBitDataBlock without unpacking them.
+
         :param data: The packet data to decode
         '''
         self.address, count, self.byte_count = struct.unpack('>HHB', data[0:5])
-        values = unpack_bitstring(data[5:])
-        self.values = values[:count]
+        values = data[5:5 + self.byte_count]
+        if isinstance(values, memoryview): values = values.tobytes()
+        self.values = BitArray(values, min(count, len(values) * 8))
 
     def execute(self, context):
         ''' Run a write coils request against a datastore
@@ -213,6 +220,7 @@ class WriteMultipleCoilsResponse(ModbusResponse):
     The normal response returns the function code, starting address, and
     quantity of coils forced.
     '''
+    __slots__ = ('address', 'count')
     function_code = 15
     _rtu_frame_size = 8
 
@@ -38,17 +38,14 @@ from pymodbus.factory import ClientDecoder
 from pymodbus.exceptions import ConnectionException
 from pymodbus.transaction import ModbusSocketFramer, ModbusTransactionManager
 from pymodbus.client.common import ModbusClientMixin
+from pymodbus.trace import getTracer
 
 #---------------------------------------------------------------------------#
 # Logging
 #---------------------------------------------------------------------------#
 import logging
 _logger = logging.getLogger(__name__)
-
-#---------------------------------------------------------------------------#
-# A manager for the transaction identifiers
-#---------------------------------------------------------------------------#
-_manager = ModbusTransactionManager()
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -66,6 +63,7 @@ class ModbusClientProtocol(protocol.Protocol, ModbusClientMixin):
         :param framer: The framer to use for the protocol
         '''
         self.framer = framer or ModbusSocketFramer(ClientDecoder())
+        self.transaction = ModbusTransactionManager(self)
         self._requests = deque()  # link queue to tid
         self._connected = False
 
@@ -98,7 +96,7 @@ class ModbusClientProtocol(protocol.Protocol, ModbusClientMixin):
         ''' Starts the producer to send the next request to
         consumer.write(Frame(request))
         '''
-        request.transaction_id = _manager.getNextTID()
+        request.transaction_id = self.transaction.getNextTID()
         #self.handler[request.transaction_id] = request
         packet = self.framer.buildPacket(request)
         self.transport.write(packet)
@@ -133,7 +131,6 @@ class ModbusUdpClientProtocol(protocol.DatagramProtocol, ModbusClientMixin):
     This represents the base modbus client protocol.  All the application
     layer code is deferred to a higher level wrapper.
     '''
-    __tid = 0
 
     def __init__(self, framer=None):
         ''' Initializes the framer module
@@ -141,6 +138,7 @@ class ModbusUdpClientProtocol(protocol.DatagramProtocol, ModbusClientMixin):
         :param framer: The framer to use for the protocol
         '''
         self.framer = framer or ModbusSocketFramer(ClientDecoder())
+        self.transaction = ModbusTransactionManager(self)
         self._requests = deque()  # link queue to tid
 
     def datagramReceived(self, data, (host, port)):
@@ -152,14 +150,14 @@ class ModbusUdpClientProtocol(protocol.DatagramProtocol, ModbusClientMixin):
             if self._requests:
                 self._requests.popleft().callback(reply)
 
-        _logger.debug("Datagram from: %s:%d" % (host, port))
+        if _trace.enabled: _trace.debug("Datagram from: %s:%d", host, port)
         self.framer.processIncomingPacket(data, _callback)
 
     def execute(self, request):
         ''' Starts the producer to send the next request to
         consumer.write(Frame(request))
         '''
-        request.transaction_id = _manager.getNextTID()
+        request.transaction_id = self.transaction.getNextTID()
         #self.handler[request.transaction_id] = request
         packet = self.framer.buildPacket(request)
         self.transport.write(packet)
@@ -7,6 +7,64 @@ from pymodbus.register_write_message import *
 from pymodbus.diag_message import *
 from pymodbus.file_message import *
 from pymodbus.other_message import *
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.exceptions import ParameterException
+from pymodbus.transaction import ModbusPreparedRequest
+
+
+#---------------------------------------------------------------------------#
+# Protocol limits on the number of values in a single request
+#---------------------------------------------------------------------------#
+_max_read_bits       = 0x7d0
+_max_read_registers  = 0x7d
+_max_write_bits      = 0x7b0
+_max_write_registers = 0x7b
+
+#---------------------------------------------------------------------------#
+# Read Planning
+#---------------------------------------------------------------------------#
+# For each table: the request used to read it, the protocol limit on the
+# number of values per request, and the response field holding the values
+#---------------------------------------------------------------------------#
+_read_tables = {
+    'c': (ReadCoilsRequest,            _max_read_bits,      'bits'),
+    'd': (ReadDiscreteInputsRequest,   _max_read_bits,      'bits'),
+    'h': (ReadHoldingRegistersRequest, _max_read_registers, 'registers'),
+    'i': (ReadInputRegistersRequest,   _max_read_registers, 'registers'),
+}
+
+
+#---------------------------------------------------------------------------#
+# Chunking Helpers
+#---------------------------------------------------------------------------#
+def _chunks(address, count, limit):
+    ''' Splits a range of addresses into protocol legal chunks
+
+    :param address: The starting address of the range
+    :param count: The number of addresses in the range
+    :param limit: The maximum number of addresses in a chunk
+    :returns: A list of (address, count) chunks
+    '''
+    return [(start, min(limit, address + count - start))
+        for start in xrange(address, address + max(count, 1), limit)]
+
+def _values(values):
+    ''' Converts the values to write into a list (as the requests do)
+
+    :param values: The value or values to write
+    :returns: The values as a list
+    '''
+    if not values: return []
+    if not hasattr(values, '__iter__'): return [values]
+    return list(values)
+
+def _failed(response):
+    ''' Checks if a response is missing or an exception response
+
+    :param response: The response to check
+    :returns: True if the request failed, False otherwise
+    '''
+    return response is None or isinstance(response, ExceptionResponse)
 
 
 class ModbusClientMixin(object):
@@ -23,8 +81,61 @@ class ModbusClientMixin(object):
        # now like this
        client = ModbusClient(...)
        response = client.read_coils(1, 10)
+
+    The bulk read and write methods split counts that are larger than
+    the protocol allows into legal chunks. The chunks are pipelined if
+    the client supports it (`execute_many`) and their results are
+    stitched back into a single response, so reading 10k registers is
+    still a single call. If any chunk fails, that failure is returned.
     '''
 
+    #-----------------------------------------------------------------------#
+    # Chunked execution
+    #-----------------------------------------------------------------------#
+    def __execute_all(self, requests):
+        ''' Executes a collection of requests
+
+        :param requests: The requests to execute
+        :returns: The responses in request order
+        '''
+        if len(requests) > 1 and hasattr(self, 'execute_many'):
+            return self.execute_many(requests)
+        return [self.execute(request) for request in requests]
+
+    def __execute_chunks(self, requests, unit, build, field=None):
+        ''' Executes the chunks of an operation and stitches the results
+
+        A single chunk is executed as is. Otherwise the values in `field`
+        of each chunk response (trimmed to the chunk count) are joined and
+        passed to `build` to create the final response. This works on the
+        deferred responses of the asynchronous clients as well.
+
+        :param requests: The chunk requests to execute
+        :param unit: The slave unit this request is targeting
+        :param build: A callable that builds the final response
+        :param field: The response field holding the read values
+        :returns: The stitched response (or the first failure)
+        '''
+        for request in requests:
+            request.unit_id = unit
+        if len(requests) == 1:
+            return self.execute(requests[0])
+
+        def stitch(responses):
+            values = []
+            for request, response in zip(requests, responses):
+                if _failed(response): return response
+                if field: values.extend(getattr(response, field)[:request.count])
+            response = build(values)
+            response.unit_id = unit
+            return response
+
+        responses = self.__execute_all(requests)
+        if responses and hasattr(responses[0], 'addCallback'):
+            from twisted.internet import defer
+            return defer.gatherResults(responses).addCallback(stitch)
+        return stitch(responses)
+
     def read_coils(self, address, count=1, unit=0x00):
         '''
 
@@ -33,9 +144,9 @@ class ModbusClientMixin(object):
         :param unit: The slave unit this request is targeting
         :returns: A deferred response handle
         '''
-        request = ReadCoilsRequest(address, count)
-        request.unit_id = unit
-        return self.execute(request)
+        requests = [ReadCoilsRequest(a, c)
+            for a, c in _chunks(address, count, _max_read_bits)]
+        return self.__execute_chunks(requests, unit, ReadCoilsResponse, 'bits')
 
     def read_discrete_inputs(self, address, count=1, unit=0x00):
         '''
@@ -45,9 +156,9 @@ class ModbusClientMixin(object):
         :param unit: The slave unit this request is targeting
         :returns: A deferred response handle
         '''
-        request = ReadDiscreteInputsRequest(address, count)
-        request.unit_id = unit
-        return self.execute(request)
+        requests = [ReadDiscreteInputsRequest(a, c)
+            for a, c in _chunks(address, count, _max_read_bits)]
+        return self.__execute_chunks(requests, unit, ReadDiscreteInputsResponse, 'bits')
 
     def write_coil(self, address, value, unit=0x00):
         '''
@@ -69,9 +180,11 @@ class ModbusClientMixin(object):
         :param unit: The slave unit this request is targeting
         :returns: A deferred response handle
         '''
-        request = WriteMultipleCoilsRequest(address, values)
-        request.unit_id = unit
-        return self.execute(request)
+        values   = _values(values)
+        requests = [WriteMultipleCoilsRequest(a, values[a - address:a - address + c])
+            for a, c in _chunks(address, len(values), _max_write_bits)]
+        return self.__execute_chunks(requests, unit,
+            lambda _: WriteMultipleCoilsResponse(address, len(values)))
 
     def write_register(self, address, value, unit=0x00):
         '''
@@ -93,9 +206,11 @@ class ModbusClientMixin(object):
         :param unit: The slave unit this request is targeting
         :returns: A deferred response handle
         '''
-        request = WriteMultipleRegistersRequest(address, values)
-        request.unit_id = unit
-        return self.execute(request)
+        values   = _values(values)
+        requests = [WriteMultipleRegistersRequest(a, values[a - address:a - address + c])
+            for a, c in _chunks(address, len(values), _max_write_registers)]
+        return self.__execute_chunks(requests, unit,
+            lambda _: WriteMultipleRegistersResponse(address, len(values)))
 
     def read_holding_registers(self, address, count=1, unit=0x00):
         '''
@@ -105,9 +220,9 @@ class ModbusClientMixin(object):
         :param unit: The slave unit this request is targeting
         :returns: A deferred response handle
         '''
-        request = ReadHoldingRegistersRequest(address, count)
-        request.unit_id = unit
-        return self.execute(request)
+        requests = [ReadHoldingRegistersRequest(a, c)
+            for a, c in _chunks(address, count, _max_read_registers)]
+        return self.__execute_chunks(requests, unit, ReadHoldingRegistersResponse, 'registers')
 
     def read_input_registers(self, address, count=1, unit=0x00):
         '''
@@ -117,9 +232,9 @@ class ModbusClientMixin(object):
         :param unit: The slave unit this request is targeting
         :returns: A deferred response handle
         '''
-        request = ReadInputRegistersRequest(address, count)
-        request.unit_id = unit
-        return self.execute(request)
+        requests = [ReadInputRegistersRequest(a, c)
+            for a, c in _chunks(address, count, _max_read_registers)]
+        return self.__execute_chunks(requests, unit, ReadInputRegistersResponse, 'registers')
 
     def readwrite_registers(self, *args, **kwargs):
         '''
@@ -134,3 +249,104 @@ class ModbusClientMixin(object):
         request = ReadWriteMultipleRegistersRequest(*args, **kwargs)
         request.unit_id = kwargs.get('unit', 0x00)
         return self.execute(request)
+
+    def prepare(self, request):
+        ''' Encodes a request once so it can be executed repeatedly
+
+        The prepared request can be passed to `execute` (or `execute_many`)
+        as often as needed and only has its transaction id patched in each
+        time it is sent::
+
+            prepared = client.prepare(ReadHoldingRegistersRequest(0, 10, unit=1))
+            for _ in range(100):
+                response = client.execute(prepared)
+
+        :param request: The request to prepare
+        :returns: The prepared request
+        '''
+        return ModbusPreparedRequest(request, self.framer)
+
+    def plan_reads(self, points, gap=0):
+        ''' Merges a collection of read points into the fewest requests
+
+        Each point is a (table, address, count) tuple where table is one
+        of 'c' (coils), 'd' (discrete inputs), 'h' (holding registers),
+        or 'i' (input registers). Points of the same table that overlap
+        or are adjacent are merged and then split at the protocol limit
+        (2000 bits or 125 registers). Points separated by no more than
+        `gap` unrequested addresses are merged as long as the read stays
+        within the limit::
+
+            plan_reads([('h', 0, 1), ('h', 2, 1), ('h', 200, 4)], gap=1)
+            # [('h', 0, 3), ('h', 200, 4)]
+
+        :param points: The (table, address, count) points to read
+        :param gap: The number of unrequested addresses that may be read
+        :returns: A list of (table, address, count) reads
+        '''
+        tables = {}
+        for table, address, count in points:
+            if table not in _read_tables:
+                raise ParameterException("Unknown read table %s" % table)
+            tables.setdefault(table, []).append((address, address + count))
+
+        reads = []
+        for table in sorted(tables):
+            limit = _read_tables[table][1]
+            start, end = None, None
+            for low, high in sorted(tables[table]):
+                if start is None:
+                    start, end = low, high
+                elif low <= end:                # overlapping or adjacent
+                    end = max(end, high)
+                elif low <= end + gap and high - start <= limit:
+                    end = high                  # bridge the gap
+                else:
+                    reads.append((table, start, end - start))
+                    start, end = low, high
+                while end - start > limit:
+                    reads.append((table, start, limit))
+                    start += limit
+            if start is not None and end > start:
+                reads.append((table, start, end - start))
+        return reads
+
+    def read_points(self, points, gap=0, unit=0x00):
+        ''' Reads a collection of points with the fewest requests
+
+        The points are merged with `plan_reads`, each planned read is
+        executed, and the values are scattered back to the requested
+        points. A point whose values could not be read (because the
+        request failed or returned an exception) is mapped to None.
+
+        The reads are pipelined if the client supports it. This waits
+        on the responses, so it is meant for the synchronous clients.
+
+        :param points: The (table, address, count) points to read
+        :param gap: The number of unrequested addresses that may be read
+        :param unit: The slave unit this request is targeting
+        :returns: A dict of (table, address, count) to the list of values
+        '''
+        points = [tuple(point) for point in points]
+        values = dict((table, {}) for table in _read_tables)
+        plan, requests = self.plan_reads(points, gap), []
+        for table, address, count in plan:
+            request = _read_tables[table][0](address, count)
+            request.unit_id = unit
+            requests.append(request)
+
+        responses = self.__execute_all(requests)
+        for (table, address, count), response in zip(plan, responses):
+            if _failed(response): continue
+            result = getattr(response, _read_tables[table][2])[:count]
+            values[table].update(zip(range(address, address + count), result))
+
+        results = {}
+        for table, address, count in points:
+            known = values[table]
+            try:
+                results[(table, address, count)] = \
+                    [known[a] for a in range(address, address + count)]
+            except KeyError:
+                results[(table, address, count)] = None
+        return results
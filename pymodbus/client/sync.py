@@ -1,5 +1,6 @@
 import socket
 import serial
+import time
 
 from pymodbus.constants import Defaults
 from pymodbus.factory import ClientDecoder
@@ -167,6 +168,61 @@ class ModbusTcpClient(BaseModbusClient):
         '''
         return self.socket.recv(size)
 
+    def execute_many(self, requests, window=Defaults.PipelineWindow,
+        timeout=Defaults.Timeout):
+        ''' Pipelines a collection of requests over the connection
+
+        Up to `window` requests are written back to back before waiting
+        for any response. The responses are matched back to their
+        requests by the MBAP transaction id (so the server may answer in
+        any order), and whenever a request completes or times out the
+        next one is sent::
+
+            requests = [ReadHoldingRegistersRequest(a, 10) for a in range(0, 1000, 10)]
+            responses = client.execute_many(requests, window=16)
+
+        :param requests: The requests to execute
+        :param window: The maximum number of requests in flight
+        :param timeout: The time to wait for each individual response
+        :returns: The responses in request order (None for failed requests)
+        '''
+        requests = list(requests)
+        results  = [None] * len(requests)
+        inflight = {}  # tid -> (index, deadline)
+        position = 0
+
+        def _set_result(message):
+            entry = inflight.pop(message.transaction_id, None)
+            if entry: results[entry[0]] = message
+
+        if not self.connect(): return results
+        try:
+            while position < len(requests) or inflight:
+                while position < len(requests) and len(inflight) < window:
+                    request = requests[position]
+                    request.transaction_id = self.transaction.getNextTID()
+                    inflight[request.transaction_id] = (position, time.time() + timeout)
+                    self._send(self.framer.buildPacket(request))
+                    position += 1
+
+                now = time.time()
+                for tid, (index, deadline) in inflight.items():
+                    if deadline <= now:
+                        _logger.debug("Transaction %d timed out" % tid)
+                        del inflight[tid]
+                if not inflight: continue
+
+                self.socket.settimeout(min(d for i, d in inflight.values()) - now)
+                try: data = self._recv(4096)
+                except socket.timeout: continue
+                if not data: raise socket.error("Connection closed")
+                self.framer.processIncomingPacket(data, _set_result)
+        except socket.error, msg:
+            _logger.debug("Pipelined transactions failed. (%s) " % msg)
+            self.close()
+        if self.socket: self.socket.settimeout(Defaults.Timeout)
+        return results
+
     def __str__(self):
         ''' Builds a string representation of the connection
 
@@ -191,6 +247,7 @@ class ModbusUdpClient(BaseModbusClient):
         self.host = host
         self.port = port
         self.socket = None
+        self.__datagram = ''
         BaseModbusClient.__init__(self, ModbusSocketFramer(ClientDecoder()))
 
     def connect(self):
@@ -219,16 +276,24 @@ class ModbusUdpClient(BaseModbusClient):
         :return: The number of bytes written
         '''
         if request:
+            self.__datagram = ''  # drop whatever is left of the last reply
             return self.socket.sendto(request, (self.host, self.port))
         return 0
 
     def _recv(self, size):
         ''' Reads data from the underlying descriptor
 
+        A datagram has to be read in one go (the rest of it is discarded
+        otherwise), so a whole datagram is read and handed out size bytes
+        at a time.
+
         :param size: The number of bytes to read
         :return: The bytes read
         '''
-        return self.socket.recvfrom(size)[0]
+        if not self.__datagram:
+            self.__datagram = self.socket.recvfrom(1024)[0]
+        data, self.__datagram = self.__datagram[:size], self.__datagram[size:]
+        return data
 
     def __str__(self):
         ''' Builds a string representation of the connection
@@ -242,7 +307,21 @@ class ModbusUdpClient(BaseModbusClient):
 # Modbus Serial Client Transport Implementation
 #---------------------------------------------------------------------------#
 class ModbusSerialClient(BaseModbusClient):
-    ''' Implementation of a modbus udp client
+    ''' Implementation of a modbus serial client
+
+    The transaction manager reads exactly one frame at a time, so a read
+    returns as soon as the last byte of the response arrives instead of
+    waiting for the port timeout. For the rtu method the frame timing of
+    the specification is honored as well:
+
+    * the read also ends after 1.5 characters of silence once the frame
+      has started (the inter character timeout), which ends frames whose
+      size cannot be known up front; the framer is told about the silence
+      so it decodes such a frame right away
+    * at least 3.5 characters of silence are kept between frames before
+      the next request is sent
+
+    Above 19200 baud the fixed 750us and 1750us timings are used.
     '''
 
     def __init__(self, method='ascii', **kwargs):
@@ -264,7 +343,8 @@ class ModbusSerialClient(BaseModbusClient):
         '''
         self.method   = method
         self.socket   = None
-        BaseModbusClient.__init__(self, self.__implementation(method))
+        BaseModbusClient.__init__(self, self.__implementation(method,
+            kwargs.get('baudrate', Defaults.Baudrate)))
 
         self.port     = kwargs.get('port', 0)
         self.stopbits = kwargs.get('stopbits', Defaults.Stopbits)
@@ -272,17 +352,27 @@ class ModbusSerialClient(BaseModbusClient):
         self.parity   = kwargs.get('parity',   Defaults.Parity)
         self.baudrate = kwargs.get('baudrate', Defaults.Baudrate)
         self.timeout  = kwargs.get('timeout',  Defaults.Timeout)
+        self.last_frame_end = 0
+
+        if self.baudrate > 19200:
+            self.inter_char_timeout = 0.00075
+            self.silent_interval    = 0.00175
+        else:
+            character = 11.0 / self.baudrate  # start + 8 bits + parity + stop
+            self.inter_char_timeout = 1.5 * character
+            self.silent_interval    = 3.5 * character
 
     @staticmethod
-    def __implementation(method):
+    def __implementation(method, baudrate):
         ''' Returns the requested framer
 
         :method: The serial framer to instantiate
+        :baudrate: The line baud rate (for the rtu frame timing)
         :returns: The requested serial framer
         '''
         method = method.lower()
         if   method == 'ascii':  return ModbusAsciiFramer(ClientDecoder())
-        elif method == 'rtu':    return ModbusRtuFramer(ClientDecoder())
+        elif method == 'rtu':    return ModbusRtuFramer(ClientDecoder(), baudrate)
         elif method == 'binary': return ModbusBinaryFramer(ClientDecoder())
         raise ParameterException("Invalid framer method requested")
 
@@ -296,6 +386,8 @@ class ModbusSerialClient(BaseModbusClient):
             self.socket = serial.Serial(port=self.port, timeout=self.timeout,
                 bytesize=self.bytesize, stopbits=self.stopbits,
                 baudrate=self.baudrate, parity=self.parity)
+            if isinstance(self.framer, ModbusRtuFramer):
+                self.socket.interCharTimeout = self.inter_char_timeout
         except serial.SerialException, msg:
             _logger.error(msg)
             self.close()
@@ -315,6 +407,9 @@ class ModbusSerialClient(BaseModbusClient):
         :return: The number of bytes written
         '''
         if request:
+            if isinstance(self.framer, ModbusRtuFramer):
+                waiting = self.last_frame_end + self.silent_interval - time.time()
+                if waiting > 0: time.sleep(waiting)
             return self.socket.write(request)
         return 0
 
@@ -324,7 +419,9 @@ class ModbusSerialClient(BaseModbusClient):
         :param size: The number of bytes to read
         :return: The bytes read
         '''
-        return self.socket.read(size)
+        result = self.socket.read(size)
+        self.last_frame_end = time.time()
+        return result
 
     def __str__(self):
         ''' Builds a string representation of the connection
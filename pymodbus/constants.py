@@ -70,6 +70,11 @@ class Defaults(Singleton):
 
        The number of bits sent after each character in a message to
        indicate the end of the byte.  This defaults to 1.
+
+    .. attribute:: PipelineWindow
+
+       The maximum number of requests a pipelining client keeps in
+       flight on a single connection.  This defaults to 8.
     '''
     Port          = 502
     Retries       = 3
@@ -82,6 +87,7 @@ class Defaults(Singleton):
     Parity        = 'N'
     Bytesize      = 8
     Stopbits      = 1
+    PipelineWindow = 8
 
 
 class ModbusStatus(Singleton):
@@ -1,5 +1,10 @@
 from pymodbus.datastore.store import ModbusSequentialDataBlock
 from pymodbus.datastore.store import ModbusSparseDataBlock
+from pymodbus.datastore.store import ModbusBitDataBlock
+from pymodbus.datastore.store import ModbusRegisterDataBlock
+from pymodbus.datastore.store import ModbusPagedDataBlock
+from pymodbus.datastore.store import ModbusSharedDataBlock
+from pymodbus.datastore.store import ModbusSharedBitDataBlock
 from pymodbus.datastore.context import ModbusSlaveContext
 from pymodbus.datastore.context import ModbusServerContext
 
@@ -8,5 +13,7 @@ from pymodbus.datastore.context import ModbusServerContext
 #---------------------------------------------------------------------------#
 __all__ = [
     "ModbusSequentialDataBlock", "ModbusSparseDataBlock",
+    "ModbusBitDataBlock", "ModbusRegisterDataBlock", "ModbusPagedDataBlock",
+    "ModbusSharedDataBlock", "ModbusSharedBitDataBlock",
     "ModbusSlaveContext", "ModbusServerContext",
 ]
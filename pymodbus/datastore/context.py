@@ -1,12 +1,15 @@
 from pymodbus.exceptions import ParameterException
 from pymodbus.interfaces import IModbusSlaveContext
-from pymodbus.datastore.store import ModbusSequentialDataBlock
+from pymodbus.trace import getTracer
+from pymodbus.datastore.store import ModbusBitDataBlock
+from pymodbus.datastore.store import ModbusRegisterDataBlock
 
 #---------------------------------------------------------------------------#
 # Logging
 #---------------------------------------------------------------------------#
 import logging;
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -20,7 +23,8 @@ class ModbusSlaveContext(IModbusSlaveContext):
 
     def __init__(self, *args, **kwargs):
         ''' Initializes the datastores, defaults to fully populated
-        sequential data blocks if none are passed in.
+        packed bit (discrete inputs and coils) and register (input and
+        holding registers) data blocks if none are passed in.
 
         :param kwargs: Each element is a ModbusDataBlock
 
@@ -30,10 +34,12 @@ class ModbusSlaveContext(IModbusSlaveContext):
             'ir' - Input Registers iniatializer
         '''
         self.store = {}
-        self.store['d'] = kwargs.get('di', ModbusSequentialDataBlock.create())
-        self.store['c'] = kwargs.get('co', ModbusSequentialDataBlock.create())
-        self.store['i'] = kwargs.get('ir', ModbusSequentialDataBlock.create())
-        self.store['h'] = kwargs.get('hr', ModbusSequentialDataBlock.create())
+        for key, name, block in [('d', 'di', ModbusBitDataBlock),
+            ('c', 'co', ModbusBitDataBlock), ('i', 'ir', ModbusRegisterDataBlock),
+            ('h', 'hr', ModbusRegisterDataBlock)]:
+            # only create the (large) default datastores that are needed
+            if name in kwargs: self.store[key] = kwargs[name]
+            else: self.store[key] = block.create()
 
     def __str__(self):
         ''' Returns a string representation of the context
@@ -56,7 +62,7 @@ class ModbusSlaveContext(IModbusSlaveContext):
         :returns: True if the request in within range, False otherwise
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("validate[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("validate[%d] %d:%d", fx, address, count)
         return self.store[self.decode(fx)].validate(address, count)
 
     def getValues(self, fx, address, count=1):
@@ -68,9 +74,23 @@ class ModbusSlaveContext(IModbusSlaveContext):
         :returns: The requested values from a:a+c
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("getValues[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("getValues[%d] %d:%d", fx, address, count)
         return self.store[self.decode(fx)].getValues(address, count)
 
+    def getValuesChecked(self, fx, address, count=1):
+        ''' Validates the request and retrieves the values if it is in range
+
+        :param fx: The function we are working with
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c, None if out of range
+        '''
+        address = address + 1  # section 4.4 of specification
+        if _trace.enabled: _trace.debug("getValuesChecked[%d] %d:%d", fx, address, count)
+        block = self.store[self.decode(fx)]
+        if not block.validate(address, count): return None
+        return block.getValues(address, count)
+
     def setValues(self, fx, address, values):
         ''' Sets the datastore with the supplied values
 
@@ -79,7 +99,7 @@ class ModbusSlaveContext(IModbusSlaveContext):
         :param values: The new values to be set
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("setValues[%d] %d:%d" % (fx, address, len(values)))
+        if _trace.enabled: _trace.debug("setValues[%d] %d:%d", fx, address, len(values))
         self.store[self.decode(fx)].setValues(address, values)
 
 
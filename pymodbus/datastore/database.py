@@ -6,12 +6,14 @@ from sqlalchemy.sql.expression import bindparam
 
 from pymodbus.exceptions import NotImplementedException
 from pymodbus.interfaces import IModbusSlaveContext
+from pymodbus.trace import getTracer
 
 #---------------------------------------------------------------------------#
 # Logging
 #---------------------------------------------------------------------------#
 import logging;
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -54,7 +56,7 @@ class DatabaseSlaveContext(IModbusSlaveContext):
         :returns: True if the request in within range, False otherwise
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("validate[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("validate[%d] %d:%d", fx, address, count)
         return self.__validate(self.decode(fx), address, count)
 
     def getValues(self, fx, address, count=1):
@@ -66,9 +68,24 @@ class DatabaseSlaveContext(IModbusSlaveContext):
         :returns: The requested values from a:a+c
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("get-values[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("get-values[%d] %d:%d", fx, address, count)
         return self.__get(self.decode(fx), address, count)
 
+    def getValuesChecked(self, fx, address, count=1):
+        ''' Validates the request and retrieves the values if it is in range
+        with a single query.
+
+        :param fx: The function we are working with
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c, None if out of range
+        '''
+        address = address + 1  # section 4.4 of specification
+        if _trace.enabled: _trace.debug("get-values-checked[%d] %d:%d", fx, address, count)
+        values = self.__get(self.decode(fx), address, count)
+        if len(values) != count: return None
+        return values
+
     def setValues(self, fx, address, values):
         ''' Sets the datastore with the supplied values
 
@@ -77,7 +94,7 @@ class DatabaseSlaveContext(IModbusSlaveContext):
         :param values: The new values to be set
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("set-values[%d] %d:%d" % (fx, address, len(values)))
+        if _trace.enabled: _trace.debug("set-values[%d] %d:%d", fx, address, len(values))
         self.__set(self.decode(fx), address, values)
 
     #--------------------------------------------------------------------------#
@@ -110,7 +127,7 @@ class DatabaseSlaveContext(IModbusSlaveContext):
         query  = self._table.select(and_(
             self._table.c.type == type,
             self._table.c.index >= offset,
-            self._table.c.index <= offset + count))
+            self._table.c.index < offset + count))
         query = query.order_by(self._table.c.index.asc())
         result = self._connection.execute(query).fetchall()
         return [row.value for row in result]
@@ -166,8 +183,8 @@ class DatabaseSlaveContext(IModbusSlaveContext):
         :returns: The result of the validation
         '''
         query  = self._table.select(and_(
-            self._table.c.type == type,
+            self._table.c.type == key,
             self._table.c.index >= offset,
-            self._table.c.index <= offset + count))
-        result = self._connection.execute(query)
-        return result.rowcount == count
+            self._table.c.index < offset + count))
+        result = self._connection.execute(query).fetchall()
+        return len(result) == count
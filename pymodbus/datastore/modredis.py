@@ -1,5 +1,6 @@
 import redis
 from pymodbus.interfaces import IModbusSlaveContext
+from pymodbus.trace import getTracer
 from pymodbus.utilities import pack_bitstring, unpack_bitstring
 
 #---------------------------------------------------------------------------#
@@ -7,6 +8,7 @@ from pymodbus.utilities import pack_bitstring, unpack_bitstring
 #---------------------------------------------------------------------------#
 import logging;
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -51,7 +53,7 @@ class RedisSlaveContext(IModbusSlaveContext):
         :returns: True if the request in within range, False otherwise
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("validate[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("validate[%d] %d:%d", fx, address, count)
         return self.__val_callbacks[self.decode(fx)](address, count)
 
     def getValues(self, fx, address, count=1):
@@ -63,9 +65,21 @@ class RedisSlaveContext(IModbusSlaveContext):
         :returns: The requested values from a:a+c
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("getValues[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("getValues[%d] %d:%d", fx, address, count)
         return self.__get_callbacks[self.decode(fx)](address, count)
 
+    def getValuesChecked(self, fx, address, count=1):
+        ''' Validates the request and retrieves the values if it is in range
+
+        :param fx: The function we are working with
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c, None if out of range
+        '''
+        address = address + 1  # section 4.4 of specification
+        if _trace.enabled: _trace.debug("getValuesChecked[%d] %d:%d", fx, address, count)
+        return self.__chk_callbacks[self.decode(fx)](address, count)
+
     def setValues(self, fx, address, values):
         ''' Sets the datastore with the supplied values
 
@@ -74,7 +88,7 @@ class RedisSlaveContext(IModbusSlaveContext):
         :param values: The new values to be set
         '''
         address = address + 1  # section 4.4 of specification
-        _logger.debug("setValues[%d] %d:%d" % (fx, address, len(values)))
+        if _trace.enabled: _trace.debug("setValues[%d] %d:%d", fx, address, len(values))
         self.__set_callbacks[self.decode(fx)](address, values)
 
     #--------------------------------------------------------------------------#
@@ -105,6 +119,12 @@ class RedisSlaveContext(IModbusSlaveContext):
             'h' : lambda o, c: self.__get_reg('h', o, c),
             'i' : lambda o, c: self.__get_reg('i', o, c),
         }
+        self.__chk_callbacks = {
+            'd' : lambda o, c: self.__chk_bit('d', o, c),
+            'c' : lambda o, c: self.__chk_bit('c', o, c),
+            'h' : lambda o, c: self.__chk_reg('h', o, c),
+            'i' : lambda o, c: self.__chk_reg('i', o, c),
+        }
         self.__set_callbacks = {
             'd' : lambda o, v: self.__set_bit('d', o, v),
             'c' : lambda o, v: self.__set_bit('c', o, v),
@@ -157,6 +177,19 @@ class RedisSlaveContext(IModbusSlaveContext):
         result = unpack_bitstring(result)
         return result[offset:offset + count]
 
+    def __chk_bit(self, key, offset, count):
+        ''' Reads the given range if it is currently set in redis.
+
+        :param key: The key prefix to use
+        :param offset: The address offset to start at
+        :param count: The number of bits to read
+        :returns: The requested bits, None if any of them are not set
+        '''
+        response = self.__get_bit_values(key, offset, count)
+        if None in response: return None
+        result = unpack_bitstring(''.join(response))
+        return result[offset:offset + count]
+
     def __set_bit(self, key, offset, values):
         '''
 
@@ -224,6 +257,18 @@ class RedisSlaveContext(IModbusSlaveContext):
         response = [r or self.__reg_default for r in response]
         return response[offset:offset + count]
 
+    def __chk_reg(self, key, offset, count):
+        ''' Reads the given range if it is currently set in redis.
+
+        :param key: The key prefix to use
+        :param offset: The address offset to start at
+        :param count: The number of registers to read
+        :returns: The requested registers, None if any of them are not set
+        '''
+        response = self.__get_reg_values(key, offset, count)
+        if None in response: return None
+        return response[offset:offset + count]
+
     def __set_reg(self, key, offset, values):
         '''
 
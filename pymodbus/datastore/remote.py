@@ -1,11 +1,13 @@
 from pymodbus.exceptions import NotImplementedException
 from pymodbus.interfaces import IModbusSlaveContext
+from pymodbus.trace import getTracer
 
 #---------------------------------------------------------------------------#
 # Logging
 #---------------------------------------------------------------------------#
 import logging
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -37,7 +39,7 @@ class RemoteSlaveContext(IModbusSlaveContext):
         :param count: The number of values to test
         :returns: True if the request in within range, False otherwise
         '''
-        _logger.debug("validate[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("validate[%d] %d:%d", fx, address, count)
         result = self.__get_callbacks[self.decode(fx)](address, count)
         return result.function_code < 0x80
 
@@ -50,10 +52,25 @@ class RemoteSlaveContext(IModbusSlaveContext):
         :returns: The requested values from a:a+c
         '''
         # TODO deal with deferreds
-        _logger.debug("get values[%d] %d:%d" % (fx, address, count))
+        if _trace.enabled: _trace.debug("get values[%d] %d:%d", fx, address, count)
         result = self.__get_callbacks[self.decode(fx)](address, count)
         return self.__extract_result(self.decode(fx), result)
 
+    def getValuesChecked(self, fx, address, count=1):
+        ''' Validates the request and retrieves the values if it is in range
+        with a single request to the remote device.
+
+        :param fx: The function we are working with
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c, None if out of range
+        '''
+        if _trace.enabled: _trace.debug("get values checked[%d] %d:%d", fx, address, count)
+        result = self.__get_callbacks[self.decode(fx)](address, count)
+        if result.function_code < 0x80:
+            return self.__extract_result(self.decode(fx), result)
+        return None
+
     def setValues(self, fx, address, values):
         ''' Sets the datastore with the supplied values
 
@@ -62,7 +79,7 @@ class RemoteSlaveContext(IModbusSlaveContext):
         :param values: The new values to be set
         '''
         # TODO deal with deferreds
-        _logger.debug("set values[%d] %d:%d" % (fx, address, len(values)))
+        if _trace.enabled: _trace.debug("set values[%d] %d:%d", fx, address, len(values))
         self.__set_callbacks[self.decode(fx)](address, values)
 
     def __str__(self):
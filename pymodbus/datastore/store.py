@@ -45,8 +45,45 @@ or a range read to fail.
 
 I have both methods implemented, and leave it up to the user to change
 based on their preference.
+
+Shared Datastore
+-------------------------
+
+Both of the above live in the memory of a single process. When the
+server is run as a number of forked processes, each process has its
+own copy of the data, so a write handled by one process would never
+be seen by a read handled by another. The shared datastore keeps its
+values in a block of shared memory that is mapped before the server
+processes are forked::
+
+    block = ModbusSharedDataBlock(0x00, [0x00] * 100)
+
+The memory can also be a file, which other programs can map as well
+to read and write the live values without going through modbus::
+
+    registers = ModbusSharedDataBlock(0x00, [0x00] * 100, path='/dev/shm/hr')
+    coils = ModbusSharedBitDataBlock(0x00, [False] * 100, path='/dev/shm/co')
+
+Such a file simply holds the values as they are sent on the wire: the
+registers are 16 bit big endian values, and the bits are packed eight
+to a byte with the lowest address in the least significant bit. Another
+python program can attach to an existing file by leaving out the values
+(the bits are padded to a whole byte, so attaching to the bits needs the
+number of them as well)::
+
+    registers = ModbusSharedDataBlock(0x00, path='/dev/shm/hr')
+    coils = ModbusSharedBitDataBlock(0x00, path='/dev/shm/co', count=100)
 """
+import os
+import mmap
+import ctypes
 from pymodbus.exceptions import NotImplementedException, ParameterException
+from array import array
+from bisect import bisect_right
+from collections import MutableMapping
+from binascii import a2b_hex, b2a_hex
+from pymodbus.utilities import pack_bitstring, BitArray
+from pymodbus.utilities import pack_registers, PackedRegisters
 
 #---------------------------------------------------------------------------#
 # Logging
@@ -180,14 +217,54 @@ class ModbusSequentialDataBlock(BaseModbusDataBlock):
         :param address: The starting address
         :param values: The new values to be set
         '''
-        if not isinstance(values, list):
+        if not hasattr(values, '__iter__'):
             values = [values]
         start = address - self.address
         self.values[start:start + len(values)] = values
 
 
+class _SparseValues(MutableMapping):
+    ''' A live view of the values of a sparse datastore by address
+
+    Setting or deleting an address updates the runs of the datastore,
+    so this behaves like the dictionary the datastore used to keep.
+    '''
+
+    def __init__(self, block):
+        ''' Initializes the view
+
+        :param block: The sparse datastore to view
+        '''
+        self.block = block
+
+    def __getitem__(self, address):
+        return self.block.getValues(address)[0]
+
+    def __setitem__(self, address, value):
+        self.block.setValues(address, [value])
+
+    def __delitem__(self, address):
+        self.block._remove(address)
+
+    def __iter__(self):
+        return (address for address, value in self.block)
+
+    def __len__(self):
+        return sum(1 for _ in self.block)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class ModbusSparseDataBlock(BaseModbusDataBlock):
-    ''' Creates a sparse modbus datastore '''
+    ''' Creates a sparse modbus datastore
+
+    The values are kept as a sorted index of the contiguous runs of
+    addresses that are populated (each with a list of its values), and
+    the runs are merged as new addresses are set. Checking a request is
+    then a single binary search, and reading it a slice of one run,
+    however many addresses are populated.
+    '''
 
     def __init__(self, values):
         ''' Initializes the datastore
@@ -197,14 +274,306 @@ class ModbusSparseDataBlock(BaseModbusDataBlock):
 
         :param values: Either a list or a dictionary of values
         '''
+        self.values = values
+        self.default_value = self.__runs[0][0].__class__()
+
+    @staticmethod
+    def create():
+        ''' Factory method to create a datastore with the
+        full address space initialized to 0x00
+
+        :returns: An initialized datastore
+        '''
+        return ModbusSparseDataBlock([0x00]*65536)
+
+    def default(self, count, value=False):
+        ''' Used to initialize a store to one value
+
+        :param count: The number of fields to set
+        :param value: The default value to set to the fields
+        '''
+        self.default_value = value
+        self.__starts, self.__runs = [self.address], [[value] * count]
+
+    def reset(self):
+        ''' Resets the datastore to the initialized default value '''
+        for run in self.__runs:
+            run[:] = [self.default_value] * len(run)
+
+    def validate(self, address, count=1):
+        ''' Checks to see if the request is in range
+
+        :param address: The starting address
+        :param count: The number of values to test for
+        :returns: True if the request in within range, False otherwise
+        '''
+        if count <= 0: return False
+        index = bisect_right(self.__starts, address) - 1
+        if index < 0: return False
+        return address + count <= self.__starts[index] + len(self.__runs[index])
+
+    def getValues(self, address, count=1):
+        ''' Returns the requested values of the datastore
+
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c
+        '''
+        index = bisect_right(self.__starts, address) - 1
+        if index >= 0:
+            start = address - self.__starts[index]
+            values = self.__runs[index][start:start + count]
+            if len(values) == count: return values
+        raise KeyError(address)
+
+    def setValues(self, address, values):
+        ''' Sets the requested values of the datastore
+
+        :param address: The starting address
+        :param values: The new values to be set
+        '''
         if isinstance(values, dict):
-            self.values = values
-        if hasattr(values, '__iter__'):
-            self.values = dict(enumerate(values))
+            start, run = None, []
+            for idx in sorted(values.iterkeys()):
+                if run and idx != start + len(run):
+                    self.__update(start, run)
+                    run = []
+                if not run: start = idx
+                run.append(values[idx])
+            if run: self.__update(start, run)
+        else:
+            if not hasattr(values, '__iter__'):
+                values = [values]
+            self.__update(address, list(values))
+
+    def __update(self, address, values):
+        ''' Sets a contiguous run of values, merging it into the runs
+        it overlaps or touches
+
+        :param address: The starting address
+        :param values: The list of values to set
+        '''
+        if not values: return
+        starts, runs, stop = self.__starts, self.__runs, address + len(values)
+        first = bisect_right(starts, address) - 1
+        if first >= 0 and stop <= starts[first] + len(runs[first]):
+            offset = address - starts[first]    # the common case
+            runs[first][offset:offset + len(values)] = values
+            return
+        if first < 0 or starts[first] + len(runs[first]) < address:
+            first += 1
+        last = bisect_right(starts, stop)
+        start, run = address, values
+        if first < last:
+            if starts[first] < address:
+                start = starts[first]
+                run = runs[first][:address - start] + run
+            tail = starts[last - 1] + len(runs[last - 1]) - stop
+            if tail > 0: run += runs[last - 1][-tail:]
+        starts[first:last], runs[first:last] = [start], [run]
+
+    def _remove(self, address):
+        ''' Removes a single address from the datastore
+
+        :param address: The address to remove
+        '''
+        starts, runs = self.__starts, self.__runs
+        index = bisect_right(starts, address) - 1
+        if index < 0 or address >= starts[index] + len(runs[index]):
+            raise KeyError(address)
+        start, run = starts[index], runs[index]
+        offset = address - start
+        pieces = [(start, run[:offset]), (address + 1, run[offset + 1:])]
+        pieces = [piece for piece in pieces if piece[1]]
+        starts[index:index + 1] = [piece[0] for piece in pieces]
+        runs[index:index + 1] = [piece[1] for piece in pieces]
+        if starts: self.address = starts[0]
+
+    def __index(self, values):
+        ''' Replaces all of the values of the datastore
+
+        :param values: Either a list or a dictionary of values
+        '''
+        if isinstance(values, dict): address = None
+        elif hasattr(values, '__iter__'): address, values = 0x00, list(values)
         else: raise ParameterException(
             "Values for datastore must be a list or dictionary")
-        self.default_value = self.values.values()[0].__class__()
-        self.address = self.values.iterkeys().next()
+        if not values: raise ParameterException(
+            "Values for datastore must not be empty")
+        self.__starts, self.__runs = [], []
+        self.setValues(address, values)
+        self.address = self.__starts[0]
+
+    def __str__(self):
+        ''' Build a representation of the datastore
+
+        :returns: A string representation of the datastore
+        '''
+        count = sum(len(run) for run in self.__runs)
+        return "DataStore(%d, %d)" % (count, self.default_value)
+
+    def __iter__(self):
+        ''' Iterater over the data block data
+
+        :returns: An iterator of the data block data
+        '''
+        for start, run in zip(self.__starts, self.__runs):
+            for offset, value in enumerate(run):
+                yield start + offset, value
+
+    # a live view of the populated values by address (set it to replace them)
+    values = property(lambda self: _SparseValues(self), __index)
+
+
+def _unpack_bits(data):
+    ''' Converts packed bits to a number (the first bit being the lowest)
+
+    :param data: The packed bits
+    :returns: The bits as a number
+    '''
+    return int(b2a_hex(data[::-1]) or '0', 16)
+
+
+def _pack_bits(value, size):
+    ''' Converts a number to packed bits (the lowest bit being the first)
+
+    :param value: The bits as a number
+    :param size: The number of bytes to pack the bits into
+    :returns: The packed bits
+    '''
+    return a2b_hex('%0*x' % (size * 2, value))[::-1]
+
+
+class ModbusBitDataBlock(BaseModbusDataBlock):
+    ''' Creates a sequential modbus bit datastore
+
+    This is a sequential datastore for coils and discrete inputs that
+    packs the bits eight to a byte (as they are sent on the wire), which
+    takes a 64th of the memory of a list of bools. The values are read
+    as a BitArray, which the read responses encode without unpacking the
+    bits, and a BitArray (as decoded by a write request) is written back
+    as whole bytes where the addresses line up.
+    '''
+
+    def __init__(self, address, values):
+        ''' Initializes the datastore
+
+        :param address: The starting address of the datastore
+        :param values: Either a list of values or a single value
+        '''
+        if not hasattr(values, '__iter__'):
+            values = [values]
+        self.address = address
+        self.default_value = False
+        self.count = len(values)
+        self.memory = bytearray(pack_bitstring(values))
+
+    @staticmethod
+    def create():
+        ''' Factory method to create a datastore with the
+        full address space initialized to False
+
+        :returns: An initialized datastore
+        '''
+        return ModbusBitDataBlock(0x00, BitArray('\x00' * 8192))
+
+    def default(self, count, value=False):
+        ''' Used to initialize a store to one value
+
+        :param count: The number of fields to set
+        :param value: The default value to set to the fields
+        '''
+        self.default_value = value
+        self.count = count
+        self.memory = bytearray(pack_bitstring([value] * count))
+
+    def reset(self):
+        ''' Resets the datastore to the initialized default value '''
+        image = pack_bitstring([self.default_value] * self.count)
+        self.memory[:len(image)] = image
+
+    def validate(self, address, count=1):
+        ''' Checks to see if the request is in range
+
+        :param address: The starting address
+        :param count: The number of values to test for
+        :returns: True if the request in within range, False otherwise
+        '''
+        result  = (self.address <= address)
+        result &= ((self.address + self.count) >= (address + count))
+        return result
+
+    def getValues(self, address, count=1):
+        ''' Returns the requested values of the datastore
+
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c (as a BitArray)
+        '''
+        start  = address - self.address
+        offset = start & 7
+        data = str(self.memory[start >> 3:(start + count + 7) >> 3])
+        if offset:
+            bits = _unpack_bits(data) >> offset
+            data = _pack_bits(bits & ((1 << count) - 1), (count + 7) >> 3)
+        return BitArray(data, count)
+
+    def setValues(self, address, values):
+        ''' Sets the requested values of the datastore
+
+        :param address: The starting address
+        :param values: The new values to be set
+        '''
+        if not hasattr(values, '__iter__'):
+            values = [values]
+        count = len(values)
+        start = address - self.address
+        first, last = start >> 3, (start + count + 7) >> 3
+        offset = start & 7
+        if not (offset or count & 7):
+            self.memory[first:last] = pack_bitstring(values)
+            return
+        mask  = ((1 << count) - 1) << offset
+        image = _unpack_bits(str(self.memory[first:last])) & ~mask
+        image |= _unpack_bits(pack_bitstring(values)) << offset
+        self.memory[first:last] = _pack_bits(image, last - first)
+
+    def __str__(self):
+        ''' Build a representation of the datastore
+
+        :returns: A string representation of the datastore
+        '''
+        return "DataStore(%d, %d)" % (self.count, self.default_value)
+
+    def __iter__(self):
+        ''' Iterater over the data block data
+
+        :returns: An iterator of the data block data
+        '''
+        return enumerate(self.getValues(self.address, self.count))
+
+
+class ModbusRegisterDataBlock(BaseModbusDataBlock):
+    ''' Creates a sequential modbus register datastore
+
+    This is a sequential datastore for holding and input registers that
+    keeps them in an array of 16 bit values, which takes two bytes per
+    register instead of a reference to an int. The registers are read as
+    PackedRegisters, so the bytes of a read registers response are a
+    slice of the datastore (swapped to wire order in a single step).
+    '''
+
+    def __init__(self, address, values):
+        ''' Initializes the datastore
+
+        :param address: The starting address of the datastore
+        :param values: Either a list of values or a single value
+        '''
+        if not hasattr(values, '__iter__'):
+            values = [values]
+        self.address = address
+        self.default_value = 0
+        self.values = array('H', values)
 
     @staticmethod
     def create():
@@ -213,7 +582,20 @@ class ModbusSparseDataBlock(BaseModbusDataBlock):
 
         :returns: An initialized datastore
         '''
-        return ModbusSparseDataBlock([0x00]*65536)
+        return ModbusRegisterDataBlock(0x00, PackedRegisters('\x00' * 131072))
+
+    def default(self, count, value=0x00):
+        ''' Used to initialize a store to one value
+
+        :param count: The number of fields to set
+        :param value: The default value to set to the fields
+        '''
+        self.default_value = value
+        self.values = array('H', [value]) * count
+
+    def reset(self):
+        ''' Resets the datastore to the initialized default value '''
+        self.default(len(self.values), self.default_value)
 
     def validate(self, address, count=1):
         ''' Checks to see if the request is in range
@@ -222,9 +604,98 @@ class ModbusSparseDataBlock(BaseModbusDataBlock):
         :param count: The number of values to test for
         :returns: True if the request in within range, False otherwise
         '''
-        if count == 0: return False
-        handle = set(range(address, address + count))
-        return handle.issubset(set(self.values.iterkeys()))
+        result  = (self.address <= address)
+        result &= ((self.address + len(self.values)) >= (address + count))
+        return result
+
+    def getValues(self, address, count=1):
+        ''' Returns the requested values of the datastore
+
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c (as PackedRegisters)
+        '''
+        start = address - self.address
+        return PackedRegisters(pack_registers(self.values[start:start + count]))
+
+    def setValues(self, address, values):
+        ''' Sets the requested values of the datastore
+
+        :param address: The starting address
+        :param values: The new values to be set
+        '''
+        if not hasattr(values, '__iter__'):
+            values = [values]
+        start = address - self.address
+        self.values[start:start + len(values)] = array('H', values)
+
+    def __iter__(self):
+        ''' Iterater over the data block data
+
+        :returns: An iterator of the data block data
+        '''
+        return enumerate(self.getValues(self.address, len(self.values)))
+
+
+class ModbusPagedDataBlock(BaseModbusDataBlock):
+    ''' Creates a sequential modbus datastore that is allocated lazily
+
+    The address space is split into fixed size pages that are only
+    allocated when one of their values is first set; reading a page
+    that was never written returns the default value without allocating
+    it. A server with many slaves (a gateway for example) then starts
+    instantly and only uses memory for the values it actually uses.
+    '''
+
+    def __init__(self, address, count, value=0x00, size=256):
+        ''' Initializes the datastore
+
+        :param address: The starting address of the datastore
+        :param count: The number of values in the datastore
+        :param value: The default value of the datastore
+        :param size: The number of values in a page
+        '''
+        if size <= 0: raise ParameterException("Page size must be positive")
+        self.address = address
+        self.count = count
+        self.default_value = value
+        self.size = size
+        self.pages = {}
+
+    @staticmethod
+    def create(value=0x00):
+        ''' Factory method to create a datastore with the
+        full address space initialized to value (0x00 by default)
+
+        :param value: The default value of the datastore
+        :returns: An initialized datastore
+        '''
+        return ModbusPagedDataBlock(0x00, 65536, value)
+
+    def default(self, count, value=0x00):
+        ''' Used to initialize a store to one value
+
+        :param count: The number of fields to set
+        :param value: The default value to set to the fields
+        '''
+        self.default_value = value
+        self.count = count
+        self.pages = {}
+
+    def reset(self):
+        ''' Resets the datastore to the initialized default value '''
+        self.pages = {}
+
+    def validate(self, address, count=1):
+        ''' Checks to see if the request is in range
+
+        :param address: The starting address
+        :param count: The number of values to test for
+        :returns: True if the request in within range, False otherwise
+        '''
+        result  = (self.address <= address)
+        result &= ((self.address + self.count) >= (address + count))
+        return result
 
     def getValues(self, address, count=1):
         ''' Returns the requested values of the datastore
@@ -233,7 +704,16 @@ class ModbusSparseDataBlock(BaseModbusDataBlock):
         :param count: The number of values to retrieve
         :returns: The requested values from a:a+c
         '''
-        return [self.values[i] for i in range(address, address + count)]
+        result, start = [], address - self.address
+        while count > 0:
+            index, offset = divmod(start, self.size)
+            chunk = min(count, self.size - offset)
+            page = self.pages.get(index)
+            if page is None: result.extend([self.default_value] * chunk)
+            else: result.extend(page[offset:offset + chunk])
+            start += chunk
+            count -= chunk
+        return result
 
     def setValues(self, address, values):
         ''' Sets the requested values of the datastore
@@ -241,11 +721,183 @@ class ModbusSparseDataBlock(BaseModbusDataBlock):
         :param address: The starting address
         :param values: The new values to be set
         '''
-        if isinstance(values, dict):
-            for idx, val in values.iteritems():
-                self.values[idx] = val
+        if not hasattr(values, '__iter__'):
+            values = [values]
+        start, written = address - self.address, 0
+        while written < len(values):
+            index, offset = divmod(start + written, self.size)
+            chunk = min(len(values) - written, self.size - offset)
+            page = self.pages.get(index)
+            if page is None:
+                page = self.pages[index] = [self.default_value] * self.size
+            page[offset:offset + chunk] = values[written:written + chunk]
+            written += chunk
+
+    def __str__(self):
+        ''' Build a representation of the datastore
+
+        :returns: A string representation of the datastore
+        '''
+        return "DataStore(%d, %d)" % (self.count, self.default_value)
+
+    def __iter__(self):
+        ''' Iterater over the data block data
+
+        :returns: An iterator of the data block data
+        '''
+        return enumerate(self.getValues(self.address, self.count))
+
+
+def _map_memory(size, path=None):
+    ''' Maps a block of memory that can be shared with other processes
+
+    :param size: The size of the block in bytes (None for the file size)
+    :param path: An optional file to map (created if a size is given)
+    :returns: The mapped memory
+    '''
+    if not path:
+        if size is None: raise ParameterException(
+            "A shared datastore needs its values or a file to attach to")
+        return mmap.mmap(-1, size)
+    if size is None:
+        try: handle = os.open(path, os.O_RDWR)
+        except OSError, msg: raise ParameterException(str(msg))
+        size = os.fstat(handle).st_size
+    else:
+        handle = os.open(path, os.O_RDWR | os.O_CREAT, 0644)
+        os.ftruncate(handle, size)
+    try:
+        if not size: raise ParameterException("%s holds no values" % path)
+        return mmap.mmap(handle, size)
+    finally: os.close(handle)
+
+
+class ModbusSharedDataBlock(ModbusSequentialDataBlock):
+    ''' Creates a sequential modbus datastore in shared memory
+
+    The values are stored as 16 bit unsigned (big endian) integers in
+    a shared memory mapping, which is inherited by (and so shared with)
+    every process forked after the datastore was created, or in a file
+    that any other process can map. Apart from that, it behaves like
+    the sequential datastore, except that a value that does not fit in
+    a register raises an OverflowError (as in the register datastore).
+    '''
+
+    def __init__(self, address, values=None, path=None):
+        ''' Initializes the datastore
+
+        :param address: The starting address of the datastore
+        :param values: Either a list of values or a single value
+        :param path: An optional file to keep the values in
+        '''
+        if values is None:
+            self.memory = _map_memory(None, path)
+            self.default_value = 0
         else:
-            if not isinstance(values, list):
+            if not hasattr(values, '__iter__'):
                 values = [values]
-            for idx, val in enumerate(values):
-                self.values[address + idx] = val
+            values = list(values)
+            self.memory = _map_memory(len(values) * 2, path)
+            self.default_value = values[0].__class__()
+        self.address = address
+        count = len(self.memory) // 2
+        self.values = (ctypes.c_uint16.__ctype_be__ * count).from_buffer(self.memory)
+        if values is not None: self.memory[:] = pack_registers(values)
+
+    @staticmethod
+    def create():
+        ''' Factory method to create a datastore with the
+        full address space initialized to 0x00
+
+        :returns: An initialized datastore
+        '''
+        return ModbusSharedDataBlock(0x00, [0x00]*65536)
+
+    def default(self, count, value=0x00):
+        ''' Used to initialize a store to one value
+
+        The values are rewritten in the shared memory, which cannot
+        grow, so the count cannot be more than the memory holds.
+
+        :param count: The number of fields to set
+        :param value: The default value to set to the fields
+        '''
+        if count > len(self.memory) // 2: raise ParameterException(
+            "The shared datastore holds %d values" % (len(self.memory) // 2))
+        image = pack_registers([value]) * count
+        self.default_value = value
+        self.values = (ctypes.c_uint16.__ctype_be__ * count).from_buffer(self.memory)
+        self.memory[:len(image)] = image
+
+    def reset(self):
+        ''' Resets the datastore to the initialized default value '''
+        self.default(len(self.values), self.default_value)
+
+    def setValues(self, address, values):
+        ''' Sets the requested values of the datastore
+
+        :param address: The starting address
+        :param values: The new values to be set
+        '''
+        if not hasattr(values, '__iter__'):
+            values = [values]
+        start = (address - self.address) * 2
+        self.memory[start:start + len(values) * 2] = pack_registers(values)
+
+
+class ModbusSharedBitDataBlock(ModbusBitDataBlock):
+    ''' Creates a modbus bit datastore in shared memory
+
+    This is the shared datastore for coils and discrete inputs, which
+    keeps the packed bits of the bit datastore in shared memory (or a
+    file). Setting a bit rewrites the byte that it is in, so two
+    processes should not write neighboring bits at once.
+    '''
+
+    def __init__(self, address, values=None, path=None, count=None):
+        ''' Initializes the datastore
+
+        :param address: The starting address of the datastore
+        :param values: Either a list of values or a single value
+        :param path: An optional file to keep the values in
+        :param count: The number of bits in the file (to attach to it)
+        '''
+        self.address = address
+        self.default_value = False
+        if values is None:
+            if count is None: raise ParameterException(
+                "The number of bits in %s is required to attach to it" % path)
+            self.memory = _map_memory(None, path)
+            if len(self.memory) < (count + 7) // 8: raise ParameterException(
+                "%s holds fewer than %d bits" % (path, count))
+            self.count = count
+        else:
+            if not hasattr(values, '__iter__'):
+                values = [values]
+            self.count = len(values)
+            self.memory = _map_memory((self.count + 7) // 8, path)
+            self.memory[:] = pack_bitstring(values)
+
+    @staticmethod
+    def create():
+        ''' Factory method to create a datastore with the
+        full address space initialized to False
+
+        :returns: An initialized datastore
+        '''
+        return ModbusSharedBitDataBlock(0x00, [False]*65536)
+
+    def default(self, count, value=False):
+        ''' Used to initialize a store to one value
+
+        The bits are rewritten in the shared memory, which cannot grow,
+        so the count cannot be more than the memory holds.
+
+        :param count: The number of fields to set
+        :param value: The default value to set to the fields
+        '''
+        if (count + 7) // 8 > len(self.memory): raise ParameterException(
+            "The shared datastore holds %d bits" % (len(self.memory) * 8))
+        self.default_value = value
+        self.count = count
+        self.reset()
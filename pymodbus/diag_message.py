@@ -27,6 +27,8 @@ class DiagnosticStatusRequest(ModbusRequest):
     '''
     This is a base class for all of the diagnostic request functions
     '''
+    # the sub function code is a class constant that decode overwrites
+    __slots__ = ('message', '__dict__')
     function_code = 0x08
     _rtu_frame_size = 8
 
@@ -71,6 +73,8 @@ class DiagnosticStatusResponse(ModbusResponse):
     data and lets the higher classes define what extra data to append
     and how to execute a request
     '''
+    # the sub function code is a class constant that decode overwrites
+    __slots__ = ('message', '__dict__')
     function_code = 0x08
     _rtu_frame_size = 8
 
@@ -117,6 +121,7 @@ class DiagnosticStatusSimpleRequest(DiagnosticStatusRequest):
     If a function inherits this, they only need to implement
     the execute method
     '''
+    __slots__ = ()
 
     def __init__(self, data=0x0000):
         '''
@@ -142,6 +147,7 @@ class DiagnosticStatusSimpleResponse(DiagnosticStatusResponse):
     as data and their function code and they are returned
     2 bytes of data.
     '''
+    __slots__ = ()
 
     def __init__(self, data=0x0000):
         ''' General initializer for a simple diagnostic response
@@ -161,6 +167,7 @@ class ReturnQueryDataRequest(DiagnosticStatusRequest):
     in the response. The entire response message should be identical to the
     request.
     '''
+    __slots__ = ()
     sub_function_code = 0x0000
 
     def __init__(self, message=0x0000):
@@ -187,6 +194,7 @@ class ReturnQueryDataResponse(DiagnosticStatusResponse):
     in the response. The entire response message should be identical to the
     request.
     '''
+    __slots__ = ()
     sub_function_code = 0x0000
 
     def __init__(self, message=0x0000):
@@ -212,6 +220,7 @@ class RestartCommunicationsOptionRequest(DiagnosticStatusRequest):
     not currently in Listen Only Mode, a normal response is returned. This
     occurs before the restart is executed.
     '''
+    __slots__ = ()
     sub_function_code = 0x0001
 
     def __init__(self, toggle=False):
@@ -242,6 +251,7 @@ class RestartCommunicationsOptionResponse(DiagnosticStatusResponse):
     not currently in Listen Only Mode, a normal response is returned. This
     occurs before the restart is executed.
     '''
+    __slots__ = ()
     sub_function_code = 0x0001
 
     def __init__(self, toggle=False):
@@ -263,6 +273,7 @@ class ReturnDiagnosticRegisterRequest(DiagnosticStatusSimpleRequest):
     The contents of the remote device's 16-bit diagnostic register are
     returned in the response
     '''
+    __slots__ = ()
     sub_function_code = 0x0002
 
     def execute(self, *args):
@@ -280,6 +291,7 @@ class ReturnDiagnosticRegisterResponse(DiagnosticStatusSimpleResponse):
     The contents of the remote device's 16-bit diagnostic register are
     returned in the response
     '''
+    __slots__ = ()
     sub_function_code = 0x0002
 
 
@@ -293,6 +305,7 @@ class ChangeAsciiInputDelimiterRequest(DiagnosticStatusSimpleRequest):
     character). This function is useful in cases of a Line Feed is not
     required at the end of ASCII messages.
     '''
+    __slots__ = ()
     sub_function_code = 0x0003
 
     def execute(self, *args):
@@ -312,6 +325,7 @@ class ChangeAsciiInputDelimiterResponse(DiagnosticStatusSimpleResponse):
     character). This function is useful in cases of a Line Feed is not
     required at the end of ASCII messages.
     '''
+    __slots__ = ()
     sub_function_code = 0x0003
 
 
@@ -325,6 +339,7 @@ class ForceListenOnlyModeRequest(DiagnosticStatusSimpleRequest):
     allowing them to continue communicating without interruption from the
     addressed remote device. No response is returned.
     '''
+    __slots__ = ()
     sub_function_code = 0x0004
 
     def execute(self, *args):
@@ -345,6 +360,7 @@ class ForceListenOnlyModeResponse(DiagnosticStatusResponse):
 
     This does not send a response
     '''
+    __slots__ = ()
     sub_function_code = 0x0004
     should_respond    = False
 
@@ -363,6 +379,7 @@ class ClearCountersRequest(DiagnosticStatusSimpleRequest):
     The goal is to clear ll counters and the diagnostic register.
     Also, counters are cleared upon power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000A
 
     def execute(self, *args):
@@ -379,6 +396,7 @@ class ClearCountersResponse(DiagnosticStatusSimpleResponse):
     The goal is to clear ll counters and the diagnostic register.
     Also, counters are cleared upon power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000A
 
 
@@ -391,6 +409,7 @@ class ReturnBusMessageCountRequest(DiagnosticStatusSimpleRequest):
     remote device has detected on the communications systems since its last
     restart, clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000B
 
     def execute(self, *args):
@@ -408,6 +427,7 @@ class ReturnBusMessageCountResponse(DiagnosticStatusSimpleResponse):
     remote device has detected on the communications systems since its last
     restart, clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000B
 
 
@@ -420,6 +440,7 @@ class ReturnBusCommunicationErrorCountRequest(DiagnosticStatusSimpleRequest):
     by the remote device since its last restart, clear counter operation, or
     power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000C
 
     def execute(self, *args):
@@ -437,6 +458,7 @@ class ReturnBusCommunicationErrorCountResponse(DiagnosticStatusSimpleResponse):
     by the remote device since its last restart, clear counter operation, or
     power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000C
 
 
@@ -449,6 +471,7 @@ class ReturnBusExceptionErrorCountRequest(DiagnosticStatusSimpleRequest):
     responses returned by the remote device since its last restart,
     clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000D
 
     def execute(self, *args):
@@ -466,6 +489,7 @@ class ReturnBusExceptionErrorCountResponse(DiagnosticStatusSimpleResponse):
     responses returned by the remote device since its last restart,
     clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000D
 
 
@@ -478,6 +502,7 @@ class ReturnSlaveMessageCountRequest(DiagnosticStatusSimpleRequest):
     remote device, or broadcast, that the remote device has processed since
     its last restart, clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000E
 
     def execute(self, *args):
@@ -495,6 +520,7 @@ class ReturnSlaveMessageCountResponse(DiagnosticStatusSimpleResponse):
     remote device, or broadcast, that the remote device has processed since
     its last restart, clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000E
 
 
@@ -507,6 +533,7 @@ class ReturnSlaveNoResponseCountRequest(DiagnosticStatusSimpleRequest):
     remote device, or broadcast, that the remote device has processed since
     its last restart, clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000F
 
     def execute(self, *args):
@@ -524,6 +551,7 @@ class ReturnSlaveNoReponseCountResponse(DiagnosticStatusSimpleResponse):
     remote device, or broadcast, that the remote device has processed since
     its last restart, clear counters operation, or power-up
     '''
+    __slots__ = ()
     sub_function_code = 0x000F
 
 
@@ -537,6 +565,7 @@ class ReturnSlaveNAKCountRequest(DiagnosticStatusSimpleRequest):
     response, since its last restart, clear counters operation, or power-up.
     Exception responses are described and listed in section 7 .
     '''
+    __slots__ = ()
     sub_function_code = 0x0010
 
     def execute(self, *args):
@@ -555,6 +584,7 @@ class ReturnSlaveNAKCountResponse(DiagnosticStatusSimpleResponse):
     response, since its last restart, clear counters operation, or power-up.
     Exception responses are described and listed in section 7.
     '''
+    __slots__ = ()
     sub_function_code = 0x0010
 
 
@@ -567,6 +597,7 @@ class ReturnSlaveBusyCountRequest(DiagnosticStatusSimpleRequest):
     remote device for which it returned a Slave Device Busy exception response,
     since its last restart, clear counters operation, or power-up.
     '''
+    __slots__ = ()
     sub_function_code = 0x0011
 
     def execute(self, *args):
@@ -584,6 +615,7 @@ class ReturnSlaveBusyCountResponse(DiagnosticStatusSimpleResponse):
     remote device for which it returned a Slave Device Busy exception response,
     since its last restart, clear counters operation, or power-up.
     '''
+    __slots__ = ()
     sub_function_code = 0x0011
 
 
@@ -598,6 +630,7 @@ class ReturnSlaveBusCharacterOverrunCountRequest(DiagnosticStatusSimpleRequest):
     overrun is caused by data characters arriving at the port faster than they
     can be stored, or by the loss of a character due to a hardware malfunction.
     '''
+    __slots__ = ()
     sub_function_code = 0x0012
 
     def execute(self, *args):
@@ -617,6 +650,7 @@ class ReturnSlaveBusCharacterOverrunCountResponse(DiagnosticStatusSimpleResponse
     overrun is caused by data characters arriving at the port faster than they
     can be stored, or by the loss of a character due to a hardware malfunction.
     '''
+    __slots__ = ()
     sub_function_code = 0x0012
 
 
@@ -629,6 +663,7 @@ class ReturnIopOverrunCountRequest(DiagnosticStatusSimpleRequest):
     faster than they can be stored, or by the loss of a character due
     to a hardware malfunction.  This function is specific to the 884.
     '''
+    __slots__ = ()
     sub_function_code = 0x0013
 
     def execute(self, *args):
@@ -647,6 +682,7 @@ class ReturnIopOverrunCountResponse(DiagnosticStatusSimpleResponse):
     IOP overrun condition, since its last restart, clear counters
     operation, or power-up.
     '''
+    __slots__ = ()
     sub_function_code = 0x0013
 
 
@@ -660,6 +696,7 @@ class ClearOverrunCountRequest(DiagnosticStatusSimpleRequest):
     An error flag should be cleared, but nothing else in the
     specification mentions is, so it is ignored.
     '''
+    __slots__ = ()
     sub_function_code = 0x0014
 
     def execute(self, *args):
@@ -675,6 +712,7 @@ class ClearOverrunCountResponse(DiagnosticStatusSimpleResponse):
     '''
     Clears the overrun error counter and reset the error flag
     '''
+    __slots__ = ()
     sub_function_code = 0x0014
 
 
@@ -692,6 +730,7 @@ class GetClearModbusPlusRequest(DiagnosticStatusSimpleRequest):
     them. Statistics are also cleared on power-up of the slave
     device.
     '''
+    __slots__ = ()
     sub_function_code = 0x0015
 
     def execute(self, *args):
@@ -713,6 +752,7 @@ class GetClearModbusPlusResponse(DiagnosticStatusSimpleResponse):
     length of the data field). The data contains the statistics for
     the Modbus Plus peer processor in the slave device.
     '''
+    __slots__ = ()
     sub_function_code = 0x0015
 
 
@@ -16,6 +16,7 @@ from pymodbus.pdu import ExceptionResponse
 from pymodbus.pdu import ModbusExceptions as ecode
 from pymodbus.interfaces import IModbusDecoder
 from pymodbus.exceptions import ModbusException
+from pymodbus.trace import getTracer
 from pymodbus.bit_read_message import *
 from pymodbus.bit_write_message import *
 from pymodbus.diag_message import *
@@ -30,6 +31,7 @@ from pymodbus.register_write_message import *
 #---------------------------------------------------------------------------#
 import logging
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -113,7 +115,7 @@ class ServerDecoder(IModbusDecoder):
         :returns: The decoded request or illegal function request object
         '''
         function_code = ord(data[0])
-        _logger.debug("Factory Request[%d]" % function_code)
+        if _trace.enabled: _trace.debug("Factory Request[%d]", function_code)
         request = self.__lookup.get(function_code, lambda: None)()
         if not request:
             request = IllegalFunctionRequest(function_code)
@@ -178,6 +180,8 @@ class ClientDecoder(IModbusDecoder):
         :param function_code: The function code specified in a frame.
         :returns: The class of the PDU that has a matching `function_code`.
         '''
+        if function_code > 0x80:
+            return ExceptionResponse
         return self.__lookup.get(function_code, None)
 
     def decode(self, message):
@@ -202,7 +206,7 @@ class ClientDecoder(IModbusDecoder):
         :returns: The decoded request or an exception response object
         '''
         function_code = ord(data[0])
-        _logger.debug("Factory Response[%d]" % function_code)
+        if _trace.enabled: _trace.debug("Factory Response[%d]", function_code)
         response = self.__lookup.get(function_code, lambda: None)()
         if function_code > 0x80:
             code = function_code & 0x7f  # strip error portion
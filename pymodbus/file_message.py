@@ -80,6 +80,7 @@ class ReadFileRecordRequest(ModbusRequest):
     in the expected response, must not exceed the allowable length of the
     MODBUS PDU: 235 bytes.
     '''
+    __slots__ = ('records',)
     function_code = 0x14
 
     def __init__(self, records=None):
@@ -144,6 +145,7 @@ class ReadFileRecordResponse(ModbusResponse):
     bytes in all 'sub-responses.' In addition, each 'sub-response'
     contains a field that shows its own byte count.
     '''
+    __slots__ = ('records',)
     function_code = 0x14
 
     def __init__(self, records=None):
@@ -187,7 +189,7 @@ class ReadFileRecordResponse(ModbusResponse):
             response_length, reference_type = struct.unpack('>BB', data[count:count+2])
             count += response_length + 1 # the count is not included
             record = FileRecord(response_length=response_length,
-                record_data=data[count - response_length + 1:count])
+                record_data=str(bytearray(data[count - response_length + 1:count])))
             if reference_type == 0x06: self.records.append(record)
 
 
@@ -198,6 +200,7 @@ class WriteFileRecordRequest(ModbusRequest):
     and all record lengths are provided in terms of the number of 16
     bit words.
     '''
+    __slots__ = ('records',)
     function_code = 0x15
 
     def __init__(self, records=None):
@@ -244,7 +247,7 @@ class WriteFileRecordRequest(ModbusRequest):
             count  += response_length + 7
             record  = FileRecord(record_length=decoded[3],
                 file_number=decoded[1], record_number=decoded[2],
-                record_data=data[count - response_length:count])
+                record_data=str(bytearray(data[count - response_length:count])))
             if decoded[0] == 0x06: self.records.append(record)
 
     def execute(self, context):
@@ -263,6 +266,7 @@ class WriteFileRecordResponse(ModbusResponse):
     '''
     The normal response is an echo of the request.
     '''
+    __slots__ = ('records',)
     function_code = 0x15
 
     def __init__(self, records=None):
@@ -309,7 +313,7 @@ class WriteFileRecordResponse(ModbusResponse):
             count  += response_length + 7
             record  = FileRecord(record_length=decoded[3],
                 file_number=decoded[1], record_number=decoded[2],
-                record_data=data[count - response_length:count])
+                record_data=str(bytearray(data[count - response_length:count])))
             if decoded[0] == 0x06: self.records.append(record)
 
 
@@ -320,6 +324,7 @@ class MaskWriteRegisterRequest(ModbusRequest):
     register's current contents. The function can be used to set or clear
     individual bits in the register.
     '''
+    __slots__ = ('address', 'and_mask', 'or_mask')
     function_code = 0x16
     _rtu_frame_size = 10
 
@@ -359,10 +364,10 @@ class MaskWriteRegisterRequest(ModbusRequest):
             return self.doException(merror.IllegalValue)
         if not (0x0000 <= self.or_mask <= 0xffff):
             return self.doException(merror.IllegalValue)
-        if not context.validate(self.function_code, self.address, 1):
+        values = self.readValues(context, self.address, 1)
+        if values is None:
             return self.doException(merror.IllegalAddress)
-        values = context.getValues(self.function_code, self.address, 1)[0]
-        values = ((values & self.and_mask) | self.or_mask)
+        values = ((values[0] & self.and_mask) | self.or_mask)
         context.setValues(self.function_code, self.address, [values])
         return MaskWriteRegisterResponse(self.address, self.and_mask, self.or_mask)
 
@@ -372,6 +377,7 @@ class MaskWriteRegisterResponse(ModbusResponse):
     The normal response is an echo of the request. The response is returned
     after the register has been written.
     '''
+    __slots__ = ('address', 'and_mask', 'or_mask')
     function_code = 0x16
     _rtu_frame_size = 10
 
@@ -414,6 +420,7 @@ class ReadFifoQueueRequest(ModbusRequest):
     registers.  The function reads the queue contents, but does not clear
     them.
     '''
+    __slots__ = ('address', 'values')
     function_code = 0x18
     _rtu_frame_size = 6
 
@@ -464,6 +471,7 @@ class ReadFifoQueueResponse(ModbusResponse):
     If the queue count exceeds 31, an exception response is returned with an
     error code of 03 (Illegal Data Value).
     '''
+    __slots__ = ('values',)
     function_code = 0x18
 
     @classmethod
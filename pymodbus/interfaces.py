@@ -139,6 +139,46 @@ class IModbusFramer(object):
         raise NotImplementedException(
             "Method not implemented by derived class")
 
+    def processIncomingFrames(self, data):
+        ''' Batch version of processIncomingPacket
+
+        Instead of pushing each decoded message to a callback, all of the
+        messages completed by this chunk of data are returned in order.
+        This lets a server execute a pipelined burst of requests and
+        write all of the responses at once.
+
+        :param data: The new packet data
+        :returns: A list of the decoded messages
+        '''
+        frames = []
+        self.processIncomingPacket(data, frames.append)
+        return frames
+
+    def processSilence(self, callback):
+        ''' Ends the frame in progress because the line went silent
+
+        Framers that delimit frames by timing (rtu) use this to end a
+        frame they could not size; it is meant to be called by read loops
+        when a read times out. The other framers ignore it.
+
+        :param callback: The function to send results to
+        '''
+        pass
+
+    def calculateFrameSize(self, data):
+        ''' Calculates how many bytes the frame at the start of data needs
+
+        This lets a synchronous transport read exactly one frame instead
+        of waiting for a fixed size read to time out. Until the header has
+        been seen, the size of the header needed to work out the frame
+        size is returned. It is meant to be called again as data arrives.
+
+        :param data: The bytes of the frame received so far
+        :returns: The number of bytes the frame is known to need
+        '''
+        raise NotImplementedException(
+            "Method not implemented by derived class")
+
     def buildPacket(self, message):
         ''' Creates a ready to send modbus packet
 
@@ -161,6 +201,9 @@ class IModbusSlaveContext(object):
             validate(self, fx, address, count=1)
             getValues(self, fx, address, count=1)
             setValues(self, fx, address, values)
+
+    Derived classes may also override getValuesChecked(self, fx,
+    address, count=1) to validate and read a request in one pass.
     '''
     __fx_mapper = {2: 'd', 4: 'i'}
     __fx_mapper.update([(i, 'h') for i in [3, 6, 16, 22, 23]])
@@ -199,6 +242,21 @@ class IModbusSlaveContext(object):
         '''
         raise NotImplementedException("get context values")
 
+    def getValuesChecked(self, fx, address, count=1):
+        ''' Validates the request and retrieves the values if it is in range
+
+        By default this validates and then retrieves the values, contexts
+        that can do both at once (with one lookup, query, or request)
+        should override it.
+
+        :param fx: The function we are working with
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c, None if out of range
+        '''
+        if not self.validate(fx, address, count): return None
+        return self.getValues(fx, address, count)
+
     def setValues(self, fx, address, values):
         ''' Sets the datastore with the supplied values
 
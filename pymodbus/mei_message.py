@@ -20,6 +20,8 @@ _MCB = ModbusControlBlock()
 class ReadDeviceInformationRequest(ModbusRequest):
     '''
     '''
+    # the sub function code is a class constant that decode overwrites
+    __slots__ = ('read_code', 'object_id', '__dict__')
     function_code = 0x2b
     sub_function_code = 0x0e
     _rtu_frame_size = 3
@@ -78,6 +80,9 @@ class ReadDeviceInformationRequest(ModbusRequest):
 class ReadDeviceInformationResponse(ModbusResponse):
     '''
     '''
+    # the sub function code is a class constant that decode overwrites
+    __slots__ = ('read_code', 'conformity', 'more_follows',
+        'next_object_id', 'number_of_objects', 'information', '__dict__')
     function_code = 0x2b
     sub_function_code = 0x0e
 
@@ -140,7 +145,7 @@ class ReadDeviceInformationResponse(ModbusResponse):
         while count < len(data):
             object_id, object_length = struct.unpack('>BB', data[count:count+2])
             count += object_length + 2
-            self.information[object_id] = data[count-object_length:count]
+            self.information[object_id] = str(bytearray(data[count-object_length:count]))
 
     def __str__(self):
         ''' Builds a representation of the response
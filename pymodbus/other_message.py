@@ -22,6 +22,7 @@ class ReadExceptionStatusRequest(ModbusRequest):
     accessing this information, because the Exception Output references are
     known (no output reference is needed in the function).
     '''
+    __slots__ = ()
     function_code = 0x07
     _rtu_frame_size = 4
 
@@ -66,6 +67,7 @@ class ReadExceptionStatusResponse(ModbusResponse):
     in the least significant bit of the byte.  The contents of the eight
     Exception Status outputs are device specific.
     '''
+    __slots__ = ('status',)
     function_code = 0x07
     _rtu_frame_size = 5
 
@@ -123,6 +125,7 @@ class GetCommEventCounterRequest(ModbusRequest):
     (code 08), with a subfunction of Restart Communications Option
     (code 00 01) or Clear Counters and Diagnostic Register (code 00 0A).
     '''
+    __slots__ = ()
     function_code = 0x0b
     _rtu_frame_size = 4
 
@@ -167,6 +170,7 @@ class GetCommEventCounterResponse(ModbusResponse):
     remote device (a busy condition exists). Otherwise, the status word
     will be all zeros.
     '''
+    __slots__ = ('count', 'status')
     function_code = 0x0b
     _rtu_frame_size = 8
 
@@ -228,6 +232,7 @@ class GetCommEventLogRequest(ModbusRequest):
     chronological order.  Byte 0 is the most recent event. Each new byte
     flushes the oldest byte from the field.
     '''
+    __slots__ = ()
     function_code = 0x0c
     _rtu_frame_size = 4
 
@@ -276,6 +281,7 @@ class GetCommEventLogResponse(ModbusResponse):
     and a field containing 0-64 bytes of events. A byte count
     field defines the total length of the data in these four field
     '''
+    __slots__ = ('status', 'message_count', 'event_count', 'events')
     function_code = 0x0c
     _rtu_byte_count_pos = 3
 
@@ -338,6 +344,7 @@ class ReportSlaveIdRequest(ModbusRequest):
     This function code is used to read the description of the type, the
     current status, and other information specific to a remote device.
     '''
+    __slots__ = ()
     function_code = 0x11
     _rtu_frame_size = 4
 
@@ -379,6 +386,7 @@ class ReportSlaveIdResponse(ModbusResponse):
     The format of a normal response is shown in the following example.
     The data contents are specific to each type of device.
     '''
+    __slots__ = ('identifier', 'status')
     function_code = 0x11
     _rtu_byte_count_pos = 2
 
@@ -414,7 +422,7 @@ class ReportSlaveIdResponse(ModbusResponse):
         :param data: The packet data to decode
         '''
         length = struct.unpack('>B', data[0])[0]
-        self.identifier = data[1:length + 1]
+        self.identifier = str(bytearray(data[1:length + 1]))
         status = struct.unpack('>B', data[-1])[0]
         self.status = status == ModbusStatus.SlaveOn
 
@@ -1,6 +1,7 @@
 '''
 Contains base classes for modbus request/response/error packets
 '''
+from types import MemberDescriptorType
 from pymodbus.interfaces import Singleton
 from pymodbus.exceptions import NotImplementedException
 from pymodbus.constants import Defaults
@@ -13,6 +14,31 @@ import logging
 _logger = logging.getLogger(__name__)
 
 
+#---------------------------------------------------------------------------#
+# Helper Functions
+#---------------------------------------------------------------------------#
+__slot_names = {}
+
+def _slotNames(cls):
+    ''' Returns the names of the slots of a message class that can hold
+    a value, that is the ones that are not hidden by a class attribute
+
+    :param cls: The message class
+    :returns: The (mangled) names of the usable slots
+    '''
+    names = __slot_names.get(cls)
+    if names is None:
+        names = []
+        for klass in cls.__mro__:
+            for name in klass.__dict__.get('__slots__', ()):
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_%s%s' % (klass.__name__.lstrip('_'), name)
+                if isinstance(getattr(cls, name, None), MemberDescriptorType):
+                    names.append(name)
+        __slot_names[cls] = names
+    return names
+
+
 #---------------------------------------------------------------------------#
 # Base PDU's
 #---------------------------------------------------------------------------#
@@ -41,7 +67,26 @@ class ModbusPDU(object):
     .. attribute:: check
 
        This is used for LRC/CRC in the serial modbus protocols
+
+    .. attribute:: function_code
+
+       The function code of the message. Most messages define it as a
+       class constant, the ones that set it per instance (like the
+       exception responses) keep it in a slot.
+
+    The messages are slotted to keep them small and quick to create, so
+    the messages of this library (and the base request and response)
+    do not take attributes that they do not declare. A subclass should
+    declare the attributes it adds in its own `__slots__` (or an empty
+    tuple if it adds none); a subclass that does not (like most custom
+    messages) gets an instance dictionary and takes any attribute.
     '''
+    __slots__ = ('transaction_id', 'protocol_id', 'unit_id',
+        'check', '_function_code')
+
+    # the function code of a message that sets it per instance
+    function_code = property(lambda self: self._function_code,
+        lambda self, value: setattr(self, '_function_code', value))
 
     def __init__(self, **kwargs):
         ''' Initializes the base data for a modbus request '''
@@ -50,6 +95,27 @@ class ModbusPDU(object):
         self.unit_id = kwargs.get('unit', Defaults.UnitId)
         self.check = 0x0000
 
+    def __getstate__(self):
+        ''' Returns the state of the message to copy or pickle
+
+        :returns: The values of the slots (and attributes) that are set
+        '''
+        state = dict(getattr(self, '__dict__', {}))
+        for name in _slotNames(self.__class__):
+            if hasattr(self, name):
+                value = getattr(self, name)
+                if isinstance(value, memoryview): value = value.tobytes()
+                state[name] = value
+        return state
+
+    def __setstate__(self, state):
+        ''' Restores the state of a copied or unpickled message
+
+        :param state: The state returned by `__getstate__`
+        '''
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def encode(self):
         ''' Encodes the message
 
@@ -82,6 +148,7 @@ class ModbusPDU(object):
 
 class ModbusRequest(ModbusPDU):
     ''' Base class for a modbus request PDU '''
+    __slots__ = ()
 
     def __init__(self, **kwargs):
         ''' Proxy to the lower level initializer '''
@@ -97,6 +164,24 @@ class ModbusRequest(ModbusPDU):
                 (self.function_code, exception))
         return ExceptionResponse(self.function_code, exception)
 
+    def readValues(self, context, address, count=1):
+        ''' Validates and reads the values of the request from a context
+
+        This uses the getValuesChecked of the context, falling back to
+        validate and getValues for a context that does not provide it
+        (one that does not derive from IModbusSlaveContext).
+
+        :param context: The datastore to request from
+        :param address: The starting address
+        :param count: The number of values to retrieve
+        :returns: The requested values from a:a+c, None if out of range
+        '''
+        checked = getattr(context, 'getValuesChecked', None)
+        if checked is not None:
+            return checked(self.function_code, address, count)
+        if not context.validate(self.function_code, address, count): return None
+        return context.getValues(self.function_code, address, count)
+
 
 class ModbusResponse(ModbusPDU):
     ''' Base class for a modbus response PDU
@@ -111,6 +196,7 @@ class ModbusResponse(ModbusPDU):
        Indicates the size of the modbus rtu response used for
        calculating how much to read.
     '''
+    __slots__ = ()
 
     should_respond = True
 
@@ -139,6 +225,7 @@ class ModbusExceptions(Singleton):
 
 class ExceptionResponse(ModbusResponse):
     ''' Base class for a modbus exception PDU '''
+    __slots__ = ('exception_code',)
     ExceptionOffset = 0x80
     _rtu_frame_size = 5
 
@@ -183,6 +270,7 @@ class IllegalFunctionRequest(ModbusRequest):
         - does not implement the function code **or**
         - is not in a state that allows it to process the function
     '''
+    __slots__ = ()
     ErrorCode = 1
 
     def __init__(self, function_code, **kwargs):
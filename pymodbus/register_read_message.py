@@ -6,12 +6,14 @@ import struct
 from pymodbus.pdu import ModbusRequest
 from pymodbus.pdu import ModbusResponse
 from pymodbus.pdu import ModbusExceptions as merror
+from pymodbus.utilities import pack_registers, unpack_registers
 
 
 class ReadRegistersRequestBase(ModbusRequest):
     '''
     Base class for reading a modbus register
     '''
+    __slots__ = ('address', 'count')
     _rtu_frame_size = 8
 
     def __init__(self, address, count, **kwargs):
@@ -49,7 +51,14 @@ class ReadRegistersRequestBase(ModbusRequest):
 class ReadRegistersResponseBase(ModbusResponse):
     '''
     Base class for responsing to a modbus register read
+
+    A decoded response only keeps (a view of) the raw register data and
+    decodes the registers the first time they are used. Until then,
+    `getRegister` reads just the requested register and `encode` hands
+    back the raw data, so a poller that checks a single value or forwards
+    the response never decodes the rest.
     '''
+    __slots__ = ('__registers', '__raw')
 
     _rtu_byte_count_pos = 2
 
@@ -61,25 +70,48 @@ class ReadRegistersResponseBase(ModbusResponse):
         ModbusResponse.__init__(self, **kwargs)
         self.registers = values or []
 
+    #-----------------------------------------------------------------------#
+    # Register Properties
+    #-----------------------------------------------------------------------#
+    def _getRegisters(self):
+        ''' Returns the registers, decoding them on first use
+
+        :returns: The response registers
+        '''
+        if self.__registers is None:
+            self.__registers = unpack_registers(self.__raw)
+            self.__raw = None
+        return self.__registers
+
+    def _setRegisters(self, values):
+        ''' Sets the registers (dropping any raw data)
+
+        :param values: The new register values
+        '''
+        self.__registers, self.__raw = values, None
+
+    registers = property(_getRegisters, _setRegisters)
+
     def encode(self):
         ''' Encodes the response packet
 
         :returns: The encoded packet
         '''
-        result = chr(len(self.registers) * 2)
-        for register in self.registers:
-            result += struct.pack('>H', register)
-        return result
+        if self.__registers is None:
+            raw = self.__raw
+            if isinstance(raw, memoryview): raw = raw.tobytes()
+            return chr(len(raw)) + raw
+        return chr(len(self.__registers) * 2) + pack_registers(self.__registers)
 
     def decode(self, data):
         ''' Decode a register response packet
 
+        The registers are decoded (into a list) when they are first used.
+
         :param data: The request to decode
         '''
         byte_count = ord(data[0])
-        self.registers = []
-        for i in range(1, byte_count + 1, 2):
-            self.registers.append(struct.unpack('>H', data[i:i + 2])[0])
+        self.__registers, self.__raw = None, data[1:byte_count + 1]
 
     def getRegister(self, index):
         ''' Get the requested register
@@ -87,14 +119,24 @@ class ReadRegistersResponseBase(ModbusResponse):
         :param index: The indexed register to retrieve
         :returns: The request register
         '''
+        if self.__registers is None and 0 <= index < len(self.__raw) / 2:
+            return struct.unpack_from('>H', self.__raw, index * 2)[0]
         return self.registers[index]
 
+    def getRegisterCount(self):
+        ''' Get the number of registers in the response
+
+        :returns: The number of registers
+        '''
+        if self.__registers is None: return len(self.__raw) / 2
+        return len(self.__registers)
+
     def __str__(self):
         ''' Returns a string representation of the instance
 
         :returns: A string representation of the instance
         '''
-        return "ReadRegisterResponse (%d)" % len(self.registers)
+        return "ReadRegisterResponse (%d)" % self.getRegisterCount()
 
 
 class ReadHoldingRegistersRequest(ReadRegistersRequestBase):
@@ -105,6 +147,7 @@ class ReadHoldingRegistersRequest(ReadRegistersRequestBase):
     Registers are addressed starting at zero. Therefore registers numbered
     1-16 are addressed as 0-15.
     '''
+    __slots__ = ()
     function_code = 3
 
     def __init__(self, address=None, count=None, **kwargs):
@@ -123,9 +166,9 @@ class ReadHoldingRegistersRequest(ReadRegistersRequestBase):
         '''
         if not (1 <= self.count <= 0x7d):
             return self.doException(merror.IllegalValue)
-        if not context.validate(self.function_code, self.address, self.count):
+        values = self.readValues(context, self.address, self.count)
+        if values is None:
             return self.doException(merror.IllegalAddress)
-        values = context.getValues(self.function_code, self.address, self.count)
         return ReadHoldingRegistersResponse(values)
 
 
@@ -137,6 +180,7 @@ class ReadHoldingRegistersResponse(ReadRegistersResponseBase):
     Registers are addressed starting at zero. Therefore registers numbered
     1-16 are addressed as 0-15.
     '''
+    __slots__ = ()
     function_code = 3
 
     def __init__(self, values=None, **kwargs):
@@ -155,6 +199,7 @@ class ReadInputRegistersRequest(ReadRegistersRequestBase):
     Registers are addressed starting at zero. Therefore input registers
     numbered 1-16 are addressed as 0-15.
     '''
+    __slots__ = ()
     function_code = 4
 
     def __init__(self, address=None, count=None, **kwargs):
@@ -173,9 +218,9 @@ class ReadInputRegistersRequest(ReadRegistersRequestBase):
         '''
         if not (1 <= self.count <= 0x7d):
             return self.doException(merror.IllegalValue)
-        if not context.validate(self.function_code, self.address, self.count):
+        values = self.readValues(context, self.address, self.count)
+        if values is None:
             return self.doException(merror.IllegalAddress)
-        values = context.getValues(self.function_code, self.address, self.count)
         return ReadInputRegistersResponse(values)
 
 
@@ -187,6 +232,7 @@ class ReadInputRegistersResponse(ReadRegistersResponseBase):
     Registers are addressed starting at zero. Therefore input registers
     numbered 1-16 are addressed as 0-15.
     '''
+    __slots__ = ()
     function_code = 4
 
     def __init__(self, values=None, **kwargs):
@@ -211,6 +257,8 @@ class ReadWriteMultipleRegistersRequest(ModbusRequest):
     registers, and the data to be written. The byte count specifies the
     number of bytes to follow in the write data field."
     '''
+    __slots__ = ('read_address', 'read_count', 'write_address',
+        'write_registers', 'write_count', 'write_byte_count')
     function_code = 23
 
     _rtu_byte_count_pos = 10
@@ -241,9 +289,7 @@ class ReadWriteMultipleRegistersRequest(ModbusRequest):
         result = struct.pack('>HHHHB',
                 self.read_address,  self.read_count, \
                 self.write_address, self.write_count, self.write_byte_count)
-        for register in self.write_registers:
-            result += struct.pack('>H', register)
-        return result
+        return result + pack_registers(self.write_registers)
 
     def decode(self, data):
         ''' Decode the register request packet
@@ -253,10 +299,7 @@ class ReadWriteMultipleRegistersRequest(ModbusRequest):
         self.read_address,  self.read_count,  \
         self.write_address, self.write_count, \
         self.write_byte_count = struct.unpack('>HHHHB', data[:9])
-        self.write_registers  = []
-        for i in range(9, self.write_byte_count + 9, 2):
-            register = struct.unpack('>H', data[i:i + 2])[0]
-            self.write_registers.append(register)
+        self.write_registers  = unpack_registers(data[9:self.write_byte_count + 9])
 
     def execute(self, context):
         ''' Run a write single register request against a datastore
@@ -292,48 +335,28 @@ class ReadWriteMultipleRegistersRequest(ModbusRequest):
         return "ReadWriteNRegisterRequest R(%d,%d) W(%d,%d)" % params
 
 
-class ReadWriteMultipleRegistersResponse(ModbusResponse):
+class ReadWriteMultipleRegistersResponse(ReadRegistersResponseBase):
     '''
     The normal response contains the data from the group of registers that
     were read. The byte count field specifies the quantity of bytes to
     follow in the read data field.
     '''
+    __slots__ = ()
     function_code = 23
-    _rtu_byte_count_pos = 2
 
     def __init__(self, values=None, **kwargs):
         ''' Initializes a new instance
 
         :param values: The register values to write
         '''
-        ModbusResponse.__init__(self, **kwargs)
-        self.registers = values or []
-
-    def encode(self):
-        ''' Encodes the response packet
-
-        :returns: The encoded packet
-        '''
-        result = chr(len(self.registers) * 2)
-        for register in self.registers:
-            result += struct.pack('>H', register)
-        return result
-
-    def decode(self, data):
-        ''' Decode the register response packet
-
-        :param data: The response to decode
-        '''
-        bytes = ord(data[0])
-        for i in range(1, bytes, 2):
-            self.registers.append(struct.unpack('>H', data[i:i + 2])[0])
+        ReadRegistersResponseBase.__init__(self, values, **kwargs)
 
     def __str__(self):
         ''' Returns a string representation of the instance
 
         :returns: A string representation of the instance
         '''
-        return "ReadWriteNRegisterResponse (%d)" % len(self.registers)
+        return "ReadWriteNRegisterResponse (%d)" % self.getRegisterCount()
 
 #---------------------------------------------------------------------------#
 # Exported symbols
@@ -6,6 +6,7 @@ import struct
 from pymodbus.pdu import ModbusRequest
 from pymodbus.pdu import ModbusResponse
 from pymodbus.pdu import ModbusExceptions as merror
+from pymodbus.utilities import pack_registers, unpack_registers
 
 
 class WriteSingleRegisterRequest(ModbusRequest):
@@ -17,6 +18,7 @@ class WriteSingleRegisterRequest(ModbusRequest):
     be written. Registers are addressed starting at zero. Therefore register
     numbered 1 is addressed as 0.
     '''
+    __slots__ = ('address', 'value')
     function_code = 6
     _rtu_frame_size = 8
 
@@ -72,6 +74,7 @@ class WriteSingleRegisterResponse(ModbusResponse):
     The normal response is an echo of the request, returned after the
     register contents have been written.
     '''
+    __slots__ = ('address', 'value')
     function_code = 6
     _rtu_frame_size = 8
 
@@ -119,6 +122,7 @@ class WriteMultipleRegistersRequest(ModbusRequest):
     The requested written values are specified in the request data field.
     Data is packed as two bytes per register.
     '''
+    __slots__ = ('address', 'values', 'count', 'byte_count')
     function_code = 16
     _rtu_byte_count_pos = 6
 
@@ -142,9 +146,7 @@ class WriteMultipleRegistersRequest(ModbusRequest):
         :returns: The encoded packet
         '''
         packet = struct.pack('>HHB', self.address, self.count, self.byte_count)
-        for value in self.values:
-            packet += struct.pack('>H', value)
-        return packet
+        return packet + pack_registers(self.values)
 
     def decode(self, data):
         ''' Decode a write single register packet packet request
@@ -153,9 +155,7 @@ class WriteMultipleRegistersRequest(ModbusRequest):
         '''
         self.address, self.count, \
         self.byte_count = struct.unpack('>HHB', data[:5])
-        self.values = []  # reset
-        for idx in range(5, (self.count * 2) + 5, 2):
-            self.values.append(struct.unpack('>H', data[idx:idx + 2])[0])
+        self.values = unpack_registers(data[5:(self.count * 2) + 5])
 
     def execute(self, context):
         ''' Run a write single register request against a datastore
@@ -187,6 +187,7 @@ class WriteMultipleRegistersResponse(ModbusResponse):
     "The normal response returns the function code, starting address, and
     quantity of registers written.
     '''
+    __slots__ = ('address', 'count')
     function_code = 16
     _rtu_frame_size = 8
 
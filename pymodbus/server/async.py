@@ -4,6 +4,7 @@ Implementation of a Twisted Modbus Server
 
 '''
 from binascii import b2a_hex
+from functools import partial
 from twisted.internet import protocol
 from twisted.internet.protocol import ServerFactory
 
@@ -14,7 +15,9 @@ from pymodbus.device import ModbusControlBlock
 from pymodbus.device import ModbusAccessControl
 from pymodbus.device import ModbusDeviceIdentification
 from pymodbus.transaction import ModbusSocketFramer, ModbusAsciiFramer
+from pymodbus.transaction import ModbusRtuFramer
 from pymodbus.pdu import ModbusExceptions as merror
+from pymodbus.trace import getTracer, refresh
 from pymodbus.internal.ptwisted import InstallManagementConsole
 
 #---------------------------------------------------------------------------#
@@ -22,6 +25,7 @@ from pymodbus.internal.ptwisted import InstallManagementConsole
 #---------------------------------------------------------------------------#
 import logging
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -39,6 +43,8 @@ class ModbusTcpProtocol(protocol.Protocol):
         '''
         _logger.debug("Client Connected [%s]" % self.transport.getHost())
         self.framer = self.factory.framer(decoder=self.factory.decoder)
+        self.silence = None
+        refresh()
 
     def connectionLost(self, reason):
         ''' Callback for when a client disconnects
@@ -46,20 +52,45 @@ class ModbusTcpProtocol(protocol.Protocol):
         :param reason: The client's reason for disconnecting
         '''
         _logger.debug("Client Disconnected: %s" % reason)
+        if self.silence is not None and self.silence.active():
+            self.silence.cancel()
 
     def dataReceived(self, data):
         ''' Callback when we receive any data
 
         :param data: The data sent by the client
         '''
-        _logger.debug(" ".join([hex(ord(x)) for x in data]))
+        if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
         if not self.factory.control.ListenOnly:
-            self.framer.processIncomingPacket(data, self._execute)
+            requests = self.framer.processIncomingFrames(data)
+            if requests: self._send(map(self._execute, requests))
+            self._scheduleSilence()
+
+    def _scheduleSilence(self):
+        ''' Restarts the timer that ends the frame in progress once the
+        line has been silent (only for framers using the frame timing)
+        '''
+        interval = getattr(self.framer, 'silence', None)
+        if interval is None: return
+        if self.silence is not None and self.silence.active():
+            self.silence.reset(interval)
+        else:
+            from twisted.internet import reactor
+            self.silence = reactor.callLater(interval, self._processSilence)
+
+    def _processSilence(self):
+        ''' Callback for when the line has been silent, this ends the
+        frame in progress and executes it if it was a whole request
+        '''
+        requests = []
+        self.framer.processSilence(requests.append)
+        if requests: self._send(map(self._execute, requests))
 
     def _execute(self, request):
         ''' Executes the request and returns the result
 
         :param request: The decoded request message
+        :returns: The response to the request
         '''
         try:
             context = self.factory.store[request.unit_id]
@@ -70,17 +101,21 @@ class ModbusTcpProtocol(protocol.Protocol):
         #self.framer.populateResult(response)
         response.transaction_id = request.transaction_id
         response.unit_id = request.unit_id
-        self._send(response)
+        return response
 
-    def _send(self, message):
-        ''' Send a request (string) to the network
+    def _send(self, messages):
+        ''' Send the responses (string) to the network
 
-        :param message: The unencoded modbus response
+        All of the responses to a burst of requests are flushed with a
+        single write.
+
+        :param messages: The unencoded modbus responses
         '''
-        if message.should_respond:
-            self.factory.control.Counter.BusMessage += 1
-            pdu = self.framer.buildPacket(message)
-            _logger.debug('send: %s' % b2a_hex(pdu))
+        messages = [message for message in messages if message.should_respond]
+        if messages:
+            self.factory.control.Counter.BusMessage += len(messages)
+            pdu = ''.join([self.framer.buildPacket(m) for m in messages])
+            if _trace.enabled: _trace.debug('send: %s', b2a_hex(pdu))
             return self.transport.write(pdu)
 
 
@@ -141,13 +176,17 @@ class ModbusUdpProtocol(protocol.DatagramProtocol):
         if isinstance(identity, ModbusDeviceIdentification):
             self.control.Identity.update(identity)
 
+    def startProtocol(self):
+        ''' Callback for when the server starts listening '''
+        refresh()
+
     def datagramReceived(self, data, addr):
         ''' Callback when we receive any data
 
         :param data: The data sent by the client
         '''
-        _logger.debug("Client Connected [%s:%s]" % addr)
-        _logger.debug(" ".join([hex(ord(x)) for x in data]))
+        if _trace.enabled: _trace.debug("Client Connected [%s:%s]", *addr)
+        if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
         if not self.control.ListenOnly:
             continuation = lambda request: self._execute(request, addr)
             self.framer.processIncomingPacket(data, continuation)
@@ -176,7 +215,7 @@ class ModbusUdpProtocol(protocol.DatagramProtocol):
         '''
         self.control.Counter.BusMessage += 1
         pdu = self.framer.buildPacket(message)
-        _logger.debug('send: %s' % b2a_hex(pdu))
+        if _trace.enabled: _trace.debug('send: %s', b2a_hex(pdu))
         return self.transport.write(pdu, addr)
 
 
@@ -230,6 +269,8 @@ def StartSerialServer(context, identity=None,
     baudrate = kwargs.get('baudrate', Defaults.Baudrate)
 
     _logger.info("Starting Modbus Serial Server on %s" % port)
+    if isinstance(framer, type) and issubclass(framer, ModbusRtuFramer):
+        framer = partial(framer, baudrate=baudrate)  # use the frame timing
     factory = ModbusServerFactory(context, framer, identity)
     protocol = factory.buildProtocol(None)
     SerialPort.getHost = lambda self: port # hack for logging
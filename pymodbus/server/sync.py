@@ -7,6 +7,16 @@ from binascii import b2a_hex
 import SocketServer
 import serial
 import socket
+import select
+import errno
+import os
+import signal
+import multiprocessing
+import threading
+import Queue
+import time
+from collections import deque
+from functools import partial
 
 from pymodbus.constants import Defaults
 from pymodbus.factory import ServerDecoder
@@ -15,13 +25,16 @@ from pymodbus.device import ModbusControlBlock
 from pymodbus.device import ModbusDeviceIdentification
 from pymodbus.transaction import *
 from pymodbus.exceptions import ModbusException, NotImplementedException
+from pymodbus.exceptions import ParameterException
 from pymodbus.pdu import ModbusExceptions as merror
+from pymodbus.trace import getTracer, refresh
 
 #---------------------------------------------------------------------------#
 # Logging
 #---------------------------------------------------------------------------#
 import logging
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
@@ -40,6 +53,7 @@ class ModbusBaseRequestHandler(SocketServer.BaseRequestHandler):
         _logger.debug("Client Connected [%s:%s]" % self.client_address)
         self.running = True
         self.framer = self.server.framer(self.server.decoder)
+        refresh()
         self.server.threads.append(self)
 
     def finish(self):
@@ -53,6 +67,37 @@ class ModbusBaseRequestHandler(SocketServer.BaseRequestHandler):
 
         :param request: The decoded request message
         '''
+        self.execute_many([request])
+
+    def execute_many(self, requests):
+        ''' Executes a batch of requests and sends all of the responses
+
+        The responses are sent in request order with a single write, so
+        a pipelined burst of requests costs one send instead of one per
+        request. If the server has a worker pool, the batch is handed to
+        it instead of being executed on this thread.
+
+        :param requests: The decoded request messages
+        '''
+        if not requests: return
+        pool = getattr(self.server, 'pool', None)
+        if pool is not None: pool.submit(self, requests)
+        else: self.respond(requests)
+
+    def respond(self, requests):
+        ''' Executes a batch of requests on this thread and sends
+        all of the responses
+
+        :param requests: The decoded request messages
+        '''
+        self.send([self.__respond(request) for request in requests])
+
+    def __respond(self, request):
+        ''' Executes a request against the datastore
+
+        :param request: The decoded request message
+        :returns: The response to the request
+        '''
         try:
             context = self.server.context[request.unit_id]
             response = request.execute(context)
@@ -61,7 +106,17 @@ class ModbusBaseRequestHandler(SocketServer.BaseRequestHandler):
             response = request.doException(merror.SlaveFailure)
         response.transaction_id = request.transaction_id
         response.unit_id = request.unit_id
-        self.send(response)
+        return response
+
+    def build(self, messages):
+        ''' Builds the packet to send for one or more responses
+
+        :param messages: The unencoded response (or a list of them)
+        :returns: The packet of the responses that should be sent
+        '''
+        if not isinstance(messages, list): messages = [messages]
+        return ''.join([self.framer.buildPacket(message)
+            for message in messages if message.should_respond])
 
     def decode(self, message):
         ''' Decodes a request packet
@@ -86,7 +141,7 @@ class ModbusBaseRequestHandler(SocketServer.BaseRequestHandler):
     def send(self, message):
         ''' Send a request (string) to the network
 
-        :param message: The unencoded modbus response
+        :param message: The unencoded modbus response (or a list of them)
         '''
         raise NotImplementedException("Method not implemented by derived class")
 
@@ -99,13 +154,21 @@ class ModbusSingleRequestHandler(ModbusBaseRequestHandler):
 
     def handle(self):
         ''' Callback when we receive any data
+
+        A read that returns less than was asked for timed out, so the
+        line went silent and the framer is told to end the frame in
+        progress (this lets the rtu framer decode frames it cannot size).
         '''
         while self.running:
             try:
                 data = self.request.recv(1024)
+                requests = []
                 if data:
-                    _logger.debug(" ".join([hex(ord(x)) for x in data]))
-                    self.framer.processIncomingPacket(data, self.execute)
+                    if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
+                    requests = self.framer.processIncomingFrames(data)
+                if len(data) < 1024:
+                    self.framer.processSilence(requests.append)
+                self.execute_many(requests)
             except socket.timeout: pass
             except socket.error, msg:
                 _logger.error("Socket error occurred %s" % msg)
@@ -114,12 +177,12 @@ class ModbusSingleRequestHandler(ModbusBaseRequestHandler):
     def send(self, message):
         ''' Send a request (string) to the network
 
-        :param message: The unencoded modbus response
+        :param message: The unencoded modbus response (or a list of them)
         '''
-        if message.should_respond:
+        pdu = self.build(message)
+        if pdu:
             #self.server.control.Counter.BusMessage += 1
-            pdu = self.framer.buildPacket(message)
-            _logger.debug('send: %s' % b2a_hex(pdu))
+            if _trace.enabled: _trace.debug('send: %s', b2a_hex(pdu))
             return self.request.send(pdu)
 
 
@@ -137,9 +200,9 @@ class ModbusConnectedRequestHandler(ModbusBaseRequestHandler):
             try:
                 data = self.request.recv(1024)
                 if not data: self.running = False
-                _logger.debug(" ".join([hex(ord(x)) for x in data]))
+                if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
                 # if not self.server.control.ListenOnly:
-                self.framer.processIncomingPacket(data, self.execute)
+                self.execute_many(self.framer.processIncomingFrames(data))
             except socket.timeout: pass
             except socket.error, msg:
                 _logger.error("Socket error occurred %s" % msg)
@@ -149,13 +212,13 @@ class ModbusConnectedRequestHandler(ModbusBaseRequestHandler):
     def send(self, message):
         ''' Send a request (string) to the network
 
-        :param message: The unencoded modbus response
+        :param message: The unencoded modbus response (or a list of them)
         '''
-        if message.should_respond:
+        pdu = self.build(message)
+        if pdu:
             #self.server.control.Counter.BusMessage += 1
-            pdu = self.framer.buildPacket(message)
-            _logger.debug('send: %s' % b2a_hex(pdu))
-            return self.request.send(pdu)
+            if _trace.enabled: _trace.debug('send: %s', b2a_hex(pdu))
+            return self.request.sendall(pdu)
 
 
 class ModbusDisconnectedRequestHandler(ModbusBaseRequestHandler):
@@ -174,9 +237,9 @@ class ModbusDisconnectedRequestHandler(ModbusBaseRequestHandler):
             try:
                 data, self.request = self.request
                 if not data: self.running = False
-                _logger.debug(" ".join([hex(ord(x)) for x in data]))
+                if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
                 # if not self.server.control.ListenOnly:
-                self.framer.processIncomingPacket(data, self.execute)
+                self.execute_many(self.framer.processIncomingFrames(data))
             except socket.timeout: pass
             except socket.error, msg:
                 _logger.error("Socket error occurred %s" % msg)
@@ -186,17 +249,231 @@ class ModbusDisconnectedRequestHandler(ModbusBaseRequestHandler):
     def send(self, message):
         ''' Send a request (string) to the network
 
-        :param message: The unencoded modbus response
+        Each response of a batch is sent in its own datagram.
+
+        :param message: The unencoded modbus response (or a list of them)
         '''
-        if message.should_respond:
+        if not isinstance(message, list): message = [message]
+        for pdu in filter(None, map(self.build, message)):
             #self.server.control.Counter.BusMessage += 1
-            pdu = self.framer.buildPacket(message)
-            _logger.debug('send: %s' % b2a_hex(pdu))
-            return self.request.sendto(pdu, self.client_address)
+            if _trace.enabled: _trace.debug('send: %s', b2a_hex(pdu))
+            self.request.sendto(pdu, self.client_address)
+
+
+class ModbusSelectorRequestHandler(ModbusBaseRequestHandler):
+    ''' Implements the modbus server protocol
+
+    This implements the client handler for a connection of the
+    ModbusSelectorTcpServer. Instead of looping on its own thread, the
+    server calls `handle` when the connection is readable and `flush`
+    when it is writable, so a handler never blocks.
+
+    The responses that could not be written yet are kept as a queue of
+    chunks. Once more than `high_water` bytes are queued, the server
+    stops reading from the connection until the client catches up, so
+    a client that sends requests without reading the responses cannot
+    make the server buffer without limit.
+    '''
+
+    high_water = 64 * 1024
+
+    def __init__(self, request, client_address, server):
+        ''' Initializes the handler without running it
+
+        :param request: The non-blocking client socket
+        :param client_address: The address of the client
+        :param server: The server this connection belongs to
+        '''
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.pending = deque()
+        self.queued  = 0
+        self.events  = select.POLLIN
+        self.setup()
+
+    def handle(self):
+        ''' Callback when the connection is readable
+
+        :returns: False if the connection should be closed
+        '''
+        try:
+            data = self.request.recv(4096)
+        except socket.error, msg:
+            if msg.args[0] in (errno.EAGAIN, errno.EWOULDBLOCK): return True
+            _logger.error("Socket error occurred %s" % msg)
+            return False
+        if not data: return False
+        if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
+        try:
+            self.execute_many(self.framer.processIncomingFrames(data))
+            return self.running
+        except Exception, msg:
+            _logger.error("Unable to process request %s" % msg)
+            return False
+
+    def send(self, message):
+        ''' Queues the responses and writes as much as possible
+
+        :param message: The unencoded modbus response (or a list of them)
+        '''
+        pdu = self.build(message)
+        if pdu:
+            if _trace.enabled: _trace.debug('send: %s', b2a_hex(pdu))
+            self.pending.append(pdu)
+            self.queued += len(pdu)
+            self.flush()
+
+    def flush(self):
+        ''' Callback when the connection is writable
+
+        :returns: True if all of the queued responses have been written
+        '''
+        while self.pending:
+            chunk = self.pending[0]
+            try:
+                sent = self.request.send(chunk)
+            except socket.error, msg:
+                if msg.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    self.running = False
+                break
+            self.queued -= sent
+            if sent < len(chunk):   # keep the rest without copying it
+                self.pending[0] = memoryview(chunk)[sent:]
+                break
+            self.pending.popleft()
+        return not self.pending
+
+#---------------------------------------------------------------------------#
+# Worker Pool
+#---------------------------------------------------------------------------#
+class ModbusWorkerPool(object):
+    '''
+    A fixed number of threads that execute the requests of every client
+
+    The client threads only read and frame the requests. Each batch of
+    requests is handed to the pool, so a slow datastore ties up at most
+    `workers` threads instead of every client thread. The batches of a
+    single connection are executed one after another (never by two
+    workers at once), so its responses are written in request order.
+    At most `backlog` batches of a connection wait for a worker; once
+    a connection has that many, `submit` blocks the thread reading it
+    until a worker takes the next one, so a client cannot queue more
+    work than the pool can keep up with.
+
+    The pool keeps the following metrics (see `metrics`):
+
+    - depth: the number of batches waiting for a worker
+    - max_depth: the largest depth seen
+    - blocked: the number of batches that had to wait for the backlog
+      of their connection to drain
+    - executed: the number of requests executed
+    - latency: the average time from handing a request to the pool to
+      its response being written (in seconds)
+    - max_latency: the longest such time seen
+    '''
+
+    def __init__(self, workers=4, backlog=16):
+        ''' Initializes and starts the worker threads
+
+        :param workers: The number of worker threads to run
+        :param backlog: The number of batches a connection can queue
+        '''
+        if workers < 1:
+            raise ParameterException("A pool needs at least one worker")
+        if backlog < 1:
+            raise ParameterException("A pool needs a backlog of at least one")
+        self.backlog   = backlog
+        self.__queue   = Queue.Queue()
+        self.__lock    = threading.Lock()
+        self.__drained = threading.Condition(self.__lock)
+        self.__pending = {}     # handler -> deque of (submitted, requests)
+        self.__depth   = 0
+        self.__stats   = dict(max_depth=0, blocked=0, executed=0,
+            latency=0.0, max_latency=0.0)
+        self.__threads = [threading.Thread(target=self.__work)
+            for _ in range(workers)]
+        for thread in self.__threads:
+            thread.daemon = True
+            thread.start()
+
+    def submit(self, handler, requests):
+        ''' Queues a batch of requests to be executed for a connection
+
+        This blocks while the connection already has `backlog` batches
+        waiting for a worker.
+
+        :param handler: The request handler of the connection
+        :param requests: The decoded request messages
+        '''
+        with self.__lock:
+            batches = self.__pending.get(handler)
+            if batches is not None and len(batches) >= self.backlog:
+                self.__stats['blocked'] += 1
+                while batches is not None and len(batches) >= self.backlog:
+                    self.__drained.wait()
+                    batches = self.__pending.get(handler)
+            if batches is None:  # the connection is not queued yet
+                self.__pending[handler] = deque([(time.time(), requests)])
+                self.__queue.put(handler)
+            else: batches.append((time.time(), requests))
+            self.__depth += 1
+            self.__stats['max_depth'] = max(self.__stats['max_depth'], self.__depth)
+
+    def metrics(self):
+        ''' Returns a snapshot of the pool metrics
+
+        :returns: A dictionary of the current metrics
+        '''
+        with self.__lock:
+            metrics = dict(self.__stats, depth=self.__depth,
+                workers=len(self.__threads))
+        if metrics['executed']:
+            metrics['latency'] /= metrics['executed']
+        return metrics
+
+    def shutdown(self):
+        ''' Stops the worker threads once the queued work is done '''
+        self.__queue.join()
+        for thread in self.__threads: self.__queue.put(None)
+        for thread in self.__threads: thread.join()
+
+    def __work(self):
+        ''' Executes the queued connections until shutdown '''
+        while True:
+            handler = self.__queue.get()
+            if handler is None: return
+            with self.__lock:
+                submitted, requests = self.__pending[handler].popleft()
+                self.__depth -= 1
+                self.__drained.notify_all()
+            try:
+                handler.respond(requests)
+            except Exception, ex:
+                _logger.error("Unable to respond to client %s" % ex)
+            elapsed = time.time() - submitted
+            with self.__lock:
+                self.__stats['executed'] += len(requests)
+                self.__stats['latency']  += elapsed * len(requests)
+                self.__stats['max_latency'] = max(self.__stats['max_latency'], elapsed)
+                if self.__pending[handler]: self.__queue.put(handler)
+                else: del self.__pending[handler]
+            self.__queue.task_done()
+
 
 #---------------------------------------------------------------------------#
 # Server Implementations
 #---------------------------------------------------------------------------#
+def _reuse_port(sock):
+    ''' Lets a number of sockets (processes) bind to the same port
+
+    :param sock: The socket to mark before binding it
+    '''
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        raise NotImplementedException("No SO_REUSEPORT on this platform")
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+
 class ModbusTcpServer(SocketServer.ThreadingTCPServer):
     '''
     A modbus threaded tcp socket server
@@ -206,28 +483,41 @@ class ModbusTcpServer(SocketServer.ThreadingTCPServer):
     server context instance.
     '''
 
-    def __init__(self, context, framer=None, identity=None):
+    def __init__(self, context, framer=None, identity=None, address=None,
+        workers=None, reuse_port=False):
         ''' Overloaded initializer for the socket server
 
         If the identify structure is not passed in, the ModbusControlBlock
-        uses its own empty structure.
+        uses its own empty structure. If a number of workers is supplied,
+        the client threads hand their requests to a ModbusWorkerPool of
+        that size (available as `pool`) instead of executing them.
 
         :param context: The ModbusServerContext datastore
         :param framer: The framer strategy to use
         :param identity: An optional identify structure
+        :param address: An optional (interface, port) to bind to
+        :param workers: An optional number of worker threads to execute on
+        :param reuse_port: True to share the port with other processes
 
         '''
+        self.reuse_port = reuse_port
         self.threads = []
         self.decoder = ServerDecoder()
         self.framer  = framer  or ModbusSocketFramer
         self.context = context or ModbusServerContext()
         self.control = ModbusControlBlock()
+        self.pool    = ModbusWorkerPool(workers) if workers else None
 
         if isinstance(identity, ModbusDeviceIdentification):
             self.control.Identity.update(identity)
 
         SocketServer.ThreadingTCPServer.__init__(self,
-            ("", Defaults.Port), ModbusConnectedRequestHandler)
+            address or ("", Defaults.Port), ModbusConnectedRequestHandler)
+
+    def server_bind(self):
+        ''' Callback for binding the server socket '''
+        if self.reuse_port: _reuse_port(self.socket)
+        SocketServer.ThreadingTCPServer.server_bind(self)
 
     def process_request(self, request, client):
         ''' Callback for connecting a new client thread
@@ -244,6 +534,274 @@ class ModbusTcpServer(SocketServer.ThreadingTCPServer):
         _logger.debug("Modbus server stopped")
         self.socket.close()
         for thread in self.threads: thread.running = False
+        if self.pool: self.pool.shutdown()
+
+
+class ModbusSelectorTcpServer(object):
+    '''
+    A modbus tcp socket server running on a single thread
+
+    Instead of a thread per client, every connection is multiplexed on
+    a single epoll (or poll) loop. Each connection has its own framer
+    and reads and writes never block, which lets one server handle
+    hundreds of mostly idle connections without hundreds of threads.
+    '''
+
+    def __init__(self, context, framer=None, identity=None, address=None,
+        reuse_port=False):
+        ''' Overloaded initializer for the socket server
+
+        If the identify structure is not passed in, the ModbusControlBlock
+        uses its own empty structure.
+
+        :param context: The ModbusServerContext datastore
+        :param framer: The framer strategy to use
+        :param identity: An optional identify structure
+        :param address: An optional (interface, port) to bind to
+        :param reuse_port: True to share the port with other processes
+        '''
+        if hasattr(select, 'epoll'):
+            self.__poller, self.__scale = select.epoll(), 1
+        elif hasattr(select, 'poll'):
+            self.__poller, self.__scale = select.poll(), 1000
+        else: raise NotImplementedException("No poll support on this platform")
+
+        self.threads = []
+        self.decoder = ServerDecoder()
+        self.framer  = framer  or ModbusSocketFramer
+        self.context = context or ModbusServerContext()
+        self.control = ModbusControlBlock()
+        self.running = False
+        self.__handlers = {}
+        self.__stopped = threading.Event()
+        self.__stopped.set()
+
+        if isinstance(identity, ModbusDeviceIdentification):
+            self.control.Identity.update(identity)
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port: _reuse_port(self.socket)
+        self.socket.bind(address or ("", Defaults.Port))
+        self.socket.listen(128)
+        self.socket.setblocking(False)
+        self.server_address = self.socket.getsockname()
+        self.__poller.register(self.socket.fileno(), select.POLLIN)
+
+    def serve_forever(self, poll_interval=0.5):
+        ''' Runs the event loop until shutdown is called
+
+        :param poll_interval: How often (in seconds) to check for shutdown
+        '''
+        _logger.debug("Started selector server at %s:%s" % self.server_address)
+        self.running = True
+        self.__stopped.clear()
+        listener = self.socket.fileno()
+        try:
+            while self.running:
+                try:
+                    events = self.__poller.poll(poll_interval * self.__scale)
+                except (IOError, select.error), msg:
+                    if msg.args[0] == errno.EINTR: continue
+                    raise
+                for fd, event in events:
+                    if fd == listener: self.__accept()
+                    else: self.__service(fd, event)
+        finally: self.__stopped.set()
+
+    def shutdown(self):
+        ''' Stops the event loop and waits for it to finish
+
+        This must be called from another thread than serve_forever.
+        '''
+        self.running = False
+        self.__stopped.wait()
+
+    def server_close(self):
+        ''' Callback for stopping the running server
+        '''
+        _logger.debug("Modbus server stopped")
+        self.running = False
+        for fd in self.__handlers.keys(): self.__close(fd)
+        self.__poller.unregister(self.socket.fileno())
+        self.socket.close()
+
+    def __accept(self):
+        ''' Accepts all of the waiting connections '''
+        while True:
+            try:
+                request, client = self.socket.accept()
+            except socket.error, msg:
+                if msg.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    _logger.error("Unable to accept client %s" % msg)
+                return
+            _logger.debug("Serving client at " + str(client))
+            request.setblocking(False)
+            request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            handler = ModbusSelectorRequestHandler(request, client, self)
+            self.__handlers[request.fileno()] = handler
+            self.__poller.register(request.fileno(), select.POLLIN)
+
+    def __service(self, fd, event):
+        ''' Reads from and writes to a ready connection
+
+        :param fd: The descriptor of the connection
+        :param event: The events that are ready on it
+        '''
+        handler = self.__handlers.get(fd)
+        if handler is None: return
+        alive = True
+        if event & (select.POLLIN | select.POLLHUP | select.POLLERR):
+            alive = handler.handle()
+        if alive and event & select.POLLOUT:
+            handler.flush()
+        if not (alive and handler.running):
+            self.__close(fd)
+            return
+        # only watch for writability while responses are queued, and
+        # stop reading while too many of them are
+        events = select.POLLOUT if handler.pending else 0
+        if handler.queued <= handler.high_water: events |= select.POLLIN
+        if handler.events != events:
+            handler.events = events
+            self.__poller.modify(fd, events)
+
+    def __close(self, fd):
+        ''' Closes a client connection
+
+        :param fd: The descriptor of the connection
+        '''
+        handler = self.__handlers.pop(fd)
+        self.__poller.unregister(fd)
+        handler.finish()
+        handler.request.close()
+
+
+class ModbusPreforkTcpServer(object):
+    '''
+    A modbus tcp socket server running in a number of processes
+
+    Each process runs its own threaded (or selector) server bound to
+    the same address with SO_REUSEPORT, and the kernel spreads the
+    clients over them, so the servers are not limited to a single core
+    by the interpreter lock. The processes are forked from the context
+    that is passed in: for the writes of one process to be seen by the
+    others, it has to be built from ModbusSharedDataBlock datastores.
+
+    Like the other servers, the processes are started (and listening)
+    once the server is created; serve_forever then watches over them
+    and restarts any that exit until shutdown is called.
+    '''
+
+    def __init__(self, context, framer=None, identity=None, address=None,
+        processes=None, backend='threaded'):
+        ''' Overloaded initializer for the socket server
+
+        If the identify structure is not passed in, the ModbusControlBlock
+        uses its own empty structure.
+
+        :param context: The ModbusServerContext datastore
+        :param framer: The framer strategy to use
+        :param identity: An optional identify structure
+        :param address: An optional (interface, port) to bind to
+        :param processes: The number of processes (default one per core)
+        :param backend: The server backend ('threaded' or 'selector')
+        '''
+        if backend == 'threaded': factory = ModbusTcpServer
+        elif backend == 'selector': factory = ModbusSelectorTcpServer
+        else: raise ParameterException("Unknown server backend %s" % backend)
+
+        self.factory   = lambda: factory(context, framer, identity,
+            self.server_address, reuse_port=True)
+        self.processes = processes or multiprocessing.cpu_count()
+        self.running   = True
+        self.children  = set()
+        self.__lock    = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__stopped.set()
+
+        # holds the port (and resolves port 0) without accepting anything
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        _reuse_port(self.socket)
+        self.socket.bind(address or ("", Defaults.Port))
+        self.server_address = self.socket.getsockname()
+        for _ in range(self.processes): self.__spawn()
+
+    def serve_forever(self):
+        ''' Restarts any server process that exits until shutdown is called
+        '''
+        _logger.debug("Started prefork server at %s:%s" % self.server_address)
+        self.__stopped.clear()
+        try:
+            while self.children:
+                try:
+                    pid, status = os.waitpid(-1, 0)
+                except OSError, msg:
+                    if msg.args[0] == errno.EINTR: continue
+                    if msg.args[0] == errno.ECHILD: break
+                    raise
+                with self.__lock:
+                    if pid not in self.children: continue
+                    self.children.discard(pid)
+                    if self.running:
+                        _logger.error("Server process %d exited (%d)" % (pid, status))
+                        self.__spawn()
+        finally: self.__stopped.set()
+
+    def shutdown(self):
+        ''' Stops the server processes and waits for serve_forever
+        to finish
+
+        This must be called from another thread than serve_forever.
+        '''
+        with self.__lock:
+            self.running = False
+            for pid in self.children: os.kill(pid, signal.SIGTERM)
+        self.__stopped.wait()
+
+    def server_close(self):
+        ''' Callback for stopping the running server
+        '''
+        _logger.debug("Modbus server stopped")
+        self.shutdown()
+        for pid in self.children:
+            try: os.waitpid(pid, 0)
+            except OSError: pass
+        self.children.clear()
+        self.socket.close()
+
+    def __spawn(self):
+        ''' Forks a single server process and waits until it listens '''
+        ready, notify = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready)
+            self.__serve(notify)
+        os.close(notify)
+        started = os.read(ready, 1)
+        os.close(ready)
+        if not started:
+            os.waitpid(pid, 0)
+            raise ModbusException("Unable to start a server process")
+        self.children.add(pid)
+
+    def __serve(self, notify):
+        ''' Runs the server of a forked process (this never returns)
+
+        :param notify: The pipe to signal the parent on once listening
+        '''
+        status = 1
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.socket.close()
+            server = self.factory()
+            os.write(notify, '1')
+            os.close(notify)
+            server.serve_forever()
+            status = 0
+        except Exception, ex:
+            _logger.error("Server process failed: %s" % ex)
+        finally: os._exit(status)
 
 
 class ModbusUdpServer(SocketServer.ThreadingUDPServer):
@@ -338,6 +896,11 @@ class ModbusSerialServer(object):
         self.baudrate = kwargs.get('baudrate', Defaults.Baudrate)
         self.timeout  = kwargs.get('timeout',  Defaults.Timeout)
         self.socket   = None
+        self.inter_char_timeout = None
+        if isinstance(self.framer, type) and issubclass(self.framer, ModbusRtuFramer):
+            self.framer = partial(self.framer, baudrate=self.baudrate)
+            if self.baudrate > 19200: self.inter_char_timeout = 0.00075
+            else: self.inter_char_timeout = 1.5 * 11.0 / self.baudrate
         self._connect()
 
     def _connect(self):
@@ -350,6 +913,8 @@ class ModbusSerialServer(object):
             self.socket = serial.Serial(port=self.device, timeout=self.timeout,
                 bytesize=self.bytesize, stopbits=self.stopbits,
                 baudrate=self.baudrate, parity=self.parity)
+            if self.inter_char_timeout is not None:
+                self.socket.interCharTimeout = self.inter_char_timeout
         except serial.SerialException, msg:
             _logger.error(msg)
             self.close()
@@ -388,14 +953,38 @@ class ModbusSerialServer(object):
 #---------------------------------------------------------------------------#
 # Creation Factories
 #---------------------------------------------------------------------------#
-def StartTcpServer(context=None, identity=None):
+def StartTcpServer(context=None, identity=None, **kwargs):
     ''' A factory to start and run a tcp modbus server
 
+    The server either uses a thread per client ('threaded', the
+    default) or serves every client from a single event loop thread
+    ('selector'), which scales better to many connections. Either of
+    them can be run in a number of processes to use more than one core.
+
     :param context: The ModbusServerContext datastore
     :param identity: An optional identify structure
+    :param backend: The server backend ('threaded' or 'selector')
+    :param address: An optional (interface, port) to bind to
+    :param workers: The size of the worker pool (threaded backend only)
+    :param processes: The number of server processes to fork
     '''
-    framer = ModbusSocketFramer
-    server = ModbusTcpServer(context, framer, identity)
+    framer  = ModbusSocketFramer
+    address = kwargs.get('address', None)
+    backend = kwargs.get('backend', 'threaded')
+    workers = kwargs.get('workers', None)
+    processes = kwargs.get('processes', None)
+    if processes and workers:
+        raise ParameterException("The prefork server has no worker pool")
+    elif processes:
+        server = ModbusPreforkTcpServer(context, framer, identity, address,
+            processes, backend)
+    elif backend == 'threaded':
+        server = ModbusTcpServer(context, framer, identity, address, workers)
+    elif backend == 'selector' and not workers:
+        server = ModbusSelectorTcpServer(context, framer, identity, address)
+    elif backend == 'selector':
+        raise ParameterException("The selector backend has no worker pool")
+    else: raise ParameterException("Unknown server backend %s" % backend)
     server.serve_forever()
 
 
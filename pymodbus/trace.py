@@ -0,0 +1,125 @@
+'''
+Modbus Hot Path Tracing
+------------------------------------------------------------
+
+The framers, servers, and datastores log every packet and every
+datastore access at the debug level. Building those messages (a hex
+dump of every packet for example) costs far more than handling the
+packet itself, so the hot paths guard them with a tracer::
+
+    _trace = getTracer(__name__)
+
+    if _trace.enabled: _trace.debug("recv: %s", b2a_hex(data))
+
+Checking a tracer is a single attribute lookup, and the message is only
+built when it will actually be logged. A tracer samples the level of its
+logger instead of asking the logging module on every call. That happens
+when the tracer is created, when a client is created or a client
+connects to a server, and whenever the tracing is changed through this
+module. Tracing can be turned on and off for a single subsystem (or
+everything) at runtime::
+
+    from pymodbus import trace
+
+    trace.enable('pymodbus.server')       # just the servers
+    trace.disable('pymodbus.datastore')   # quiet the datastores again
+    trace.enable()                        # everything
+
+If the logging levels are changed directly through the logging module,
+call `refresh` so the tracers pick up the change.
+'''
+import logging
+
+
+#---------------------------------------------------------------------------#
+# Tracer
+#---------------------------------------------------------------------------#
+class Tracer(object):
+    '''
+    A guard for the debug messages of a single subsystem
+
+    .. attribute:: enabled
+
+       True if the debug messages of this subsystem will be logged
+    '''
+    __slots__ = ('name', 'logger', 'enabled')
+
+    def __init__(self, name):
+        ''' Initializes a new instance of the tracer
+
+        :param name: The name of the logger to trace to
+        '''
+        self.name = name
+        self.logger = logging.getLogger(name)
+        self.refresh()
+
+    def refresh(self):
+        ''' Samples the current level of the logger '''
+        self.enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+    def debug(self, message, *args):
+        ''' Logs a debug message (which is formatted lazily)
+
+        :param message: The message format string
+        :param args: The arguments to format the message with
+        '''
+        self.logger.debug(message, *args)
+
+
+#---------------------------------------------------------------------------#
+# Tracer Registry
+#---------------------------------------------------------------------------#
+__tracers = {}
+__levels  = {}
+
+def getTracer(name):
+    ''' Retrieves the tracer for a subsystem
+
+    :param name: The name of the subsystem (its logger name)
+    :returns: The tracer for that subsystem
+    '''
+    if name not in __tracers:
+        __tracers[name] = Tracer(name)
+    return __tracers[name]
+
+def refresh():
+    ''' Samples the current logging levels for every tracer '''
+    for tracer in __tracers.values():
+        tracer.refresh()
+
+def enable(subsystem='pymodbus'):
+    ''' Turns on tracing for a subsystem and everything below it
+
+    The level the logger had before is remembered so that `disable`
+    can put it back.
+
+    :param subsystem: The subsystem to trace (default all of pymodbus)
+    '''
+    logger = logging.getLogger(subsystem)
+    __levels.setdefault(subsystem, logger.level)
+    logger.setLevel(logging.DEBUG)
+    refresh()
+
+def disable(subsystem='pymodbus'):
+    ''' Turns off tracing for a subsystem and everything below it
+
+    This restores the level the logger had before it was enabled. If
+    the subsystem would still log debug messages after that (it was
+    never enabled here, or it inherits the level of a traced parent),
+    its level is raised to info; any other level is left alone.
+
+    :param subsystem: The subsystem to quiet (default all of pymodbus)
+    '''
+    logger = logging.getLogger(subsystem)
+    if subsystem in __levels:
+        logger.setLevel(__levels.pop(subsystem))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.setLevel(logging.INFO)
+    refresh()
+
+#---------------------------------------------------------------------------#
+# Exported symbols
+#---------------------------------------------------------------------------#
+__all__ = [
+    'Tracer', 'getTracer', 'refresh', 'enable', 'disable',
+]
@@ -1,27 +1,53 @@
 '''
 Collection of transaction based abstractions
 '''
+import time
 import struct
 import socket
+import threading
 from binascii import b2a_hex, a2b_hex
 
-from pymodbus.exceptions import ModbusIOException
+from pymodbus.exceptions import ModbusIOException, NotImplementedException
 from pymodbus.constants  import Defaults
-from pymodbus.interfaces import Singleton, IModbusFramer
-from pymodbus.utilities  import checkCRC, computeCRC
+from pymodbus.interfaces import IModbusFramer
+from pymodbus.utilities  import computeCRC, updateCRC
 from pymodbus.utilities  import checkLRC, computeLRC
+from pymodbus.trace      import getTracer, refresh
 
 #---------------------------------------------------------------------------#
 # Logging
 #---------------------------------------------------------------------------#
 import logging
 _logger = logging.getLogger(__name__)
+_trace  = getTracer(__name__)
 
 
 #---------------------------------------------------------------------------#
-# The Global Transaction Manager
+# Precompiled Headers
 #---------------------------------------------------------------------------#
-class ModbusTransactionManager(Singleton):
+_mbap_header = struct.Struct('>HHHB')
+
+
+def _calculateRtuSize(decoder, data):
+    ''' Calculates how many bytes of an rtu encoded frame are needed
+
+    :param decoder: The decoder used to look up the pdu class
+    :param data: The rtu encoded bytes received so far
+    :returns: The number of bytes the frame is known to need
+    '''
+    if len(data) < 2: return 2  # address + function code
+    pdu_class = decoder.lookupPduClass(ord(data[1]))
+    if pdu_class is None: return len(data)  # unknown, nothing to go on
+    position = getattr(pdu_class, '_rtu_byte_count_pos', None)
+    if position is not None and len(data) <= position:
+        return position + 1
+    return pdu_class.calculateRtuFrameSize(data)
+
+
+#---------------------------------------------------------------------------#
+# The Transaction Manager
+#---------------------------------------------------------------------------#
+class ModbusTransactionManager(object):
     ''' Impelements a transaction for a manager
 
     The transaction protocol can be represented by the following pseudo code::
@@ -35,10 +61,13 @@ class ModbusTransactionManager(Singleton):
         while (count < 3)
 
     This module helps to abstract this away from the framer and protocol.
-    '''
 
-    __tid = Defaults.TransactionId
-    __transactions = []
+    Each client (connection) owns its own manager, so every connection
+    has an independent transaction identifier space and transaction
+    table. The table is a dictionary keyed by transaction identifier and
+    all of the state is guarded by a lock, so a manager can be shared
+    between threads.
+    '''
 
     def __init__(self, client=None):
         ''' Initializes an instance of the ModbusTransactionManager
@@ -46,6 +75,10 @@ class ModbusTransactionManager(Singleton):
         :param client: The client socket wrapper
         '''
         self.client = client
+        self.__tid  = Defaults.TransactionId
+        self.__transactions = {}
+        self.__lock = threading.Lock()
+        refresh()
 
     def execute(self, request):
         ''' Starts the producer to send the next request to
@@ -58,17 +91,16 @@ class ModbusTransactionManager(Singleton):
         self.response = None
         retries = Defaults.Retries
         request.transaction_id = self.getNextTID()
-        _logger.debug("Running transaction %d" % request.transaction_id)
+        if _trace.enabled: _trace.debug("Running transaction %d", request.transaction_id)
 
         while retries > 0:
             try:
                 self.client.connect()
                 self.client._send(self.client.framer.buildPacket(request))
-                # I need to fix this to read the header and the result size,
-                # as this may not read the full result set, but right now
-                # it should be fine...
-                result = self.client._recv(1024)
+                result = self.__recvPacket()
                 self.client.framer.processIncomingPacket(result, _set_result)
+                if self.response is None:  # the read ended on a silence
+                    self.client.framer.processSilence(_set_result)
                 break;
             except socket.error, msg:
                 self.client.close()
@@ -76,6 +108,29 @@ class ModbusTransactionManager(Singleton):
                 retries -= 1
         return self.response
 
+    def __recvPacket(self):
+        ''' Reads exactly one response frame from the client
+
+        The framer is asked how much of the frame it needs to see (first
+        the header, then the whole frame) and only that many bytes are
+        read, so we return as soon as the last byte arrives instead of
+        waiting for the transport to time out. Framers that cannot size
+        their frames fall back to a single large read.
+
+        :returns: The bytes read for the next frame
+        '''
+        framer, packet = self.client.framer, ''
+        try:
+            size = framer.calculateFrameSize(packet)
+            while len(packet) < size:
+                data = self.client._recv(size - len(packet))
+                if not data: break  # timeout or closed
+                packet += data
+                size = framer.calculateFrameSize(packet)
+        except NotImplementedException:
+            packet += self.client._recv(1024)
+        return packet
+
     def addTransaction(self, request):
         ''' Adds a transaction to the handler
 
@@ -84,28 +139,27 @@ class ModbusTransactionManager(Singleton):
 
         :param request: The request to hold on to
         '''
-        ModbusTransactionManager.__transactions.append(request)
+        with self.__lock:
+            self.__transactions[request.transaction_id] = request
 
     def getTransaction(self, tid):
         ''' Returns a transaction matching the referenced tid
 
-        If the transaction does not exist, None is returned
+        If the transaction does not exist, None is returned. The
+        transaction is removed from the table once it is returned.
 
         :param tid: The transaction to retrieve
         '''
-        for k, v in enumerate(ModbusTransactionManager.__transactions):
-            if v.transaction_id == tid:
-                return ModbusTransactionManager.__transactions.pop(k)
-        return None
+        with self.__lock:
+            return self.__transactions.pop(tid, None)
 
     def delTransaction(self, tid):
         ''' Removes a transaction matching the referenced tid
 
         :param tid: The transaction to remove
         '''
-        for k, v in enumerate(ModbusTransactionManager.__transactions):
-            if v.transaction_id == tid:
-                del ModbusTransactionManager.__transactions[k]
+        with self.__lock:
+            self.__transactions.pop(tid, None)
 
     def getNextTID(self):
         ''' Retrieve the next unique transaction identifier
@@ -115,13 +169,134 @@ class ModbusTransactionManager(Singleton):
 
         :returns: The next unique transaction identifier
         '''
-        tid = (ModbusTransactionManager.__tid + 1) & 0xffff
-        ModbusTransactionManager.__tid = tid
-        return tid
+        with self.__lock:
+            self.__tid = (self.__tid + 1) & 0xffff
+            return self.__tid
 
     def resetTID(self):
         ''' Resets the transaction identifier '''
-        ModbusTransactionManager.__tid = Defaults.TransactionId
+        with self.__lock:
+            self.__tid = Defaults.TransactionId
+
+
+#---------------------------------------------------------------------------#
+# Framer Receive Buffer
+#---------------------------------------------------------------------------#
+class ModbusReceiveBuffer(object):
+    ''' A growable receive buffer shared by the framers
+
+    Incoming packets are appended to a single bytearray and consumed
+    by moving a read cursor forward instead of re-slicing the whole
+    buffer after every frame. The consumed prefix is only discarded
+    once the cursor passes the compaction threshold (or the buffer is
+    drained), so a burst of N pipelined frames costs O(N) copying
+    instead of O(N^2)::
+
+        [ consumed ][ unread data          ][ free ]
+        ^           ^ cursor                ^ len(data)
+
+    Frames are handed out as memoryview slices of the unread data,
+    so the decoders work on the received bytes without copying them.
+    '''
+
+    def __init__(self, threshold=4096):
+        ''' Initializes a new instance of the buffer
+
+        :param threshold: The consumed byte count that triggers compaction
+        '''
+        self.threshold = threshold
+        self.__data    = bytearray()
+        self.__start   = 0
+
+    def __len__(self):
+        ''' Returns the number of unread bytes in the buffer
+
+        :returns: The number of unread bytes
+        '''
+        return len(self.__data) - self.__start
+
+    def __getitem__(self, key):
+        ''' Index or slice into the unread data
+
+        :param key: The index or slice to retrieve
+        :returns: A single character or a memoryview slice
+        '''
+        return self.view()[key]
+
+    def append(self, data):
+        ''' Adds new packet data to the end of the buffer
+
+        :param data: The most recent packet
+        '''
+        try:
+            self.__data.extend(data)
+        except BufferError:
+            self.__reallocate()
+            self.__data.extend(data)
+
+    def consume(self, count):
+        ''' Advances the read cursor past the next count bytes
+
+        :param count: The number of bytes to skip over
+        '''
+        self.__start = min(self.__start + count, len(self.__data))
+        if self.__start == len(self.__data) or self.__start >= self.threshold:
+            self.__compact()
+
+    def clear(self):
+        ''' Discards all of the buffered data '''
+        self.__start = len(self.__data)
+        self.__compact()
+
+    def find(self, sub, start=0):
+        ''' Finds the offset of sub in the unread data
+
+        :param sub: The byte string to search for
+        :param start: The unread offset to start searching from
+        :returns: The offset relative to the cursor or -1 if not found
+        '''
+        index = self.__data.find(sub, self.__start + start)
+        if index == -1: return -1
+        return index - self.__start
+
+    def unpack_from(self, packer, start=0):
+        ''' Unpacks a structure from the unread data without copying it
+
+        :param packer: The precompiled struct.Struct to unpack with
+        :param start: The unread offset to unpack at
+        :returns: The unpacked values
+        '''
+        return packer.unpack_from(self.__data, self.__start + start)
+
+    def view(self, start=0, stop=None):
+        ''' Returns a zero copy view of the unread data
+
+        :param start: The unread offset to start the view at
+        :param stop: The unread offset to end the view at (default end)
+        :returns: A memoryview of the requested range
+        '''
+        start += self.__start
+        if stop is None: return memoryview(self.__data)[start:]
+        return memoryview(self.__data)[start:max(self.__start + stop, start)]
+
+    def __compact(self):
+        ''' Drops the consumed prefix of the buffer and resets the cursor
+        '''
+        try:
+            del self.__data[:self.__start]
+            self.__start = 0
+        except BufferError:
+            self.__reallocate()
+
+    def __reallocate(self):
+        ''' Moves the unread data into fresh storage
+
+        This is only needed while a decoded message still holds a view
+        on the current storage (which then cannot be resized); the old
+        storage is left untouched for the lifetime of that view.
+        '''
+        self.__data  = self.__data[self.__start:]
+        self.__start = 0
 
 
 #---------------------------------------------------------------------------#
@@ -151,7 +326,7 @@ class ModbusSocketFramer(IModbusFramer):
 
         :param decoder: The decoder factory implementation to use
         '''
-        self.__buffer = ''
+        self.__buffer = ModbusReceiveBuffer()
         self.__header = {'tid':0, 'pid':0, 'len':0, 'uid':0}
         self.__hsize  = 0x07
         self.decoder  = decoder
@@ -165,14 +340,14 @@ class ModbusSocketFramer(IModbusFramer):
         '''
         if len(self.__buffer) > self.__hsize:
             self.__header['tid'], self.__header['pid'], \
-            self.__header['len'], self.__header['uid'] = struct.unpack(
-                    '>HHHB', self.__buffer[0:self.__hsize])
+            self.__header['len'], self.__header['uid'] = \
+                self.__buffer.unpack_from(_mbap_header)
 
             # someone sent us an error? ignore it
             if self.__header['len'] < 2:
                 self.advanceFrame()
             # we have at least a complete message, continue
-            elif len(self.__buffer) >= self.__header['len']:
+            elif len(self.__buffer) >= self.__hsize + self.__header['len'] - 1:
                 return True
         # we don't have enough of a message yet, wait
         return False
@@ -184,7 +359,7 @@ class ModbusSocketFramer(IModbusFramer):
         current frame header handle
         '''
         length = self.__hsize + self.__header['len'] - 1
-        self.__buffer = self.__buffer[length:]
+        self.__buffer.consume(length)
         self.__header = {'tid':0, 'pid':0, 'len':0, 'uid':0}
 
     def isFrameReady(self):
@@ -201,15 +376,15 @@ class ModbusSocketFramer(IModbusFramer):
 
         :param message: The most recent packet
         '''
-        self.__buffer += message
+        self.__buffer.append(message)
 
     def getFrame(self):
         ''' Return the next frame from the buffered data
 
-        :returns: The next full frame buffer
+        :returns: A view of the next full frame buffer
         '''
         length = self.__hsize + self.__header['len'] - 1
-        return self.__buffer[self.__hsize:length]
+        return self.__buffer.view(self.__hsize, length)
 
     def populateResult(self, result):
         '''
@@ -240,7 +415,7 @@ class ModbusSocketFramer(IModbusFramer):
         :param data: The new packet data
         :param callback: The function to send results to
         '''
-        _logger.debug(" ".join([hex(ord(x)) for x in data]))
+        if _trace.enabled: _trace.debug(" ".join([hex(ord(x)) for x in data]))
         self.addToFrame(data)
         while self.isFrameReady():
             if self.checkFrame():
@@ -252,11 +427,26 @@ class ModbusSocketFramer(IModbusFramer):
                 callback(result)  # defer or push to a thread?
             else: break
 
+    def calculateFrameSize(self, data):
+        ''' Calculates how many bytes the frame at the start of data needs
+
+        This is the MBAP header until it has been received, and the
+        header plus the length it specifies afterwards.
+
+        :param data: The bytes of the frame received so far
+        :returns: The number of bytes the frame is known to need
+        '''
+        if len(data) < self.__hsize: return self.__hsize
+        length = struct.unpack('>H', data[4:6])[0]
+        return self.__hsize + length - 1
+
     def buildPacket(self, message):
         ''' Creates a ready to send modbus packet
 
         :param message: The populated request/response to send
         '''
+        if isinstance(message, ModbusPreparedRequest):
+            return message.buildPacket()
         data = message.encode()
         packet = struct.pack('>HHHBB',
             message.transaction_id,
@@ -302,19 +492,39 @@ class ModbusRtuFramer(IModbusFramer):
         ------------------------------------------------------------------
         1 Byte = start + 8 bits + parity + stop = 11 bits
         (1/Baud)(bits) = delay seconds
+
+    By default frames are found by their length alone (using the pdu
+    class of the function code), so a corrupted frame or an unknown
+    function code stops the framing until the buffer is reset. If the
+    baud rate is supplied, the framer also uses the frame timing:
+
+    * every chunk of data is timestamped, and a 3.5 character silence
+      (1750us above 19200 baud) ends the frame in progress; whatever is
+      left of it is decoded if its crc is valid and dropped otherwise
+    * a read loop that sees the line go silent (a read timed out) calls
+      `processSilence` to end the frame right away, so a frame that
+      cannot be sized is not held until the next chunk arrives
+    * a complete frame with a bad crc is skipped a byte at a time
+      until the framer is in sync with a valid frame again
     '''
 
-    def __init__(self, decoder):
+    def __init__(self, decoder, baudrate=None):
         ''' Initializes a new instance of the framer
 
         :param decoder: The decoder factory implementation to use
+        :param baudrate: The line baud rate (enables the timing mode)
         '''
-        self.__buffer = ''
+        self.__buffer = ModbusReceiveBuffer()
         self.__header = {}
         self.__hsize  = 0x01
         self.__end    = '\x0d\x0a'
         self.__min_frame_size = 4
+        self.__last   = 0
+        self.__resync = False
         self.decoder  = decoder
+        if   baudrate is None: self.silence = None
+        elif baudrate > 19200: self.silence = 0.00175
+        else: self.silence = 3.5 * 11.0 / baudrate
 
     #-----------------------------------------------------------------------#
     # Private Helper Functions
@@ -327,12 +537,48 @@ class ModbusRtuFramer(IModbusFramer):
         try:
             self.populateHeader()
             frame_size = self.__header['len']
-            data = self.__buffer[:frame_size - 2]
-            crc = self.__buffer[frame_size - 2:frame_size]
-            crc_val = (ord(crc[0]) << 8) + ord(crc[1])
-            return checkCRC(data, crc_val)
-        except (IndexError, KeyError):
-            return False
+            checked = self.__header.get('checked', 0)
+            stop = min(len(self.__buffer), frame_size)
+            if stop > checked:  # only crc the bytes we have not seen
+                self.__header['check'] = updateCRC(self.__header.get('check',
+                    0xffff), self.__buffer.view(checked, stop))
+                self.__header['checked'] = stop
+            return stop == frame_size and self.__header['check'] == 0
+        except (IndexError, KeyError, AttributeError, NotImplementedException):
+            return False  # incomplete or unknown function code
+
+    def __isFrameCorrupt(self):
+        ''' Check if the next frame can never be valid
+
+        A frame is corrupt if it is complete but failed the crc check.
+        While resynchronizing after such a frame, a function code that
+        cannot be sized is treated as corrupt as well. This should only
+        be called after `checkFrame` failed.
+
+        :returns: True if the frame is corrupt, False otherwise
+        '''
+        size = self.__header.get('len')
+        if size is not None and len(self.__buffer) >= size:
+            self.__resync = True
+            return True
+        if size is None and self.__resync:
+            pdu_class = self.decoder.lookupPduClass(ord(self.__buffer[1]))
+            return not (hasattr(pdu_class, '_rtu_frame_size') or
+                hasattr(pdu_class, '_rtu_byte_count_pos'))
+        return False
+
+    def __splitOnSilence(self, callback):
+        ''' Ends the frame in progress if the line has been silent
+
+        If more than 3.5 characters of silence passed since the last
+        chunk, the frame in progress is ended (see `processSilence`).
+
+        :param callback: The function to send results to
+        '''
+        now = time.time()
+        if now - self.__last > self.silence:
+            self.processSilence(callback)
+        self.__last = now
 
     def advanceFrame(self):
         ''' Skip over the current framed message
@@ -340,7 +586,7 @@ class ModbusRtuFramer(IModbusFramer):
         it or determined that it contains an error. It also has to reset the
         current frame header handle
         '''
-        self.__buffer = self.__buffer[self.__header['len']:]
+        self.__buffer.consume(self.__header['len'])
         self.__header = {}
 
     def isFrameReady(self):
@@ -369,8 +615,9 @@ class ModbusRtuFramer(IModbusFramer):
             pdu_class = self.decoder.lookupPduClass(func_code)
             size = pdu_class.calculateRtuFrameSize(self.__buffer)
             self.__header['len'] = size
-        if 'crc' not in self.__header:
-            self.__header['crc'] = self.__buffer[size - 2:size]
+        if 'crc' not in self.__header and len(self.__buffer) >= self.__header['len']:
+            size = self.__header['len']
+            self.__header['crc'] = self.__buffer.view(size - 2, size).tobytes()
 
     def addToFrame(self, message):
         '''
@@ -379,17 +626,16 @@ class ModbusRtuFramer(IModbusFramer):
 
         :param message: The most recent packet
         '''
-        self.__buffer += message
+        self.__buffer.append(message)
 
     def getFrame(self):
         ''' Get the next frame from the buffer
 
-        :returns: The frame data or ''
+        :returns: A view of the frame data or ''
         '''
         start  = self.__hsize
         end    = self.__header['len'] - 2
-        buffer = self.__buffer[start:end]
-        if end > 0: return buffer
+        if end > 0: return self.__buffer.view(start, end)
         return ''
 
     def populateResult(self, result):
@@ -420,6 +666,8 @@ class ModbusRtuFramer(IModbusFramer):
         :param data: The new packet data
         :param callback: The function to send results to
         '''
+        if self.silence is not None:
+            self.__splitOnSilence(callback)
         self.addToFrame(data)
         while self.isFrameReady():
             if self.checkFrame():
@@ -428,14 +676,58 @@ class ModbusRtuFramer(IModbusFramer):
                     raise ModbusIOException("Unable to decode response")
                 self.populateResult(result)
                 self.advanceFrame()
+                self.__resync = False
                 callback(result)  # defer or push to a thread?
+            elif self.silence is not None and self.__isFrameCorrupt():
+                self.__buffer.consume(1)  # resynchronize on the next byte
+                self.__header = {}
             else: break
 
+    def processSilence(self, callback):
+        ''' Ends the frame in progress because the line went silent
+
+        This is only used with the timing mode. The data still buffered
+        is a whole frame (one that could not be sized) or noise, so it is
+        decoded if its crc is valid and dropped otherwise.
+
+        :param callback: The function to send results to
+        '''
+        if self.silence is None or not len(self.__buffer): return
+        data = self.__buffer.view()
+        if len(data) >= self.__min_frame_size and updateCRC(0xffff, data) == 0:
+            result = self.decoder.decode(data[1:-2])
+            if result is not None:
+                result.unit_id = ord(data[0])
+                callback(result)
+        elif _trace.enabled: _trace.debug("Dropping %d bytes of noise", len(data))
+        self.__buffer.clear()
+        self.__header = {}
+        self.__resync = False
+
+    def calculateFrameSize(self, data):
+        ''' Calculates how many bytes the frame at the start of data needs
+
+        The address and function code are read first to find the pdu
+        class; its fixed frame size is used if it has one, otherwise the
+        byte count field is read and `calculateRtuFrameSize` is used.
+        With the timing mode, a frame with an unknown function code is
+        read up to the silence after it.
+
+        :param data: The bytes of the frame received so far
+        :returns: The number of bytes the frame is known to need
+        '''
+        if (self.silence is not None and len(data) >= 2
+            and self.decoder.lookupPduClass(ord(data[1])) is None):
+            raise NotImplementedException("Unknown function code")
+        return _calculateRtuSize(self.decoder, data)
+
     def buildPacket(self, message):
         ''' Creates a ready to send modbus packet
 
         :param message: The populated request/response to send
         '''
+        if isinstance(message, ModbusPreparedRequest):
+            return message.buildPacket()
         data = message.encode()
         packet = struct.pack('>BB',
             message.unit_id,
@@ -468,7 +760,7 @@ class ModbusAsciiFramer(IModbusFramer):
 
         :param decoder: The decoder implementation to use
         '''
-        self.__buffer = ''
+        self.__buffer = ModbusReceiveBuffer()
         self.__header = {'lrc':'0000', 'len':0, 'uid':0x00}
         self.__hsize  = 0x02
         self.__start  = ':'
@@ -486,15 +778,15 @@ class ModbusAsciiFramer(IModbusFramer):
         start = self.__buffer.find(self.__start)
         if start == -1: return False
         if start > 0 :  # go ahead and skip old bad data
-            self.__buffer = self.__buffer[start:]
+            self.__buffer.consume(start)
             start = 0
 
         end = self.__buffer.find(self.__end)
         if (end != -1):
             self.__header['len'] = end
-            self.__header['uid'] = int(self.__buffer[1:3], 16)
-            self.__header['lrc'] = int(self.__buffer[end - 2:end], 16)
-            data = a2b_hex(self.__buffer[start + 1:end - 2])
+            self.__header['uid'] = int(self.__buffer.view(1, 3).tobytes(), 16)
+            self.__header['lrc'] = int(self.__buffer.view(end - 2, end).tobytes(), 16)
+            data = a2b_hex(self.__buffer.view(start + 1, end - 2))
             return checkLRC(data, self.__header['lrc'])
         return False
 
@@ -504,7 +796,7 @@ class ModbusAsciiFramer(IModbusFramer):
         it or determined that it contains an error. It also has to reset the
         current frame header handle
         '''
-        self.__buffer = self.__buffer[self.__header['len'] + 2:]
+        self.__buffer.consume(self.__header['len'] + 2)
         self.__header = {'lrc':'0000', 'len':0, 'uid':0x00}
 
     def isFrameReady(self):
@@ -523,7 +815,7 @@ class ModbusAsciiFramer(IModbusFramer):
 
         :param message: The most recent packet
         '''
-        self.__buffer += message
+        self.__buffer.append(message)
 
     def getFrame(self):
         ''' Get the next frame from the buffer
@@ -532,8 +824,7 @@ class ModbusAsciiFramer(IModbusFramer):
         '''
         start  = self.__hsize + 1
         end    = self.__header['len'] - 2
-        buffer = self.__buffer[start:end]
-        if end > 0: return a2b_hex(buffer)
+        if end > 0: return a2b_hex(self.__buffer.view(start, end))
         return ''
 
     def populateResult(self, result):
@@ -575,6 +866,21 @@ class ModbusAsciiFramer(IModbusFramer):
                 callback(result)  # defer this
             else: break
 
+    def calculateFrameSize(self, data):
+        ''' Calculates how many bytes the frame at the start of data needs
+
+        An ascii frame carries the rtu frame hex encoded with a one byte
+        LRC in place of the two byte CRC, between a start character and
+        the two end characters, so it is twice the rtu size plus one.
+
+        :param data: The bytes of the frame received so far
+        :returns: The number of bytes the frame is known to need
+        '''
+        count = (len(data) - 1) / 2
+        try: decoded = a2b_hex(data[1:1 + count * 2])
+        except TypeError: return len(data)  # not hex, let the framer skip it
+        return 2 * _calculateRtuSize(self.decoder, decoded) + 1
+
     def buildPacket(self, message):
         ''' Creates a ready to send modbus packet
         Built off of a  modbus request/response
@@ -582,6 +888,8 @@ class ModbusAsciiFramer(IModbusFramer):
         :param message: The request/response to send
         :return: The encoded packet
         '''
+        if isinstance(message, ModbusPreparedRequest):
+            return message.buildPacket()
         encoded  = message.encode()
         buffer   = struct.pack('>BB', message.unit_id, message.function_code)
         checksum = computeLRC(encoded + buffer)
@@ -625,8 +933,8 @@ class ModbusBinaryFramer(IModbusFramer):
 
         :param decoder: The decoder implementation to use
         '''
-        self.__buffer = ''
-        self.__header = {'crc':0x0000, 'len':0, 'uid':0x00}
+        self.__buffer = ModbusReceiveBuffer()
+        self.__header = {'crc':0x0000, 'len':0, 'uid':0x00, 'check':0xffff, 'checked':0}
         self.__hsize  = 0x02
         self.__start  = '\x7b'  # {
         self.__end    = '\x7d'  # }
@@ -643,15 +951,22 @@ class ModbusBinaryFramer(IModbusFramer):
         start = self.__buffer.find(self.__start)
         if start == -1: return False
         if start > 0 :  # go ahead and skip old bad data
-            self.__buffer = self.__buffer[start:]
-
-        end = self.__buffer.find(self.__end)
+            self.__buffer.consume(start)
+            self.__header.update(check=0xffff, checked=0)
+
+        # the crc is carried along with the search for the end, so no
+        # byte is scanned or checked twice while the frame trickles in
+        checked = self.__header['checked']
+        end = self.__buffer.find(self.__end, checked)
+        stop = len(self.__buffer) if end == -1 else end
+        self.__header['check'] = updateCRC(self.__header['check'],
+            self.__buffer.view(checked, stop))
+        self.__header['checked'] = stop
         if (end != -1):
             self.__header['len'] = end
-            self.__header['uid'] = struct.unpack('>B', self.__buffer[1:2])
-            self.__header['crc'] = struct.unpack('>H', self.__buffer[end - 2:end])[0]
-            data = self.__buffer[start:end - 2]
-            return checkCRC(data, self.__header['crc'])
+            self.__header['uid'] = struct.unpack('>B', self.__buffer.view(1, 2))
+            self.__header['crc'] = struct.unpack('>H', self.__buffer.view(end - 2, end))[0]
+            return self.__header['check'] == 0
         return False
 
     def advanceFrame(self):
@@ -660,8 +975,8 @@ class ModbusBinaryFramer(IModbusFramer):
         it or determined that it contains an error. It also has to reset the
         current frame header handle
         '''
-        self.__buffer = self.__buffer[self.__header['len'] + 2:]
-        self.__header = {'crc':0x0000, 'len':0, 'uid':0x00}
+        self.__buffer.consume(self.__header['len'] + 2)
+        self.__header = {'crc':0x0000, 'len':0, 'uid':0x00, 'check':0xffff, 'checked':0}
 
     def isFrameReady(self):
         ''' Check if we should continue decode logic
@@ -679,17 +994,16 @@ class ModbusBinaryFramer(IModbusFramer):
 
         :param message: The most recent packet
         '''
-        self.__buffer += message
+        self.__buffer.append(message)
 
     def getFrame(self):
         ''' Get the next frame from the buffer
 
-        :returns: The frame data or ''
+        :returns: A view of the frame data or ''
         '''
         start  = self.__hsize + 1
         end    = self.__header['len'] - 2
-        buffer = self.__buffer[start:end]
-        if end > 0: return buffer
+        if end > 0: return self.__buffer.view(start, end)
         return ''
 
     def populateResult(self, result):
@@ -731,12 +1045,42 @@ class ModbusBinaryFramer(IModbusFramer):
                 callback(result)  # defer or push to a thread?
             else: break
 
+    def calculateFrameSize(self, data):
+        ''' Calculates how many bytes the frame at the start of data needs
+
+        A binary frame carries the rtu frame between a start and an end
+        flag, with every flag character inside it doubled. The unescaped
+        bytes are sized like an rtu frame, so the frame needs that plus
+        the flags and the escapes seen so far. If the function code does
+        not tell the size, the frame runs up to the first end flag that
+        is not doubled.
+
+        :param data: The bytes of the frame received so far
+        :returns: The number of bytes the frame is known to need
+        '''
+        frame, index = '', 1
+        while index < len(data):
+            char = data[index]
+            if char in (self.__start, self.__end):
+                if index + 1 == len(data): break   # flag or half an escape
+                if data[index + 1] == char: index += 1
+                elif char == self.__end: return index + 1
+            frame += char
+            index += 1
+        needed = _calculateRtuSize(self.decoder, frame)
+        if index < len(data):  # a flag is the last byte received
+            if len(frame) >= needed: return len(data)  # it is the end flag
+            return len(data) + 1                       # see if it is escaped
+        return len(data) + max(needed - len(frame), 0) + 1
+
     def buildPacket(self, message):
         ''' Creates a ready to send modbus packet
 
         :param message: The request/response to send
         :returns: The encoded packet
         '''
+        if isinstance(message, ModbusPreparedRequest):
+            return message.buildPacket()
         data = self._preflight(message.encode())
         packet = struct.pack('>BB',
             message.unit_id,
@@ -755,14 +1099,70 @@ class ModbusBinaryFramer(IModbusFramer):
         '''
         def _filter(a):
             if a in ['}', '{']: return a * 2
-            else: return a, data
+            else: return a
         return ''.join(map(_filter, data))
 
+
+#---------------------------------------------------------------------------#
+# Prepared Requests
+#---------------------------------------------------------------------------#
+class ModbusPreparedRequest(object):
+    '''
+    A request that has been encoded once into a packet template
+
+    A scan loop that issues the same request over and over can prepare
+    it once and execute the prepared request instead::
+
+        prepared = client.prepare(ReadHoldingRegistersRequest(0, 10, unit=1))
+        while polling:
+            response = client.execute(prepared)
+
+    Building the packet of a prepared request only patches the current
+    transaction id into the template for the socket framer, and simply
+    returns the template for the serial framers (whose frames carry no
+    transaction id). As the request is encoded when it is prepared,
+    changing it afterwards does not change the packets that are sent.
+    '''
+    __slots__ = ('request', 'transaction_id', '__packet', '__tail')
+
+    def __init__(self, request, framer):
+        ''' Initializes a new instance of the prepared request
+
+        :param request: The request to prepare
+        :param framer: The framer the request will be sent with
+        '''
+        self.request = request
+        self.transaction_id = request.transaction_id
+        self.__packet = framer.buildPacket(request)
+        if isinstance(framer, ModbusSocketFramer):
+            self.__tail = self.__packet[2:]
+        else: self.__tail = None
+
+    def buildPacket(self):
+        ''' Creates the ready to send packet for the current transaction
+
+        :returns: The encoded packet
+        '''
+        if self.__tail is None: return self.__packet
+        return struct.pack('>H', self.transaction_id) + self.__tail
+
+    unit_id = property(lambda self: self.request.unit_id)
+    function_code = property(lambda self: self.request.function_code)
+
+    def __str__(self):
+        ''' Returns a string representation of the prepared request
+
+        :returns: The string representation
+        '''
+        return "Prepared %s" % self.request
+
+
 #---------------------------------------------------------------------------#
 # Exported symbols
 #---------------------------------------------------------------------------#
 __all__ = [
-    "ModbusTransactionManager",
+    "ModbusTransactionManager", "ModbusReceiveBuffer",
     "ModbusSocketFramer", "ModbusRtuFramer",
     "ModbusAsciiFramer", "ModbusBinaryFramer",
+    "ModbusPreparedRequest",
 ]
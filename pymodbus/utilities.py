@@ -5,7 +5,10 @@ Modbus Utilities
 A collection of utilities for packing data, unpacking
 data computing checksums, and decode checksums.
 '''
+import sys
 import struct
+from array import array
+from binascii import a2b_hex
 
 
 #---------------------------------------------------------------------------#
@@ -48,51 +51,222 @@ def dict_property(store, index):
 #---------------------------------------------------------------------------#
 # Bit packing functions
 #---------------------------------------------------------------------------#
+# The bits of each byte value (least significant first), the same as one
+# byte flags, and a translation table that maps a zero byte to '0' and any
+# other byte to '1'.
+#---------------------------------------------------------------------------#
+__byte_bits  = [tuple(bool(byte >> bit & 1) for bit in range(8))
+    for byte in range(256)]
+__byte_flags = [str(bytearray(bits)) for bits in __byte_bits]
+__bit_digits = '0' + '1' * 255
+
+
 def pack_bitstring(bits):
     ''' Creates a string out of an array of bits
 
-    :param bits: A bit array
+    The bits are turned into a string of binary digits (most significant
+    bit first) which is converted to a number in a single step, so no
+    python code runs per bit.
+
+    :param bits: A bit array (any sequence of truth values)
 
     example::
 
         bits   = [False, True, False, True]
         result = pack_bitstring(bits)
     '''
-    ret = ''
-    i = packed = 0
-    for bit in bits:
-        if bit: packed += 128
-        i += 1
-        if i == 8:
-            ret += chr(packed)
-            i = packed = 0
-        else: packed >>= 1
-    if i > 0 and i < 8:
-        packed >>= (7 - i)
-        ret += chr(packed)
-    return ret
-
-
-def unpack_bitstring(string):
+    if isinstance(bits, BitArray): return bits.packed
+    try: flags = bytearray(bits)
+    except (TypeError, ValueError):
+        flags = bytearray([1 if bit else 0 for bit in bits])
+    if not flags: return ''
+    digits = str(flags).translate(__bit_digits)[::-1]
+    packed = '%0*x' % ((len(flags) + 7) // 8 * 2, int(digits, 2))
+    return a2b_hex(packed)[::-1]
+
+
+def unpack_bitstring(string, compact=False):
     ''' Creates bit array out of a string
 
+    Each byte is expanded with a precomputed table. By default a list
+    of bools is returned; with `compact` a bytearray holding a 0 or 1
+    for each bit is returned instead, which takes a byte (instead of a
+    reference) per bit.
+
     :param string: The modbus data packet to decode
+    :param compact: True to return a bytearray of 0/1 flags
 
     example::
 
         bytes  = 'bytes to decode'
         result = unpack_bitstring(bytes)
     '''
-    byte_count = len(string)
-    bits = []
-    for byte in range(byte_count):
-        value = ord(string[byte])
-        for bit in range(8):
-            bits.append((value & 1) == 1)
-            value >>= 1
+    if compact:
+        table = __byte_flags
+        return bytearray(''.join([table[byte] for byte in bytearray(string)]))
+    table, bits = __byte_bits, []
+    for byte in bytearray(string):
+        bits.extend(table[byte])
     return bits
 
 
+class BitArray(object):
+    ''' A compact array of bits
+
+    The bits are kept packed eight to a byte (lowest address in the least
+    significant bit) exactly as they are sent on the wire, so packing them
+    again costs nothing. Otherwise it behaves like the list of bits it
+    replaces; it even compares equal to a list or tuple of the same bits::
+
+        bits = BitArray('\\x05', 3)
+        bits == [True, False, True]     # True
+        pack_bitstring(bits)            # '\\x05'
+    '''
+    __slots__ = ('packed', 'count')
+
+    def __init__(self, packed='', count=None):
+        ''' Creates a new bit array (clearing any unused padding bits)
+
+        :param packed: The packed bits
+        :param count: The number of bits (default all of the packed bits)
+        '''
+        if count is None: count = len(packed) * 8
+        size = (count + 7) // 8
+        packed = packed[:size]
+        if count & 7:
+            padding = ord(packed[-1]) & ((1 << (count & 7)) - 1)
+            packed = packed[:-1] + chr(padding)
+        self.packed, self.count = packed, count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(unpack_bitstring(self.packed)[:self.count])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0: index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("bit index out of range")
+        return (ord(self.packed[index >> 3]) >> (index & 7)) & 1 == 1
+
+    def __setitem__(self, index, value):
+        if index < 0: index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("bit index out of range")
+        byte, mask = ord(self.packed[index >> 3]), 1 << (index & 7)
+        byte = (byte | mask) if value else (byte & ~mask)
+        self.packed = "%s%c%s" % (self.packed[:index >> 3], byte,
+            self.packed[(index >> 3) + 1:])
+
+    def __eq__(self, other):
+        if isinstance(other, (BitArray, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "BitArray(%r)" % list(self)
+
+    def __reduce__(self):
+        return (self.__class__, (self.packed, self.count))
+
+
+#---------------------------------------------------------------------------#
+# Register packing functions
+#---------------------------------------------------------------------------#
+__swap_registers = (sys.byteorder == 'little')
+
+
+def pack_registers(values):
+    ''' Encodes registers as big endian 16 bit values in one step
+
+    :param values: The register values to encode
+
+    example::
+
+        result = pack_registers([0x0a, 0x0b]) # '\\x00\\x0a\\x00\\x0b'
+    '''
+    if isinstance(values, PackedRegisters): return values.packed
+    if isinstance(values, array) and values.typecode == 'H':
+        registers = array('H', values.tostring())  # a flat copy
+    else: registers = array('H', values)
+    if __swap_registers: registers.byteswap()
+    return registers.tostring()
+
+
+def unpack_registers(data):
+    ''' Decodes big endian 16 bit values into registers in one step
+
+    :param data: The encoded registers to decode
+    :returns: A list of the decoded values
+
+    example::
+
+        result = unpack_registers('\\x00\\x0a\\x00\\x0b') # [0x0a, 0x0b]
+    '''
+    if isinstance(data, memoryview): data = data.tobytes()
+    registers = array('H', data)
+    if __swap_registers: registers.byteswap()
+    return registers.tolist()
+
+
+class PackedRegisters(object):
+    ''' A compact array of registers in wire order
+
+    The registers are kept as the big endian bytes they are sent as, so
+    packing them again costs nothing. Otherwise it behaves like the
+    (read only) list of registers it replaces; it even compares equal
+    to a list or tuple of the same values::
+
+        registers = PackedRegisters('\\x00\\x0a\\x00\\x0b')
+        registers == [10, 11]       # True
+        pack_registers(registers)   # '\\x00\\x0a\\x00\\x0b'
+    '''
+    __slots__ = ('packed',)
+
+    def __init__(self, packed=''):
+        ''' Creates a new register array
+
+        :param packed: The big endian register values
+        '''
+        self.packed = packed
+
+    def __len__(self):
+        return len(self.packed) // 2
+
+    def __iter__(self):
+        return iter(unpack_registers(self.packed))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return unpack_registers(self.packed)[index]
+        if index < 0: index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("register index out of range")
+        return struct.unpack_from('>H', self.packed, index * 2)[0]
+
+    def __eq__(self, other):
+        if isinstance(other, PackedRegisters):
+            return self.packed == other.packed
+        if isinstance(other, (array, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "PackedRegisters(%r)" % list(self)
+
+    def __reduce__(self):
+        return (self.__class__, (self.packed,))
+
+
 #---------------------------------------------------------------------------#
 # Error Detection Functions
 #---------------------------------------------------------------------------#
@@ -115,6 +289,56 @@ def __generate_crc16_table():
 __crc16_table = __generate_crc16_table()
 
 
+def __generate_crc16_words(result):
+    ''' Generates a crc16 lookup table that consumes two bytes at a time
+
+    For a 16 bit crc, the register after two more bytes only depends on
+    the register xor'd with the two bytes (as a little endian word), so
+    each entry is just the single byte table applied twice.
+
+    .. note:: This is only generated on first use as it has 64k entries
+
+    :param result: The (empty) array to fill with the table
+    :returns: The filled in table
+    '''
+    table = __crc16_table
+    result.extend((table[word & 0xff] >> 8) ^
+        table[((word >> 8) ^ table[word & 0xff]) & 0xff]
+        for word in xrange(0x10000))
+    return result
+
+__crc16_words = array('H')
+
+
+def updateCRC(crc, data):
+    ''' Continues a crc16 with more data. This allows the crc of
+    a frame to be computed a chunk at a time as it arrives::
+
+        crc = updateCRC(0xffff, 'first')   # == computeCRC('first')
+        crc = updateCRC(crc, 'second')     # == computeCRC('firstsecond')
+
+    Short chunks are processed a byte at a time while longer ones are
+    processed a (little endian) word at a time. Since the crc is sent
+    low byte first, a frame followed by its crc updates to 0.
+
+    :param crc: The crc of the data so far (0xffff to start)
+    :param data: The data to add to the crc
+    :returns: The calculated CRC
+    '''
+    crc = ((crc << 8) & 0xff00) | (crc >> 8)
+    if len(data) < 16:
+        table = __crc16_table
+        for byte in bytearray(data):
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xff]
+    else:
+        words = __crc16_words or __generate_crc16_words(__crc16_words)
+        for word in struct.unpack_from('<%dH' % (len(data) >> 1), data):
+            crc = words[crc ^ word]
+        if len(data) & 1:
+            crc = (crc >> 8) ^ __crc16_table[(crc ^ bytearray(data[-1:])[0]) & 0xff]
+    return ((crc << 8) & 0xff00) | (crc >> 8)
+
+
 def computeCRC(data):
     ''' Computes a crc16 on the passed in string. For modbus,
     this is only used on the binary serial protocols (in this
@@ -126,12 +350,7 @@ def computeCRC(data):
     :param data: The data to create a crc16 of
     :returns: The calculated CRC
     '''
-    crc = 0xffff
-    for a in data:
-        idx = __crc16_table[(crc ^ ord(a)) & 0xff];
-        crc = ((crc >> 8) & 0xff) ^ idx
-    swapped = ((crc << 8) & 0xff00) | ((crc >> 8) & 0x00ff)
-    return swapped
+    return updateCRC(0xffff, data)
 
 
 def checkCRC(data, check):
@@ -154,8 +373,7 @@ def computeLRC(data):
     :returns: The calculated LRC
 
     '''
-    lrc = 0
-    lrc = sum(ord(a) for a in data) & 0xff
+    lrc = sum(bytearray(data)) & 0xff
     lrc = (lrc ^ 0xff) + 1
     return lrc & 0xff
 
@@ -196,6 +414,8 @@ def rtuFrameSize(buffer, byte_count_pos):
 # Exported symbols
 #---------------------------------------------------------------------------#
 __all__ = [
-    'pack_bitstring', 'unpack_bitstring', 'default',
-    'computeCRC', 'checkCRC', 'computeLRC', 'checkLRC', 'rtuFrameSize'
+    'pack_bitstring', 'unpack_bitstring', 'BitArray', 'default',
+    'pack_registers', 'unpack_registers', 'PackedRegisters',
+    'computeCRC', 'updateCRC', 'checkCRC', 'computeLRC', 'checkLRC',
+    'rtuFrameSize'
 ]
@@ -20,6 +20,22 @@ class MockContext(IModbusSlaveContext):
     def setValues(self, fx, address, count):
         pass
 
+class MockDuckContext(object):
+    ''' A context that only provides the basic methods '''
+
+    def __init__(self, valid=False, default=True):
+        self.valid = valid
+        self.default = default
+
+    def validate(self, fx, address, count):
+        return self.valid
+
+    def getValues(self, fx, address, count):
+        return [self.default] * count
+
+    def setValues(self, fx, address, values):
+        pass
+
 class FakeList(object):
     ''' todo, replace with magic mock '''
 
@@ -15,7 +15,7 @@ from pymodbus.bit_read_message import ReadBitsResponseBase
 from pymodbus.exceptions import *
 from pymodbus.pdu import ModbusExceptions
 
-from modbus_mocks import MockContext
+from modbus_mocks import MockContext, MockDuckContext
 
 #---------------------------------------------------------------------------#
 # Fixture
@@ -73,6 +73,23 @@ class ModbusBitMessageTests(unittest.TestCase):
         for i in xrange(8):
             self.assertEqual(handle.getBit(i), False)
 
+    def testBitReadBaseResponseLazyDecode(self):
+        ''' Test that the response bits are unpacked on first use '''
+        packet = memoryview('\x02\x12\x81')
+        handle = ReadCoilsResponse()
+        handle.decode(packet)
+        self.assertEqual(None, handle._ReadBitsResponseBase__bits)
+        self.assertEqual([False, True, False, False, True, False, False, False],
+            [handle.getBit(i) for i in range(8)])
+        self.assertTrue(handle.getBit(15))
+        self.assertEqual(packet.tobytes(), handle.encode())
+        self.assertEqual(None, handle._ReadBitsResponseBase__bits)
+
+        self.assertEqual(16, len(handle.bits))
+        handle.setBit(15, 0)
+        self.assertEqual('\x02\x12\x01', handle.encode())
+        self.assertFalse(handle.getBit(15))
+
     def testBitReadBaseRequests(self):
         ''' Test bit read request encoding '''
         messages = {
@@ -117,6 +134,28 @@ class ModbusBitMessageTests(unittest.TestCase):
             result = request.execute(context)
             self.assertEqual(result.bits, [True] * 5)
 
+    def testBitReadMessageExecuteDuckContext(self):
+        ''' Test bit read requests against a context that is not derived
+        from IModbusSlaveContext '''
+        for request in [ReadCoilsRequest(1,5), ReadDiscreteInputsRequest(1,5)]:
+            result = request.execute(MockDuckContext(True))
+            self.assertEqual(result.bits, [True] * 5)
+            result = request.execute(MockDuckContext(False))
+            self.assertEqual(ModbusExceptions.IllegalAddress, result.exception_code)
+
+    def testBitReadFromBitDataBlock(self):
+        ''' Test that bits read from a packed datastore are encoded as is '''
+        from pymodbus.datastore import ModbusSlaveContext
+        context = ModbusSlaveContext()
+        context.setValues(1, 0x02, [True, False, True])
+        result = ReadCoilsRequest(0x00, 10).execute(context)
+        self.assertEqual('\x02\x14\x00', result.encode())
+        self.assertTrue(result.getBit(4))
+        result.resetBit(4)
+        self.assertEqual('\x02\x04\x00', result.encode())
+        result.setBit(4)
+        self.assertEqual([False]*2 + [True, False, True] + [False]*5, result.bits)
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
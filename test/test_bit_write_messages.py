@@ -51,6 +51,18 @@ class ModbusBitMessageTests(unittest.TestCase):
         self.assertEqual(request.byte_count, 1)
         self.assertEqual(request.address, 1)
         self.assertEqual(request.values, [True]*5)
+        self.assertEqual(request.encode(), '\x00\x01\x00\x05\x01\x1f')
+
+    def testWriteMultipleCoilsToBitDataBlock(self):
+        ''' Test writing decoded coils to a packed bit datastore '''
+        from pymodbus.datastore import ModbusSlaveContext, ModbusBitDataBlock
+        context = ModbusSlaveContext(co=ModbusBitDataBlock(0x00, [False]*32))
+        for address in (0x00, 0x07, 0x0f):
+            request = WriteMultipleCoilsRequest()
+            request.decode(WriteMultipleCoilsRequest(address, [True]*9).encode())
+            request.execute(context)
+            self.assertEqual(context.getValues(1, address, 10), [True]*9 + [False])
+            context.reset()
 
     def testInvalidWriteMultipleCoilsRequest(self):
         request = WriteMultipleCoilsRequest(1, None)
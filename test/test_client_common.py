@@ -5,6 +5,7 @@ from pymodbus.bit_read_message import *
 from pymodbus.bit_write_message import *
 from pymodbus.register_read_message import *
 from pymodbus.register_write_message import *
+from pymodbus.exceptions import ParameterException
 
 #---------------------------------------------------------------------------#
 # Mocks
@@ -14,6 +15,44 @@ class MockClient(ModbusClientMixin):
     def execute(self, request):
         return request
 
+
+class MockReadClient(ModbusClientMixin):
+    ''' Answers reads with the address as the value (or fails them) '''
+
+    def __init__(self, failing=None):
+        self.requests, self.failing = [], failing
+
+    def execute(self, request):
+        self.requests.append(request)
+        if request.address == self.failing: return None
+        if hasattr(request, 'values'):
+            return WriteMultipleRegistersResponse(request.address, len(request.values))
+        values = range(request.address, request.address + request.count)
+        if isinstance(request, (ReadCoilsRequest, ReadDiscreteInputsRequest)):
+            response = ReadCoilsResponse([v % 2 == 1 for v in values] + [False] * 7)
+        else: response = ReadHoldingRegistersResponse(values)
+        return response
+
+
+class MockPipelinedClient(MockReadClient):
+    ''' Records the batches handed to execute_many '''
+
+    def __init__(self, failing=None):
+        MockReadClient.__init__(self, failing)
+        self.batches = []
+
+    def execute_many(self, requests):
+        self.batches.append(len(requests))
+        return [self.execute(request) for request in requests]
+
+
+class MockDeferredClient(MockReadClient):
+    ''' Answers with already fired deferreds like the async clients '''
+
+    def execute(self, request):
+        from twisted.internet import defer
+        return defer.succeed(MockReadClient.execute(self, request))
+
 #---------------------------------------------------------------------------#
 # Fixture
 #---------------------------------------------------------------------------#
@@ -51,3 +90,100 @@ class ModbusCommonClientTests(unittest.TestCase):
         self.assertTrue(isinstance(self.client.read_holding_registers(1,1), ReadHoldingRegistersRequest))
         self.assertTrue(isinstance(self.client.read_input_registers(1,1), ReadInputRegistersRequest))
         self.assertTrue(isinstance(self.client.readwrite_registers(**arguments), ReadWriteMultipleRegistersRequest))
+
+    def testModbusClientPlanReads(self):
+        ''' This tests that the read planner merges points '''
+        plan = self.client.plan_reads
+        self.assertEqual([], plan([]))
+        self.assertEqual([('h', 0, 1), ('h', 2, 1)], plan([('h', 2, 1), ('h', 0, 1)]))
+        self.assertEqual([('h', 0, 3)], plan([('h', 2, 1), ('h', 0, 1)], gap=1))
+        self.assertEqual([('h', 0, 4)], plan([('h', 0, 3), ('h', 1, 3)]))
+        self.assertEqual([('c', 0, 2), ('h', 0, 2)], plan([('h', 0, 2), ('c', 0, 2)]))
+        self.assertEqual([('h', 0, 125), ('h', 125, 1)],
+            plan([('h', a, 1) for a in range(126)]))
+        self.assertEqual([('c', 0, 2000), ('c', 2000, 1000)], plan([('c', 0, 3000)]))
+        self.assertEqual([('i', 0, 125), ('i', 150, 1)],
+            plan([('i', 0, 1), ('i', 124, 1), ('i', 150, 1)], gap=125))
+        self.assertEqual([('h', 0, 125), ('h', 125, 5)],
+            plan([('h', 0, 100), ('h', 90, 40)]))
+        self.assertRaises(ParameterException, lambda: plan([('x', 0, 1)]))
+
+    def testModbusClientReadPoints(self):
+        ''' This tests that the read points are scattered back '''
+        client = MockReadClient()
+        points = [('h', a, 1) for a in range(0, 300, 3)]
+        points += [('c', 3, 2), ('i', 130, 2)]
+        result = client.read_points(points, gap=2)
+        self.assertEqual(5, len(client.requests))
+        for address in range(0, 300, 3):
+            self.assertEqual([address], result[('h', address, 1)])
+        self.assertEqual([True, False], result[('c', 3, 2)])
+        self.assertEqual([130, 131], result[('i', 130, 2)])
+
+        client = MockReadClient(failing=0)
+        result = client.read_points([('h', 0, 1), ('h', 200, 2)])
+        self.assertEqual(None, result[('h', 0, 1)])
+        self.assertEqual([200, 201], result[('h', 200, 2)])
+
+    def testModbusClientChunkedReads(self):
+        ''' This tests that oversized reads are split and stitched '''
+        client = MockReadClient()
+        response = client.read_holding_registers(10, 10000, unit=2)
+        self.assertEqual(80, len(client.requests))
+        self.assertTrue(all(r.count <= 125 for r in client.requests))
+        self.assertEqual(range(10, 10010), response.registers)
+        self.assertEqual(2, response.unit_id)
+
+        client = MockReadClient()
+        response = client.read_input_registers(0, 250)
+        self.assertEqual([125, 125], [r.count for r in client.requests])
+        self.assertTrue(isinstance(response, ReadInputRegistersResponse))
+        self.assertEqual(range(250), response.registers)
+
+        client = MockReadClient()
+        response = client.read_coils(1, 4001)
+        self.assertEqual([2000, 2000, 1], [r.count for r in client.requests])
+        self.assertEqual([a % 2 == 1 for a in range(1, 4002)], response.bits)
+
+        client = MockReadClient()
+        response = client.read_discrete_inputs(0, 2001)
+        self.assertTrue(isinstance(response, ReadDiscreteInputsResponse))
+        self.assertEqual(2001, len(response.bits))
+
+        client = MockReadClient(failing=125)
+        self.assertEqual(None, client.read_holding_registers(0, 300))
+
+    def testModbusClientChunkedWrites(self):
+        ''' This tests that oversized writes are split '''
+        client = MockReadClient()
+        response = client.write_registers(5, range(300))
+        self.assertEqual([5, 128, 251], [r.address for r in client.requests])
+        self.assertEqual(range(300), sum([r.values for r in client.requests], []))
+        self.assertEqual((5, 300), (response.address, response.count))
+
+        client = MockReadClient()
+        response = client.write_coils(0, [True] * 2000)
+        self.assertEqual([1968, 32], [len(r.values) for r in client.requests])
+        self.assertTrue(isinstance(response, WriteMultipleCoilsResponse))
+        self.assertEqual(2000, response.count)
+
+        client = MockReadClient()
+        client.write_registers(0, 7)
+        self.assertEqual([7], client.requests[0].values)
+
+    def testModbusClientChunkedPipelined(self):
+        ''' This tests that the chunks are pipelined when possible '''
+        client = MockPipelinedClient()
+        response = client.read_holding_registers(0, 1000)
+        self.assertEqual([8], client.batches)
+        self.assertEqual(range(1000), response.registers)
+
+        client = MockPipelinedClient()
+        client.read_holding_registers(0, 10)
+        self.assertEqual([], client.batches)
+
+    def testModbusClientChunkedDeferred(self):
+        ''' This tests that deferred chunks are stitched '''
+        client, result = MockDeferredClient(), []
+        client.read_holding_registers(0, 300).addCallback(result.append)
+        self.assertEqual(range(300), result[0].registers)
@@ -1,12 +1,21 @@
 #!/usr/bin/env python
 import unittest
+import socket
+import struct
+import sys
+import os
+import time
+import threading
 from twisted.test import test_protocols
 from pymodbus.client.sync import ModbusTcpClient, ModbusUdpClient
 from pymodbus.client.sync import ModbusSerialClient, BaseModbusClient
 from pymodbus.exceptions import ConnectionException, NotImplementedException
 from pymodbus.exceptions import ParameterException
 from pymodbus.transaction import ModbusAsciiFramer, ModbusRtuFramer
-from pymodbus.transaction import ModbusBinaryFramer
+from pymodbus.transaction import ModbusBinaryFramer, ModbusSocketFramer
+from pymodbus.factory import ClientDecoder
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+from pymodbus.register_read_message import ReadHoldingRegistersResponse
 
 #---------------------------------------------------------------------------#
 # Mock Classes
@@ -23,6 +32,25 @@ class mockSocket(object):
     def recvfrom(self, size): return '\x00'*size
     def sendto(self, msg, *args): return len(msg)
 
+class mockPipelinedSocket(mockSocket):
+    ''' Answers every request sent so far, newest first '''
+    def __init__(self, unanswered=()):
+        self.sent, self.unanswered, self.timeouts = [], unanswered, []
+    def settimeout(self, timeout): self.timeouts.append(timeout)
+    def send(self, msg):
+        self.sent.append(msg)
+        return len(msg)
+    def recv(self, size):
+        if not self.sent: raise socket.timeout()
+        framer, packet = ModbusSocketFramer(ClientDecoder()), ''
+        for msg in reversed(self.sent):
+            response = ReadHoldingRegistersResponse([ord(msg[9])])
+            response.transaction_id = struct.unpack('>H', msg[:2])[0]
+            if ord(msg[9]) not in self.unanswered:
+                packet += framer.buildPacket(response)
+        self.sent = []
+        return packet
+
 #---------------------------------------------------------------------------#
 # Fixture
 #---------------------------------------------------------------------------#
@@ -103,6 +131,17 @@ class SynchronousClientTest(unittest.TestCase):
 
         self.assertEqual("127.0.0.1:502", str(client))
 
+    def testSyncUdpClientPartialRecv(self):
+        ''' Test that a datagram is read whole and handed out in pieces '''
+        client = ModbusUdpClient()
+        client.socket = mockSocket()
+        client.socket.recvfrom = lambda size: ('\x01\x02\x03', None)
+        self.assertEqual('\x01\x02', client._recv(2))
+        self.assertEqual('\x03', client._recv(2))
+        self.assertEqual('\x01', client._recv(1))
+        client._send('\x00')  # a new request drops the rest of the datagram
+        self.assertEqual('\x01\x02\x03', client._recv(3))
+
     #-----------------------------------------------------------------------#
     # Test TCP Client
     #-----------------------------------------------------------------------#
@@ -131,6 +170,38 @@ class SynchronousClientTest(unittest.TestCase):
 
         self.assertEqual("127.0.0.1:502", str(client))
     
+    def testSyncTcpClientPipelining(self):
+        ''' Test pipelining requests over the tcp sync client '''
+        client = ModbusTcpClient()
+        client.socket = mockPipelinedSocket()
+        requests = [ReadHoldingRegistersRequest(i, 1) for i in range(5)]
+        responses = client.execute_many(requests, window=2)
+        self.assertEqual([0, 1, 2, 3, 4], [r.registers[0] for r in responses])
+        for request, response in zip(requests, responses):
+            self.assertEqual(request.transaction_id, response.transaction_id)
+
+    def testSyncTcpClientPipeliningTimeout(self):
+        ''' Test that an unanswered pipelined request times out alone '''
+        client = ModbusTcpClient()
+        client.socket = mockPipelinedSocket(unanswered=[1])
+        requests = [ReadHoldingRegistersRequest(i, 1) for i in range(3)]
+        responses = client.execute_many(requests, window=3, timeout=0.01)
+        self.assertEqual(0, responses[0].registers[0])
+        self.assertEqual(None, responses[1])
+        self.assertEqual(2, responses[2].registers[0])
+
+    def testSyncTcpClientPrepared(self):
+        ''' Test executing a prepared request over the tcp sync client '''
+        client = ModbusTcpClient()
+        client.socket = mockPipelinedSocket()
+        prepared = client.prepare(ReadHoldingRegistersRequest(7, 1))
+        for _ in range(3):
+            response = client.execute(prepared)
+            self.assertEqual(7, response.registers[0])
+            self.assertEqual(prepared.transaction_id, response.transaction_id)
+        responses = client.execute_many([prepared, prepared], window=1)
+        self.assertEqual([7, 7], [r.registers[0] for r in responses])
+
     #-----------------------------------------------------------------------#
     # Test Serial Client
     #-----------------------------------------------------------------------#
@@ -163,6 +234,51 @@ class SynchronousClientTest(unittest.TestCase):
 
         self.assertEqual('ascii baud[19200]', str(client))
 
+    def testSyncSerialClientFrameTiming(self):
+        ''' Test the rtu character timings of the serial client '''
+        client = ModbusSerialClient(method='rtu', baudrate=9600)
+        self.assertAlmostEqual(0.00171875, client.inter_char_timeout)
+        self.assertAlmostEqual(0.00401042, client.silent_interval)
+        self.assertAlmostEqual(0.00401042, client.framer.silence)
+        client = ModbusSerialClient(method='rtu', baudrate=115200)
+        self.assertEqual(0.00075, client.inter_char_timeout)
+        self.assertEqual(0.00175, client.silent_interval)
+        self.assertEqual(0.00175, client.framer.silence)
+
+        client.socket = mockSocket()
+        client._recv(1)
+        client._send('\x00')
+        self.assertTrue(time.time() - client.last_frame_end >= client.silent_interval)
+
+    def testSyncSerialClientReturnsOnFrame(self):
+        ''' Test that the serial client returns at the end of the frame '''
+        if not sys.platform.startswith('linux'): return
+        import pty, tty
+        master, slave = pty.openpty()
+        tty.setraw(slave)
+        framer = ModbusRtuFramer(ClientDecoder())
+        response = ReadHoldingRegistersResponse([0x2a])
+        response.unit_id = 0x01
+
+        def responder():
+            os.read(master, 8)  # the rtu read request
+            os.write(master, framer.buildPacket(response))
+        thread = threading.Thread(target=responder)
+        thread.start()
+
+        client = ModbusSerialClient(method='rtu', port=os.ttyname(slave), timeout=3)
+        try:
+            start = time.time()
+            result = client.read_holding_registers(0, 1, unit=0x01)
+            elapsed = time.time() - start
+        finally:
+            thread.join()
+            client.close()
+            os.close(master)
+            os.close(slave)
+        self.assertEqual([0x2a], result.registers)
+        self.assertTrue(elapsed < 1, "waited %.2fs for the response" % elapsed)
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
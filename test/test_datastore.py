@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 import unittest
+import mmap
 from pymodbus.datastore import *
 from pymodbus.datastore.store import BaseModbusDataBlock
 from pymodbus.exceptions import NotImplementedException
+from pymodbus.utilities import PackedRegisters
 from pymodbus.exceptions import ParameterException
 from pymodbus.datastore.remote import RemoteSlaveContext
 
@@ -101,6 +103,276 @@ class ModbusDataStoreTest(unittest.TestCase):
         self.assertEqual(block.getValues(0x00, 10), [True]*10)
         self.assertRaises(ParameterException,
             lambda: ModbusSparseDataBlock(True))
+        self.assertRaises(ParameterException,
+            lambda: ModbusSparseDataBlock({}))
+
+    def testModbusSparseDataBlockRuns(self):
+        ''' Test the sparse data block store against a dictionary '''
+        import random
+        generator = random.Random(7)
+        reference = {0x10: 1, 0x11: 2, 0x20: 3}
+        block = ModbusSparseDataBlock(dict(reference))
+        self.assertEqual(0x10, block.address)
+        self.assertEqual(reference, block.values)
+        self.assertEqual([1, 2], block.getValues(0x10, 2))
+        self.assertRaises(KeyError, lambda: block.getValues(0x11, 2))
+        self.assertRaises(KeyError, lambda: block.getValues(0x00))
+
+        for _ in range(500):
+            address = generator.randint(0, 100)
+            values  = [generator.randint(0, 9) for _ in range(generator.randint(1, 8))]
+            if generator.random() < 0.5:
+                block.setValues(address, values)
+                reference.update(enumerate(values, address))
+            else:
+                block.setValues(None, dict(enumerate(values, address * 2)))
+                reference.update(enumerate(values, address * 2))
+            self.assertEqual(reference, block.values)
+
+        for address in range(0, 220):
+            for count in range(0, 6):
+                handle = range(address, address + count)
+                expected = bool(handle) and all(a in reference for a in handle)
+                self.assertEqual(expected, block.validate(address, count))
+                if expected:
+                    self.assertEqual([reference[a] for a in handle],
+                        block.getValues(address, count))
+        block.reset()
+        self.assertEqual(set([0]), set(block.values.values()))
+
+        block.values = {0x05: 1, 0x06: 2, 0x30: 3}
+        self.assertEqual(0x05, block.address)
+        self.assertEqual({0x05: 1, 0x06: 2, 0x30: 3}, block.values)
+        self.assertFalse(block.validate(0x10))
+        self.assertEqual([1, 2], block.getValues(0x05, 2))
+        block.values[0x06] = 9
+        block.values[0x07] = 4
+        self.assertEqual([1, 9, 4], block.getValues(0x05, 3))
+        del block.values[0x06]
+        self.assertFalse(block.validate(0x05, 2))
+        self.assertEqual({0x05: 1, 0x07: 4, 0x30: 3}, block.values)
+        self.assertEqual(3, block.values.pop(0x30))
+        self.assertEqual(2, len(block.values))
+        self.assertTrue(0x07 in block.values)
+        self.assertRaises(KeyError, lambda: block.values.__delitem__(0x30))
+        block.values = [7, 8]
+        self.assertEqual({0x00: 7, 0x01: 8}, block.values)
+        self.assertRaises(ParameterException, lambda: setattr(block, 'values', {}))
+        self.assertEqual({0x00: 7, 0x01: 8}, block.values)
+
+        block.default(4, 9)
+        self.assertEqual({0x00: 9, 0x01: 9, 0x02: 9, 0x03: 9}, block.values)
+        block.setValues(0x01, [1, 2])
+        block.reset()
+        self.assertEqual([9]*4, block.getValues(0x00, 4))
+
+    def testModbusBitDataBlock(self):
+        ''' Test a packed bit data block store '''
+        bits  = [(i * 7) % 3 == 0 for i in range(40)]
+        block = ModbusBitDataBlock(0x01, [False]*40)
+        self.assertFalse(block.validate(0, 1))
+        self.assertFalse(block.validate(0x01, 41))
+        self.assertTrue(block.validate(0x01, 40))
+        self.assertEqual(5, len(block.memory))
+
+        for start in (0, 3, 8, 13):
+            for count in (1, 7, 8, 9, 27 - start):
+                block.reset()
+                block.setValues(0x01 + start, bits[:count])
+                expected = [False]*start + bits[:count] + [False]*(40 - start - count)
+                self.assertEqual(block.getValues(0x01, 40), expected)
+                self.assertEqual(block.getValues(0x01 + start, count), bits[:count])
+
+        block.setValues(0x01, True)
+        self.assertEqual(block.getValues(0x01), [True])
+        self.assertEqual('\x01', block.getValues(0x01, 3).packed)
+        self.assertEqual(dict(block)[0], True)
+        self.assertNotEqual(str(block), None)
+        self.assertEqual(ModbusBitDataBlock(0x00, True).getValues(0x00), [True])
+
+        block = ModbusBitDataBlock(0x01, [True]*8)
+        block.default(4, False)
+        self.assertFalse(block.validate(0x01, 5))
+        self.assertEqual(block.getValues(0x01, 4), [False]*4)
+        block.default(10, True)
+        self.assertTrue(block.validate(0x01, 10))
+        block.setValues(0x02, [False, False])
+        block.reset()
+        self.assertEqual(block.getValues(0x01, 10), [True]*10)
+        self.assertEqual('\xff\x03', block.getValues(0x01, 10).packed)
+        self.assertEqual(ModbusBitDataBlock.create().getValues(0x00, 65536), [False]*65536)
+
+    def testModbusRegisterDataBlock(self):
+        ''' Test an array register data block store '''
+        block = ModbusRegisterDataBlock(0x01, [0x00]*10)
+        self.assertFalse(block.validate(0, 1))
+        self.assertFalse(block.validate(0x01, 11))
+        self.assertTrue(block.validate(0x01, 10))
+
+        block.setValues(0x02, [0x1234, 0xabcd])
+        self.assertEqual(block.getValues(0x01, 4), [0, 0x1234, 0xabcd, 0])
+        self.assertEqual('\x12\x34\xab\xcd', block.getValues(0x02, 2).packed)
+        self.assertEqual([0, 0x1234, 0xabcd, 0], block.values[0:4].tolist())
+        block.values[0] = 0x0102
+        self.assertEqual('\x01\x02', block.getValues(0x01).packed)
+        block.setValues(0x01, PackedRegisters('\x56\x78'))
+        self.assertEqual([0x5678], block.values[0:1].tolist())
+        block.setValues(0x0a, 0xffff)
+        self.assertEqual(block.getValues(0x0a), [0xffff])
+        self.assertEqual(dict(block)[9], 0xffff)
+        self.assertNotEqual(str(block), None)
+        self.assertRaises(OverflowError, lambda: block.setValues(0x01, [0x10000]))
+        block.reset()
+        self.assertEqual(block.getValues(0x01, 10), [0]*10)
+        block.default(12, 0x1234)
+        self.assertTrue(block.validate(0x01, 12))
+        self.assertEqual(block.getValues(0x01, 12), [0x1234]*12)
+        block.setValues(0x01, 0xabcd)
+        block.reset()
+        self.assertEqual('\x12\x34' * 12, block.getValues(0x01, 12).packed)
+        self.assertEqual(ModbusRegisterDataBlock(0x00, 0x1234).getValues(0x00), [0x1234])
+        self.assertEqual(ModbusRegisterDataBlock.create().getValues(0x00, 65536), [0]*65536)
+
+    def testModbusPagedDataBlock(self):
+        ''' Test a lazily allocated paged data block store '''
+        block = ModbusPagedDataBlock(0x01, 40, size=8)
+        self.assertFalse(block.validate(0, 1))
+        self.assertFalse(block.validate(0x01, 41))
+        self.assertTrue(block.validate(0x01, 40))
+
+        self.assertEqual(block.getValues(0x01, 40), [0]*40)
+        self.assertEqual({}, block.pages)
+        block.setValues(0x06, range(1, 11))
+        self.assertEqual([0, 1], sorted(block.pages))
+        self.assertEqual(block.getValues(0x01, 20), [0]*5 + range(1, 11) + [0]*5)
+        block.setValues(0x28, 7)
+        self.assertEqual(block.getValues(0x28), [7])
+        self.assertEqual(dict(block)[39], 7)
+        self.assertNotEqual(str(block), None)
+        block.reset()
+        self.assertEqual({}, block.pages)
+        block.setValues(0x01, 5)
+        block.default(50, 3)
+        self.assertTrue(block.validate(0x01, 50))
+        self.assertEqual(block.getValues(0x01, 50), [3]*50)
+        self.assertEqual({}, block.pages)
+
+        block = ModbusPagedDataBlock.create(False)
+        self.assertEqual(block.getValues(0x00, 65536), [False]*65536)
+        self.assertEqual({}, block.pages)
+        self.assertRaises(ParameterException, lambda: ModbusPagedDataBlock(0, 10, size=0))
+
+    def testModbusSharedDataBlock(self):
+        ''' Test a shared data block store '''
+        import os
+        block = ModbusSharedDataBlock(0x00, [False]*10)
+        self.assertFalse(block.validate(0, 20))
+        self.assertTrue(block.validate(0x00, 10))
+
+        block.setValues(0x00, [True]*10)
+        self.assertEqual(block.getValues(0x00, 10), [True]*10)
+        block.reset()
+        self.assertEqual(block.getValues(0x00, 10), [False]*10)
+        self.assertEqual(ModbusSharedDataBlock(0x00, 0x1234).getValues(0x00), [0x1234])
+        self.assertRaises(OverflowError, lambda: block.setValues(0x00, [0x10000, -1]))
+        self.assertRaises(OverflowError, lambda: block.setValues(0x00, -1))
+        self.assertRaises(OverflowError, lambda: ModbusSharedDataBlock(0x00, [0x10000]))
+        self.assertEqual(block.getValues(0x00, 10), [False]*10)
+        self.assertRaises(ParameterException, lambda: ModbusSharedDataBlock(0x00))
+
+        shared = ModbusSharedDataBlock(0x00, [1, 2, 3])
+        shared.default(3, 7)
+        self.assertEqual('\x00\x07' * 3, shared.memory[:])
+        self.assertFalse(isinstance(shared.values, list))
+        self.assertEqual(shared.getValues(0x00, 3), [7]*3)
+        shared.default(2, 5)
+        self.assertFalse(shared.validate(0x00, 3))
+        self.assertEqual('\x00\x05\x00\x05\x00\x07', shared.memory[:])
+        shared.setValues(0x00, 9)
+        shared.reset()
+        self.assertEqual(shared.getValues(0x00, 2), [5]*2)
+        self.assertEqual('\x00\x05\x00\x05', shared.memory[:4])
+        self.assertRaises(ParameterException, lambda: shared.default(4, 0))
+        self.assertRaises(OverflowError, lambda: shared.default(2, -1))
+
+        pid = os.fork()
+        if pid == 0:
+            block.setValues(0x02, [0xffff, 0x1234])
+            os._exit(0)
+        os.waitpid(pid, 0)
+        self.assertEqual(block.getValues(0x02, 2), [0xffff, 0x1234])
+
+    def testModbusSharedDataBlockFactory(self):
+        ''' Test the shared data block store factory '''
+        block = ModbusSharedDataBlock.create()
+        self.assertEqual(block.getValues(0x00, 65536), [False]*65536)
+
+    def testModbusSharedDataBlockFile(self):
+        ''' Test a shared data block store kept in a file '''
+        import os, tempfile
+        handle, path = tempfile.mkstemp()
+        try:
+            block = ModbusSharedDataBlock(0x01, [0x00]*4, path=path)
+            block.setValues(0x02, [0x1234, 0xabcd])
+            with open(path, 'rb') as image:
+                self.assertEqual('\x00\x00\x12\x34\xab\xcd\x00\x00', image.read())
+
+            attached = ModbusSharedDataBlock(0x01, path=path)
+            self.assertEqual(attached.getValues(0x01, 4), [0, 0x1234, 0xabcd, 0])
+            attached.setValues(0x04, 0x5678)
+            self.assertEqual(block.getValues(0x04), [0x5678])
+            self.assertFalse(attached.validate(0x01, 5))
+        finally:
+            os.close(handle)
+            os.remove(path)
+        self.assertRaises(ParameterException, lambda: ModbusSharedDataBlock(0x00, path=path))
+        self.assertFalse(os.path.exists(path))
+
+    def testModbusSharedBitDataBlock(self):
+        ''' Test a shared bit data block store '''
+        import os, tempfile
+        block = ModbusSharedBitDataBlock(0x00, [False]*20)
+        self.assertFalse(block.validate(-1, 0))
+        self.assertFalse(block.validate(0, 21))
+        self.assertTrue(block.validate(0x00, 20))
+        self.assertEqual(3, len(block.memory))
+
+        block.setValues(0x03, [True, False, True, True, True, True, True])
+        self.assertEqual(block.getValues(0x02, 9),
+            [False, True, False, True, True, True, True, True, False])
+        self.assertEqual('\xe8\x03\x00', block.memory[:])
+        block.setValues(0x13, True)
+        self.assertEqual(block.getValues(0x13), [True])
+        self.assertEqual(dict(block)[0x13], True)
+        self.assertNotEqual(str(block), None)
+        block.reset()
+        self.assertEqual(block.getValues(0x00, 20), [False]*20)
+        self.assertEqual(ModbusSharedBitDataBlock.create().getValues(0x00, 65536), [False]*65536)
+        block.default(12, True)
+        self.assertEqual('\xff\x0f\x00', block.memory[:])
+        self.assertFalse(block.validate(0x00, 13))
+        block.setValues(0x00, False)
+        block.reset()
+        self.assertEqual(block.getValues(0x00, 12), [True]*12)
+        self.assertTrue(isinstance(block.memory, mmap.mmap))
+        self.assertRaises(ParameterException, lambda: block.default(25, False))
+        self.assertRaises(ParameterException, lambda: ModbusSharedBitDataBlock(0x00, count=8))
+
+        handle, path = tempfile.mkstemp()
+        try:
+            block = ModbusSharedBitDataBlock(0x00, [True]*9, path=path)
+            attached = ModbusSharedBitDataBlock(0x00, path=path, count=9)
+            self.assertEqual(attached.getValues(0x00, 9), [True]*9)
+            self.assertFalse(attached.validate(0x00, 10))
+            attached.setValues(0x08, False)
+            self.assertEqual(block.getValues(0x07, 2), [True, False])
+            self.assertRaises(ParameterException,
+                lambda: ModbusSharedBitDataBlock(0x00, path=path))
+            self.assertRaises(ParameterException,
+                lambda: ModbusSharedBitDataBlock(0x00, path=path, count=17))
+        finally:
+            os.close(handle)
+            os.remove(path)
 
     def testModbusSlaveContext(self):
         ''' Test a modbus slave context '''
@@ -122,6 +394,8 @@ class ModbusDataStoreTest(unittest.TestCase):
         for fx in [1,2,3,4]:
             self.assertTrue(context.validate(fx, 0,10))
             self.assertEqual(context.getValues(fx, 0,10), [False]*10)
+            self.assertEqual(context.getValuesChecked(fx, 0,10), [False]*10)
+            self.assertEqual(context.getValuesChecked(fx, 0,11), None)
 
     def testModbusServerContext(self):
         ''' Test a modbus server context '''
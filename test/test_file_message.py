@@ -14,7 +14,7 @@ from pymodbus.file_message import *
 from pymodbus.exceptions import *
 from pymodbus.pdu import ModbusExceptions
 
-from modbus_mocks import MockContext
+from modbus_mocks import MockContext, MockDuckContext
 
 #---------------------------------------------------------------------------#
 # Fixture
@@ -269,6 +269,14 @@ class ModbusBitMessageTests(unittest.TestCase):
         result  = handle.execute(context)
         self.assertTrue(isinstance(result, MaskWriteRegisterResponse))
 
+    def testMaskWriteRegisterRequestExecuteDuckContext(self):
+        ''' Test write register request execution against a duck typed context '''
+        handle  = MaskWriteRegisterRequest(0x0000, 0x0101, 0x1010)
+        result  = handle.execute(MockDuckContext(valid=True, default=0x0000))
+        self.assertTrue(isinstance(result, MaskWriteRegisterResponse))
+        result  = handle.execute(MockDuckContext(valid=False))
+        self.assertEqual(ModbusExceptions.IllegalAddress, result.exception_code)
+
     def testMaskWriteRegisterRequestInvalidExecute(self):
         ''' Test write register request execute with invalid data '''
         context = MockContext(valid=False, default=0x0000)
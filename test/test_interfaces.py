@@ -43,6 +43,8 @@ class ModbusInterfaceTestsTest(unittest.TestCase):
         self.assertRaises(NotImplementedException, lambda: instance.addToFrame(x))
         self.assertRaises(NotImplementedException, lambda: instance.populateResult(x))
         self.assertRaises(NotImplementedException, lambda: instance.processIncomingPacket(x,x))
+        self.assertRaises(NotImplementedException, lambda: instance.processIncomingFrames(x))
+        self.assertRaises(NotImplementedException, lambda: instance.calculateFrameSize(x))
         self.assertRaises(NotImplementedException, lambda: instance.buildPacket(x))
 
     def testModbusSlaveContextInterface(self):
@@ -53,6 +55,15 @@ class ModbusInterfaceTestsTest(unittest.TestCase):
         self.assertRaises(NotImplementedException, lambda: instance.validate(x,x,x))
         self.assertRaises(NotImplementedException, lambda: instance.getValues(x,x,x))
         self.assertRaises(NotImplementedException, lambda: instance.setValues(x,x,x))
+        self.assertRaises(NotImplementedException, lambda: instance.getValuesChecked(x,x,x))
+
+    def testModbusSlaveContextGetValuesChecked(self):
+        ''' Test that the checked read falls back to validate and get '''
+        instance = IModbusSlaveContext()
+        instance.validate  = lambda fx, address, count: address == 0x00
+        instance.getValues = lambda fx, address, count: [fx] * count
+        self.assertEqual(instance.getValuesChecked(3, 0x00, 2), [3, 3])
+        self.assertEqual(instance.getValuesChecked(3, 0x01, 2), None)
 
 #---------------------------------------------------------------------------#
 # Main
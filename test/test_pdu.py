@@ -3,6 +3,22 @@ import unittest
 from pymodbus.pdu import *
 from pymodbus.exceptions import *
 
+#---------------------------------------------------------------------------#
+# Mock Classes
+#---------------------------------------------------------------------------#
+class CustomModbusRequest(ModbusRequest):
+    ''' A custom message that does not declare its slots '''
+    function_code = 0x55
+
+    def __init__(self, address=0, **kwargs):
+        ModbusRequest.__init__(self, **kwargs)
+        self.address = address
+
+    def encode(self): return chr(self.address)
+
+#---------------------------------------------------------------------------#
+# Fixture
+#---------------------------------------------------------------------------#
 class SimplePduTest(unittest.TestCase):
     '''
     This is the unittest for the pymod.pdu module
@@ -73,8 +89,72 @@ class SimplePduTest(unittest.TestCase):
         self.assertEqual(ModbusResponse.calculateRtuFrameSize(
             "\x11\x01\x05\xcd\x6b\xb2\x0e\x1b\x45\xe6"), 10)
         del ModbusResponse._rtu_byte_count_pos
-        
-        
+
+    def testSlottedMessages(self):
+        ''' Test that the messages do not carry an instance dictionary '''
+        from pymodbus.factory import ServerDecoder, ClientDecoder
+        from pymodbus.register_read_message import ReadHoldingRegistersRequest
+        messages = [self.illegal, self.exception] + list(self.badRequests)
+        messages += [f() for f in ServerDecoder._ServerDecoder__function_table]
+        messages += [f() for f in ClientDecoder._ClientDecoder__function_table]
+        for message in messages:
+            if getattr(message, 'function_code', 0) in (0x08, 0x2b): continue
+            self.assertFalse(hasattr(message, '__dict__'), message)
+
+        request = ReadHoldingRegistersRequest(1, 2, unit=3)
+        self.assertRaises(AttributeError, setattr, request, 'missing', 1)
+        self.assertRaises(AttributeError, setattr, request, 'function_code', 4)
+        self.assertEqual((request.address, request.count, request.unit_id), (1, 2, 3))
+
+        request = ModbusRequest()
+        request.function_code = 0x41
+        self.assertEqual(0x41, request.function_code)
+
+    def testCustomMessages(self):
+        ''' Test that a custom message that does not declare its slots
+        takes any attribute (and a per instance function code) '''
+        import copy, pickle
+        request = CustomModbusRequest(0x12, unit=3)
+        self.assertEqual(0x55, request.function_code)
+        request.note = 'extra'
+        request.function_code = 0x56
+        self.assertEqual((0x56, 'extra'), (request.function_code, request.note))
+        self.assertEqual(0x55, CustomModbusRequest().function_code)
+        for result in [copy.copy(request), copy.deepcopy(request),
+            pickle.loads(pickle.dumps(request, 0)), pickle.loads(pickle.dumps(request, 2))]:
+            self.assertEqual((0x56, 'extra', 3), (result.function_code,
+                result.note, result.unit_id))
+            self.assertEqual('\x12', result.encode())
+
+    def testCopyAndPickleMessages(self):
+        ''' Test that the slotted messages can be copied and pickled '''
+        import copy, pickle
+        from pymodbus.register_read_message import ReadHoldingRegistersRequest
+        from pymodbus.register_read_message import ReadHoldingRegistersResponse
+        from pymodbus.bit_write_message import WriteSingleCoilRequest
+        decoded = ReadHoldingRegistersResponse()
+        decoded.decode(memoryview('\x04\x00\x01\x00\x02'))
+        request = ModbusRequest()
+        request.function_code = 0x41
+        messages = [ReadHoldingRegistersRequest(1, 2, unit=3), decoded,
+            ReadHoldingRegistersResponse([1, 2]), WriteSingleCoilRequest(1, True),
+            self.illegal, self.exception, request]
+        methods  = [copy.copy, copy.deepcopy]
+        methods += [lambda m, p=p: pickle.loads(pickle.dumps(m, p)) for p in (0, 1, 2)]
+        for message in messages:
+            message.transaction_id = 0x1234
+            for method in methods:
+                result = method(message)
+                self.assertEqual(result.__class__, message.__class__)
+                self.assertEqual(result.function_code, message.function_code)
+                self.assertEqual(result.transaction_id, 0x1234)
+                self.assertEqual(result.unit_id, message.unit_id)
+                if message not in (self.illegal, request):
+                    self.assertEqual(result.encode(), message.encode())
+        self.assertEqual(copy.deepcopy(decoded).registers, [1, 2])
+        self.assertEqual(copy.copy(self.illegal).execute(None).exception_code,
+            self.illegal.execute(None).exception_code)
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 import unittest
+import json
 from pymodbus.register_read_message import *
 from pymodbus.register_read_message import ReadRegistersRequestBase
 from pymodbus.register_read_message import ReadRegistersResponseBase
 from pymodbus.exceptions import *
 from pymodbus.pdu import ModbusExceptions
 
-from modbus_mocks import MockContext, FakeList
+from modbus_mocks import MockContext, MockDuckContext, FakeList
 
 #---------------------------------------------------------------------------#
 # Fixture
@@ -70,13 +71,34 @@ class ReadRegisterMessagesTest(unittest.TestCase):
             [0x0a,0x0b,0x0c],
             [0x0a,0x0b,0x0c],
             [0x0a,0x0b,0x0c],
-            [0x0a,0x0b,0x0c, 0x0a,0x0b,0x0c],
+            [0x0a,0x0b,0x0c],
         ]
         values = sorted(self.response_read.items())
         for packet, register in zip(values, registers):
             request, response = packet
             request.decode(response)
             self.assertEqual(request.registers, register)
+            self.assertTrue(isinstance(request.registers, list))
+            self.assertEqual(register + [1], request.registers + [1])
+            self.assertEqual(json.dumps(register), json.dumps(request.registers))
+
+    def testRegisterReadResponseLazyDecode(self):
+        ''' Test that the response registers are decoded on first use '''
+        packet = memoryview('\x06\x00\x0a\x00\x0b\x00\x0c')
+        for handle in [ReadHoldingRegistersResponse(), ReadInputRegistersResponse(),
+                ReadWriteMultipleRegistersResponse()]:
+            handle.decode(packet)
+            self.assertEqual(None, handle._ReadRegistersResponseBase__registers)
+            self.assertEqual(0x0b, handle.getRegister(1))
+            self.assertEqual(3, handle.getRegisterCount())
+            self.assertEqual(packet.tobytes(), handle.encode())
+            self.assertTrue(str(handle) != None)
+            self.assertEqual(None, handle._ReadRegistersResponseBase__registers)
+
+            self.assertEqual(0x0c, handle.getRegister(-1))
+            self.assertEqual([0x0a, 0x0b, 0x0c], handle.registers)
+            handle.registers[0] = 0x0d
+            self.assertEqual('\x06\x00\x0d\x00\x0b\x00\x0c', handle.encode())
 
     def testRegisterReadRequestsCountErrors(self):
         '''
@@ -128,6 +150,29 @@ class ReadRegisterMessagesTest(unittest.TestCase):
             response = request.execute(context)
             self.assertEqual(request.function_code, response.function_code)
 
+    def testRegisterReadRequestsExecuteDuckContext(self):
+        ''' Test the register read requests against a context that is not
+        derived from IModbusSlaveContext '''
+        requests = [
+            ReadHoldingRegistersRequest(1, 5),
+            ReadInputRegistersRequest(1, 5),
+        ]
+        for request in requests:
+            response = request.execute(MockDuckContext(True, 0x1234))
+            self.assertEqual([0x1234] * 5, response.registers)
+            response = request.execute(MockDuckContext(False))
+            self.assertEqual(ModbusExceptions.IllegalAddress, response.exception_code)
+
+    def testRegisterReadFromRegisterDataBlock(self):
+        ''' Test that registers read from an array datastore are encoded as is '''
+        from pymodbus.datastore import ModbusSlaveContext
+        context = ModbusSlaveContext()
+        context.setValues(3, 0x01, [0x1234, 0xabcd])
+        response = ReadHoldingRegistersRequest(0x00, 4).execute(context)
+        self.assertEqual('\x08\x00\x00\x12\x34\xab\xcd\x00\x00', response.encode())
+        self.assertEqual(0xabcd, response.getRegister(2))
+        self.assertEqual([0, 0x1234, 0xabcd, 0], response.registers)
+
     def testReadWriteMultipleRegistersRequest(self):
         context = MockContext(True)
         request = ReadWriteMultipleRegistersRequest(read_address=1,
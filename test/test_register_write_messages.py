@@ -91,6 +91,15 @@ class WriteRegisterMessagesTest(unittest.TestCase):
         result = request.execute(context)
         self.assertEqual(result.function_code, request.function_code)
 
+    def testWriteMultipleRegisterRequestToDatastore(self):
+        ''' Test that decoded registers are stored as separate values '''
+        from pymodbus.datastore import ModbusSlaveContext
+        context = ModbusSlaveContext()
+        request = WriteMultipleRegistersRequest()
+        request.decode(WriteMultipleRegistersRequest(0x01, [0x05, 0x06]).encode())
+        request.execute(context)
+        self.assertEqual([0x05, 0x06, 0x00], context.getValues(16, 0x01, 3))
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
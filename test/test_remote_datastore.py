@@ -45,6 +45,24 @@ class RemoteModbusDataStoreTest(unittest.TestCase):
         result  = context.getValues(3, 0, 10)
         self.assertNotEqual(result, [10]*10)
 
+    def testRemoteSlaveGetValuesChecked(self):
+        ''' Test a checked read is a single request to a remote slave '''
+        requests = []
+        def read_coils(a, b):
+            requests.append((a, b))
+            return ReadCoilsResponse([1]*10)
+        client  = mock()
+        client.read_coils = read_coils
+        client.read_holding_registers = lambda a,b: ExceptionResponse(0x15)
+
+        context = RemoteSlaveContext(client)
+        result  = context.getValuesChecked(1, 0, 10)
+        self.assertEqual(result, [1]*10)
+        self.assertEqual(requests, [(0, 10)])
+
+        result  = context.getValuesChecked(3, 0, 10)
+        self.assertEqual(result, None)
+
     def testRemoteSlaveValidateValues(self):
         ''' Test validating against a remote slave context '''
         client  = mock()
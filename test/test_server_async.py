@@ -6,6 +6,18 @@ from pymodbus.server.async import ModbusServerFactory
 from pymodbus.server.async import StartTcpServer, StartUdpServer, StartSerialServer
 from pymodbus.exceptions import ConnectionException, NotImplementedException
 from pymodbus.exceptions import ParameterException
+from pymodbus.datastore import ModbusServerContext, ModbusSlaveContext
+from pymodbus.factory import ClientDecoder
+from pymodbus.transaction import ModbusSocketFramer, ModbusRtuFramer
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+
+#---------------------------------------------------------------------------#
+# Mock Classes
+#---------------------------------------------------------------------------#
+class mockTransport(object):
+    def __init__(self): self.writes = []
+    def write(self, data): self.writes.append(data)
+    def getHost(self): return '127.0.0.1'
 
 #---------------------------------------------------------------------------#
 # Fixture
@@ -37,6 +49,70 @@ class AsynchronousServerTest(unittest.TestCase):
         ''' Test the base class for all the clients '''
         self.assertTrue(True)
 
+    def testTcpProtocolBatchesResponses(self):
+        ''' Test that a pipelined burst is answered with a single write '''
+        framer, burst = ModbusSocketFramer(ClientDecoder()), ''
+        for tid in range(1, 4):
+            request = ReadHoldingRegistersRequest(tid, 1)
+            request.transaction_id = tid
+            burst += framer.buildPacket(request)
+
+        context = ModbusServerContext(slaves=ModbusSlaveContext())
+        protocol = ModbusTcpProtocol()
+        protocol.factory = ModbusServerFactory(context)
+        protocol.factory.control.ListenOnly = None  # the control is shared
+        protocol.makeConnection(mockTransport())
+        counted = protocol.factory.control.Counter.BusMessage
+        protocol.dataReceived(burst)
+
+        self.assertEqual(1, len(protocol.transport.writes))
+        responses = framer.processIncomingFrames(protocol.transport.writes[0])
+        self.assertEqual([1, 2, 3], [r.transaction_id for r in responses])
+        self.assertEqual(counted + 3, protocol.factory.control.Counter.BusMessage)
+
+    def testSerialProtocolEndsFrameOnSilence(self):
+        ''' Test that a serial request that cannot be sized is answered '''
+        from functools import partial
+        from pymodbus.utilities import computeCRC
+        import struct
+        unknown = '\x01\x41\x01\x02'
+        unknown += struct.pack('>H', computeCRC(unknown))
+
+        context = ModbusServerContext(slaves=ModbusSlaveContext())
+        protocol = ModbusTcpProtocol()
+        protocol.factory = ModbusServerFactory(context,
+            partial(ModbusRtuFramer, baudrate=9600))
+        protocol.factory.control.ListenOnly = None  # the control is shared
+        protocol.makeConnection(mockTransport())
+        protocol.dataReceived(unknown)
+        self.assertEqual([], protocol.transport.writes)
+        self.assertTrue(protocol.silence.active())
+
+        protocol.silence.cancel()
+        protocol._processSilence()  # what the timer calls
+        self.assertEqual(1, len(protocol.transport.writes))
+        self.assertEqual('\x01\xc1\x01', protocol.transport.writes[0][:3])
+
+    def testUdpProtocolRefreshesTracing(self):
+        ''' Test that the udp server picks up the logging level on start '''
+        import logging
+        from pymodbus import trace
+        tracer = trace.getTracer('pymodbus.server.async')
+        logger = logging.getLogger('pymodbus.server.async')
+        level  = logger.level
+        try:
+            logger.setLevel(logging.INFO)
+            trace.refresh()
+            logger.setLevel(logging.DEBUG)
+            self.assertFalse(tracer.enabled)
+            context = ModbusServerContext(slaves=ModbusSlaveContext())
+            protocol = ModbusUdpProtocol(context)
+            protocol.makeConnection(mockTransport())
+            self.assertTrue(tracer.enabled)
+        finally:
+            logger.setLevel(level)
+            trace.refresh()
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
@@ -1,13 +1,96 @@
 #!/usr/bin/env python
 import unittest
+import sys
+import os
+import socket
+import errno
+import select
+import struct
+import threading
+import time
 from twisted.test import test_protocols
 from pymodbus.server.sync import ModbusBaseRequestHandler
 from pymodbus.server.sync import ModbusConnectedRequestHandler
+from pymodbus.server.sync import ModbusSingleRequestHandler
 from pymodbus.server.sync import ModbusDisconnectedRequestHandler
+from pymodbus.server.sync import ModbusSelectorTcpServer, ModbusWorkerPool
+from pymodbus.server.sync import ModbusSelectorRequestHandler
+from pymodbus.server.sync import ModbusPreforkTcpServer
 from pymodbus.server.sync import ModbusTcpServer, ModbusUdpServer, ModbusSerialServer
 from pymodbus.server.sync import StartTcpServer, StartUdpServer, StartSerialServer
 from pymodbus.exceptions import ConnectionException, NotImplementedException
 from pymodbus.exceptions import ParameterException
+from pymodbus.datastore import ModbusServerContext, ModbusSlaveContext
+from pymodbus.datastore import ModbusSharedDataBlock
+from pymodbus.factory import ServerDecoder, ClientDecoder
+from pymodbus.utilities import computeCRC
+from pymodbus.transaction import ModbusSocketFramer, ModbusRtuFramer
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+
+#---------------------------------------------------------------------------#
+# Mock Classes
+#---------------------------------------------------------------------------#
+class mockServer(object):
+    def __init__(self):
+        self.context = ModbusServerContext(slaves=ModbusSlaveContext())
+        self.framer, self.decoder = ModbusSocketFramer, ServerDecoder()
+        self.threads = []
+
+class mockSocket(object):
+    ''' Delivers the queued chunks and records every write '''
+    def __init__(self, *chunks):
+        self.chunks, self.writes = list(chunks), []
+    def recv(self, size): return self.chunks.pop(0) if self.chunks else ''
+    def sendall(self, data): self.writes.append(data)
+    def sendto(self, data, address): self.writes.append(data)
+
+class mockPartialSocket(mockSocket):
+    ''' Accepts at most `limit` bytes per non-blocking write '''
+    def __init__(self, limit, *chunks):
+        mockSocket.__init__(self, *chunks)
+        self.limit = limit
+    def send(self, data):
+        if not self.limit: raise socket.error(errno.EAGAIN, 'busy')
+        data = data[:self.limit]
+        if isinstance(data, memoryview): data = data.tobytes()
+        self.writes.append(data)
+        return len(data)
+
+class mockSerial(object):
+    ''' Delivers the queued chunks, then stops the handlers '''
+    def __init__(self, server, *chunks):
+        self.server, self.chunks, self.writes = server, list(chunks), []
+    def recv(self, size):
+        if self.chunks: return self.chunks.pop(0)
+        for handler in self.server.threads: handler.running = False
+        return ''
+    def send(self, data): self.writes.append(data)
+
+class mockHandler(object):
+    ''' Records the batches it responds to, slowly '''
+    def __init__(self, log, name):
+        self.log, self.name = log, name
+    def respond(self, requests):
+        time.sleep(0.001)
+        self.log.append((self.name, requests))
+
+def _burst(count, registers=1):
+    ''' Builds a burst of pipelined read requests '''
+    framer, burst = ModbusSocketFramer(ClientDecoder()), ''
+    for tid in range(1, count + 1):
+        request = ReadHoldingRegistersRequest(tid, registers)
+        request.transaction_id = tid
+        burst += framer.buildPacket(request)
+    return burst
+
+class mockBlockedHandler(object):
+    ''' Records the batches it responds to once it is released '''
+    def __init__(self):
+        self.log, self.started, self.release = [], threading.Event(), threading.Event()
+    def respond(self, requests):
+        self.started.set()
+        self.release.wait()
+        self.log.append(requests)
 
 #---------------------------------------------------------------------------#
 # Fixture
@@ -39,6 +122,228 @@ class AsynchronousClientTest(unittest.TestCase):
         ''' Test the base class for all the clients '''
         self.assertTrue(True)
 
+    def testConnectedHandlerBatchesResponses(self):
+        ''' Test that a pipelined burst is answered with a single write '''
+        framer, burst = ModbusSocketFramer(ClientDecoder()), _burst(3)
+        socket = mockSocket(burst[:20], burst[20:])
+        ModbusConnectedRequestHandler(socket, ('127.0.0.1', 502), mockServer())
+
+        self.assertEqual(2, len(socket.writes))
+        self.assertEqual(1, len(framer.processIncomingFrames(socket.writes[0])))
+        responses = framer.processIncomingFrames(socket.writes[1])
+        self.assertEqual([2, 3], [r.transaction_id for r in responses])
+
+    def testSingleHandlerEndsFrameOnSilence(self):
+        ''' Test that a serial request that cannot be sized is answered '''
+        from functools import partial
+        server = mockServer()
+        server.framer = partial(ModbusRtuFramer, baudrate=9600)
+        unknown = '\x01\x41\x01\x02'
+        unknown += struct.pack('>H', computeCRC(unknown))
+        serial = mockSerial(server, unknown)
+        ModbusSingleRequestHandler(serial, ('/dev/null', '/dev/null'), server)
+
+        self.assertEqual(1, len(serial.writes))
+        self.assertEqual('\x01\xc1\x01', serial.writes[0][:3])
+
+    def testSerialServerFrameTiming(self):
+        ''' Test that the serial server gives rtu framers the baud rate '''
+        if not sys.platform.startswith('linux'): return
+        import pty
+        master, slave = pty.openpty()
+        try:
+            server = ModbusSerialServer(None, framer=ModbusRtuFramer,
+                port=os.ttyname(slave), baudrate=9600)
+            self.assertAlmostEqual(0.00171875, server.socket.interCharTimeout)
+            self.assertAlmostEqual(0.00401042,
+                server.framer(ServerDecoder()).silence)
+            server.server_close()
+
+            server = ModbusSerialServer(None, port=os.ttyname(slave))
+            self.assertEqual(None, server.inter_char_timeout)
+            server.server_close()
+        finally:
+            os.close(master)
+            os.close(slave)
+
+    def testDisconnectedHandlerSendsDatagrams(self):
+        ''' Test that each batched udp response gets its own datagram '''
+        socket = mockSocket()
+        ModbusDisconnectedRequestHandler((_burst(3), socket),
+            ('127.0.0.1', 502), mockServer())
+        self.assertEqual(3, len(socket.writes))
+
+    def testSelectorServer(self):
+        ''' Test serving several clients from the selector server '''
+        from pymodbus.client.sync import ModbusTcpClient
+        context = ModbusServerContext(slaves=ModbusSlaveContext())
+        server  = ModbusSelectorTcpServer(context, address=('127.0.0.1', 0))
+        thread  = threading.Thread(target=server.serve_forever, args=(0.01,))
+        thread.start()
+        try:
+            host, port = server.server_address
+            clients = [ModbusTcpClient(host, port) for _ in range(3)]
+            for client in clients:
+                client.write_register(1, 0x1234)
+                self.assertEqual([0x1234], client.read_holding_registers(1, 1).registers)
+
+            burst = socket.create_connection((host, port))
+            burst.sendall(_burst(50))
+            framer, responses = ModbusSocketFramer(ClientDecoder()), []
+            while len(responses) < 50:
+                responses += framer.processIncomingFrames(burst.recv(4096))
+            self.assertEqual(range(1, 51), [r.transaction_id for r in responses])
+            burst.close()
+            for client in clients: client.close()
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+        self.assertEqual([], server.threads)
+
+    def testSelectorHandlerQueuesPartialWrites(self):
+        ''' Test that the selector handler keeps the unwritten responses '''
+        request = mockPartialSocket(0, _burst(3))
+        handler = ModbusSelectorRequestHandler(request, ('127.0.0.1', 502), mockServer())
+        self.assertTrue(handler.handle())
+        self.assertEqual(1, len(handler.pending))
+        self.assertEqual(3 * 11, handler.queued)
+        self.assertFalse(handler.flush())
+
+        request.limit = 5
+        self.assertFalse(handler.flush())
+        self.assertTrue(isinstance(handler.pending[0], memoryview))
+        self.assertEqual(3 * 11 - 5, handler.queued)
+        request.limit = 1024
+        self.assertTrue(handler.flush())
+        self.assertEqual(0, handler.queued)
+
+        framer = ModbusSocketFramer(ClientDecoder())
+        responses = framer.processIncomingFrames(''.join(request.writes))
+        self.assertEqual([1, 2, 3], [r.transaction_id for r in responses])
+
+    def testSelectorServerStopsReadingWhenBacklogged(self):
+        ''' Test that a client that does not read cannot grow the backlog '''
+        context = ModbusServerContext(slaves=ModbusSlaveContext())
+        server  = ModbusSelectorTcpServer(context, address=('127.0.0.1', 0))
+        thread  = threading.Thread(target=server.serve_forever, args=(0.01,))
+        ModbusSelectorRequestHandler.high_water = 4096
+        thread.start()
+        try:
+            burst = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            burst.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+            burst.connect(server.server_address)
+            handlers = server._ModbusSelectorTcpServer__handlers
+            while not handlers: time.sleep(0.01)
+            handler, = handlers.values()
+            handler.request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+            writer = threading.Thread(target=burst.sendall, args=(_burst(2000, 125),))
+            writer.start()
+            deadline = time.time() + 5
+            while handler.queued <= 4096 and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)     # the server would keep reading without the limit
+            self.assertFalse(handler.events & select.POLLIN)
+            self.assertTrue(4096 < handler.queued < 4096 + 4096 / 12 * 259)
+
+            framer, responses = ModbusSocketFramer(ClientDecoder()), []
+            while len(responses) < 2000:
+                responses += framer.processIncomingFrames(burst.recv(65536))
+            self.assertEqual(range(1, 2001), [r.transaction_id for r in responses])
+            writer.join()
+            burst.close()
+        finally:
+            del ModbusSelectorRequestHandler.high_water
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+    def testWorkerPoolKeepsConnectionOrder(self):
+        ''' Test that the batches of a connection are executed in order '''
+        log  = []
+        pool = ModbusWorkerPool(4)
+        handlers = [mockHandler(log, name) for name in 'abc']
+        for batch in range(10):
+            for handler in handlers: pool.submit(handler, [batch])
+        pool.shutdown()
+        for name in 'abc':
+            self.assertEqual(range(10), [b[0] for n, b in log if n == name])
+
+        metrics = pool.metrics()
+        self.assertEqual(4, metrics['workers'])
+        self.assertEqual(0, metrics['depth'])
+        self.assertTrue(metrics['max_depth'] >= 1)
+        self.assertTrue(metrics['max_latency'] >= metrics['latency'] > 0)
+        self.assertRaises(ParameterException, lambda: ModbusWorkerPool(0))
+
+    def testWorkerPoolBlocksAFullConnection(self):
+        ''' Test that a connection cannot queue more than the backlog '''
+        pool    = ModbusWorkerPool(1, backlog=2)
+        handler = mockBlockedHandler()
+        pool.submit(handler, [0])
+        handler.started.wait()
+        pool.submit(handler, [1])
+        pool.submit(handler, [2])
+        reader = threading.Thread(target=pool.submit, args=(handler, [3]))
+        reader.start()
+        reader.join(0.05)
+        self.assertTrue(reader.is_alive())
+        metrics = pool.metrics()
+        self.assertEqual((2, 1), (metrics['depth'], metrics['blocked']))
+
+        handler.release.set()
+        reader.join()
+        pool.shutdown()
+        self.assertEqual([[0], [1], [2], [3]], handler.log)
+        self.assertEqual(4, pool.metrics()['executed'])
+        self.assertRaises(ParameterException, lambda: ModbusWorkerPool(1, backlog=0))
+
+    def testThreadedServerWithWorkers(self):
+        ''' Test that the threaded server answers through its worker pool '''
+        context = ModbusServerContext(slaves=ModbusSlaveContext())
+        server  = ModbusTcpServer(context, address=('127.0.0.1', 0), workers=2)
+        thread  = threading.Thread(target=server.serve_forever, args=(0.01,))
+        thread.start()
+        try:
+            connection = socket.create_connection(server.server_address)
+            connection.sendall(_burst(20))
+            framer, responses = ModbusSocketFramer(ClientDecoder()), []
+            while len(responses) < 20:
+                responses += framer.processIncomingFrames(connection.recv(4096))
+            self.assertEqual(range(1, 21), [r.transaction_id for r in responses])
+            connection.close()
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+        self.assertEqual(20, server.pool.metrics()['executed'])
+
+    def testPreforkServerSharesTheDatastore(self):
+        ''' Test that every server process sees the writes of the others '''
+        from pymodbus.client.sync import ModbusTcpClient
+        slave   = ModbusSlaveContext(hr=ModbusSharedDataBlock(0x00, [0x00]*10))
+        context = ModbusServerContext(slaves=slave)
+        server  = ModbusPreforkTcpServer(context, address=('127.0.0.1', 0),
+            processes=2, backend='selector')
+        thread  = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            host, port = server.server_address
+            clients = [ModbusTcpClient(host, port) for _ in range(6)]
+            for value, client in enumerate(clients):
+                client.write_register(1, value)
+                for reader in clients:
+                    self.assertEqual([value], reader.read_holding_registers(1, 1).registers)
+            for client in clients: client.close()
+            self.assertEqual(2, len(server.children))
+        finally:
+            server.server_close()
+            thread.join()
+        self.assertEqual(set(), server.children)
+        self.assertEqual([0x05], slave.getValues(3, 1, 1))
+        self.assertRaises(ParameterException, lambda: ModbusPreforkTcpServer(
+            context, address=('127.0.0.1', 0), backend='unknown'))
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+import unittest
+import logging
+from pymodbus import trace
+from pymodbus.trace import Tracer, getTracer
+
+#---------------------------------------------------------------------------#
+# Mock Classes
+#---------------------------------------------------------------------------#
+class mockHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+    def emit(self, record): self.messages.append(record.getMessage())
+
+#---------------------------------------------------------------------------#
+# Fixture
+#---------------------------------------------------------------------------#
+class ModbusTraceTest(unittest.TestCase):
+    '''
+    This is the unittest for the pymodbus.trace module
+    '''
+
+    def setUp(self):
+        ''' Sets up the test environment '''
+        self.handler = mockHandler()
+        self.logger  = logging.getLogger('pymodbus.test')
+        self.logger.addHandler(self.handler)
+        self.levels  = [(name, logging.getLogger(name).level) for name
+            in ['pymodbus', 'pymodbus.test', 'pymodbus.test.child']]
+
+    def tearDown(self):
+        ''' Cleans up the test environment '''
+        self.logger.removeHandler(self.handler)
+        for name, level in self.levels:
+            logging.getLogger(name).setLevel(level)
+        trace.refresh()
+
+    def testGetTracer(self):
+        ''' Test that each subsystem has a single tracer '''
+        tracer = getTracer('pymodbus.test')
+        self.assertTrue(isinstance(tracer, Tracer))
+        self.assertTrue(tracer is getTracer('pymodbus.test'))
+        self.assertEqual('pymodbus.test', tracer.name)
+
+    def testEnableAndDisable(self):
+        ''' Test turning the tracing of a subsystem on and off '''
+        parent = getTracer('pymodbus.test')
+        child  = getTracer('pymodbus.test.child')
+        other  = getTracer('pymodbus.other')
+
+        trace.disable()
+        self.assertFalse(parent.enabled or child.enabled or other.enabled)
+        trace.enable('pymodbus.test')
+        self.assertTrue(parent.enabled and child.enabled)
+        self.assertFalse(other.enabled)
+        trace.disable('pymodbus.test.child')
+        self.assertTrue(parent.enabled)
+        self.assertFalse(child.enabled)
+
+    def testDisableRestoresLevel(self):
+        ''' Test that disabling the tracing restores the previous level '''
+        tracer = getTracer('pymodbus.test')
+        self.logger.setLevel(logging.WARNING)
+        trace.enable('pymodbus.test')
+        trace.enable('pymodbus.test')
+        self.assertTrue(tracer.enabled)
+        trace.disable('pymodbus.test')
+        self.assertEqual(logging.WARNING, self.logger.level)
+        self.assertFalse(tracer.enabled)
+        trace.disable('pymodbus.test')
+        self.assertEqual(logging.WARNING, self.logger.level)
+
+        self.logger.setLevel(logging.NOTSET)
+        logging.getLogger('pymodbus').setLevel(logging.ERROR)
+        trace.enable('pymodbus.test')
+        trace.disable('pymodbus.test')
+        self.assertEqual(logging.NOTSET, self.logger.level)
+        self.assertEqual(logging.ERROR, self.logger.getEffectiveLevel())
+
+    def testRefresh(self):
+        ''' Test that a tracer only samples the level when refreshed '''
+        tracer = getTracer('pymodbus.test')
+        trace.disable('pymodbus.test')
+        self.logger.setLevel(logging.DEBUG)
+        self.assertFalse(tracer.enabled)
+        trace.refresh()
+        self.assertTrue(tracer.enabled)
+
+    def testLazyDebug(self):
+        ''' Test that the trace messages are formatted lazily '''
+        tracer = getTracer('pymodbus.test')
+        trace.enable('pymodbus.test')
+        tracer.debug("read[%d] %d:%d", 3, 1, 10)
+        self.assertEqual(["read[3] 1:10"], self.handler.messages)
+
+#---------------------------------------------------------------------------#
+# Main
+#---------------------------------------------------------------------------#
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,30 @@
 #!/usr/bin/env python
 import unittest
+import time
+import struct
 from binascii import a2b_hex
 from pymodbus.pdu import *
 from pymodbus.transaction import *
-from pymodbus.factory import ServerDecoder
+from pymodbus.exceptions import NotImplementedException
+from pymodbus.utilities import computeCRC
+from pymodbus.factory import ServerDecoder, ClientDecoder
+from pymodbus.register_read_message import ReadHoldingRegistersRequest
+
+#---------------------------------------------------------------------------#
+# Mock Classes
+#---------------------------------------------------------------------------#
+class mockClient(object):
+    ''' Replays a canned response a chunk at a time '''
+    def __init__(self, framer, response):
+        self.framer, self.response, self.reads = framer, response, []
+    def connect(self): return True
+    def close(self): pass
+    def _send(self, packet): return len(packet)
+    def _recv(self, size):
+        self.reads.append(size)
+        data, self.response = self.response[:size], self.response[size:]
+        return data
+
 
 class ModbusTransactionTest(unittest.TestCase):
     '''
@@ -34,12 +55,52 @@ class ModbusTransactionTest(unittest.TestCase):
     #---------------------------------------------------------------------------# 
     def testModbusTransactionManagerTID(self):
         ''' Test the tcp transaction manager TID '''
-        self.assertEqual(id(self._manager), id(ModbusTransactionManager()))
         for tid in range(1, self._manager.getNextTID() + 10):
-            self.assertEqual(tid+2, self._manager.getNextTID())
+            self.assertEqual(tid+1, self._manager.getNextTID())
         self._manager.resetTID()
         self.assertEqual(1, self._manager.getNextTID())
 
+    def testModbusTransactionManagerPerClient(self):
+        ''' Test that each manager has its own tid space and table '''
+        other = ModbusTransactionManager()
+        self.assertNotEqual(id(self._manager), id(other))
+        self._manager.resetTID()
+        self.assertEqual(1, self._manager.getNextTID())
+        self.assertEqual(2, self._manager.getNextTID())
+        self.assertEqual(1, other.getNextTID())
+
+        handle = ModbusRequest()
+        handle.transaction_id = 1
+        self._manager.addTransaction(handle)
+        self.assertEqual(None, other.getTransaction(1))
+        self.assertEqual(handle, self._manager.getTransaction(1))
+
+    def testModbusTransactionManagerTIDWraps(self):
+        ''' Test that the manager tid wraps at 16 bits '''
+        for _ in range(0xffff): self._manager.getNextTID()
+        self.assertEqual(0, self._manager.getNextTID())
+        self.assertEqual(1, self._manager.getNextTID())
+
+    def testModbusTransactionManagerThreaded(self):
+        ''' Test the transaction manager under concurrent access '''
+        import threading
+        count, handles, errors = 500, [], []
+
+        def worker():
+            for _ in range(count):
+                handle = ModbusRequest()
+                handle.transaction_id = self._manager.getNextTID()
+                handles.append(handle.transaction_id)
+                self._manager.addTransaction(handle)
+                if self._manager.getTransaction(handle.transaction_id) != handle:
+                    errors.append(handle.transaction_id)
+
+        workers = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in workers: thread.start()
+        for thread in workers: thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(8 * count, len(set(handles)))
+
     def testGetTransactionManagerTransaction(self):
         ''' Test the tcp transaction manager '''
         class Request: pass
@@ -63,9 +124,146 @@ class ModbusTransactionTest(unittest.TestCase):
         self._manager.delTransaction(handle.transaction_id)
         self.assertEqual(None, self._manager.getTransaction(handle.transaction_id))
 
-    #---------------------------------------------------------------------------# 
+    def testTransactionManagerExactRead(self):
+        ''' Test that the transaction manager reads exactly one frame '''
+        framer = ModbusSocketFramer(ClientDecoder())
+        client = mockClient(framer, "\x00\x01\x00\x00\x00\x07\x01\x03"
+            "\x04\x00\x0a\x00\x0b" + "\xff" * 32)
+        manager = ModbusTransactionManager(client)
+        manager.resetTID()
+        response = manager.execute(ReadHoldingRegistersRequest(0, 2))
+        self.assertEqual([7, 6], client.reads)
+        self.assertEqual([10, 11], response.registers)
+
+        framer = ModbusRtuFramer(ClientDecoder())
+        client = mockClient(framer, "\x01\x03\x04\x00\x0a\x00\x0b\x9b\xf6")
+        manager = ModbusTransactionManager(client)
+        response = manager.execute(ReadHoldingRegistersRequest(0, 2))
+        self.assertEqual([2, 1, 6], client.reads)
+        self.assertEqual([10, 11], response.registers)
+
+        framer = ModbusBinaryFramer(ClientDecoder())
+        client = mockClient(framer, "{\x01\x03\x02\x00}}\x11\x22}" + "\xff" * 8)
+        manager = ModbusTransactionManager(client)
+        manager.execute(ReadHoldingRegistersRequest(0, 1))
+        self.assertEqual([3, 2, 4, 1], client.reads)
+        self.assertEqual("\xff" * 8, client.response)
+
+    def testTransactionManagerEndsFrameOnSilence(self):
+        ''' Test that a frame that cannot be sized ends with the read '''
+        unknown = '\x01\x41\x04\x03\x06\x00\x2a'
+        unknown += struct.pack('>H', computeCRC(unknown))
+        framer = ModbusRtuFramer(ClientDecoder(), baudrate=9600)
+        client = mockClient(framer, unknown)
+        manager = ModbusTransactionManager(client)
+        self.assertEqual(None, manager.execute(ReadHoldingRegistersRequest(0, 2)))
+        self.assertEqual([2, 1024], client.reads)
+
+        client.response, client.reads = "\x01\x03\x04\x00\x0a\x00\x0b\x9b\xf6", []
+        response = manager.execute(ReadHoldingRegistersRequest(0, 2))
+        self.assertEqual([2, 1, 6], client.reads)
+        self.assertEqual([10, 11], response.registers)
+
+    def testTransactionManagerFallbackRead(self):
+        ''' Test that framers which cannot size a frame read in one go '''
+        class Framer(ModbusSocketFramer):
+            def calculateFrameSize(self, data):
+                raise NotImplementedException()
+        client = mockClient(Framer(ClientDecoder()), "")
+        manager = ModbusTransactionManager(client)
+        self.assertEqual(None, manager.execute(ReadHoldingRegistersRequest(0, 2)))
+        self.assertEqual([1024], client.reads)
+
+    def testFramerCalculateFrameSize(self):
+        ''' Test the framers calculate the size of the next frame '''
+        tcp = ModbusSocketFramer(ClientDecoder())
+        self.assertEqual(7, tcp.calculateFrameSize(""))
+        self.assertEqual(7, tcp.calculateFrameSize("\x00\x01\x00"))
+        self.assertEqual(13, tcp.calculateFrameSize("\x00\x01\x00\x00\x00\x07\x01"))
+
+        rtu = ModbusRtuFramer(ClientDecoder())
+        self.assertEqual(2, rtu.calculateFrameSize("\x01"))
+        self.assertEqual(3, rtu.calculateFrameSize("\x01\x03"))
+        self.assertEqual(9, rtu.calculateFrameSize("\x01\x03\x04"))
+        self.assertEqual(8, rtu.calculateFrameSize("\x01\x06"))
+        self.assertEqual(5, rtu.calculateFrameSize("\x01\x83"))
+
+        ascii = ModbusAsciiFramer(ClientDecoder())
+        self.assertEqual(5, ascii.calculateFrameSize(""))
+        self.assertEqual(7, ascii.calculateFrameSize(":0103"))
+        self.assertEqual(19, ascii.calculateFrameSize(":010304"))
+        self.assertEqual(11, ascii.calculateFrameSize(":0183"))
+
+        binary = ModbusBinaryFramer(ClientDecoder())
+        self.assertEqual(3, binary.calculateFrameSize(""))
+        self.assertEqual(5, binary.calculateFrameSize("{\x01\x03"))
+        self.assertEqual(9, binary.calculateFrameSize("{\x01\x03\x02"))
+        self.assertEqual(7, binary.calculateFrameSize("{\x01\x03\x02\x00}"))
+        self.assertEqual(10, binary.calculateFrameSize("{\x01\x03\x02\x00}}"))
+        self.assertEqual(10, binary.calculateFrameSize("{\x01\x03\x02\x00}}\x11\x22}"))
+        self.assertEqual(4, binary.calculateFrameSize("{\x01\x41"))
+        self.assertEqual(6, binary.calculateFrameSize("{\x01\x41\x00\x11}"))
+        self.assertEqual(8, binary.calculateFrameSize("{\x01\x41\x00}}\x11}"))
+        self.assertEqual(4, binary.calculateFrameSize("{\x01\x41}\x00\x11"))
+
+    #---------------------------------------------------------------------------#
+    # Receive Buffer tests
+    #---------------------------------------------------------------------------#
+    def testReceiveBuffer(self):
+        ''' Test the framer receive buffer '''
+        buffer = ModbusReceiveBuffer(threshold=4)
+        self.assertEqual(0, len(buffer))
+        buffer.append("\x01\x02\x03")
+        buffer.append("\x04\x05\x06")
+        self.assertEqual(6, len(buffer))
+        self.assertEqual("\x02", buffer[1])
+        self.assertEqual("\x06", buffer[-1])
+        self.assertEqual("\x02\x03", buffer.view(1, 3))
+        self.assertEqual(4, buffer.find("\x05"))
+        buffer.consume(2)
+        self.assertEqual(4, len(buffer))
+        self.assertEqual("\x03\x04\x05\x06", buffer.view())
+        self.assertEqual(2, buffer.find("\x05"))
+        self.assertEqual(-1, buffer.find("\x01"))
+        buffer.consume(3)   # passes the threshold and compacts
+        self.assertEqual("\x06", buffer.view())
+        buffer.clear()
+        self.assertEqual(0, len(buffer))
+        self.assertEqual("", buffer.view())
+
+    def testReceiveBufferHeldView(self):
+        ''' Test that a held view is not corrupted by the buffer '''
+        buffer = ModbusReceiveBuffer(threshold=1)
+        buffer.append("\x01\x02\x03\x04")
+        held = buffer.view(0, 2)
+        buffer.consume(2)
+        buffer.append("\x05\x06")
+        self.assertEqual("\x01\x02", held)
+        self.assertEqual("\x03\x04\x05\x06", buffer.view())
+
+    #---------------------------------------------------------------------------#
     # TCP tests
-    #---------------------------------------------------------------------------# 
+    #---------------------------------------------------------------------------#
+    def testTCPFramerPipelinedBurst(self):
+        ''' Test a burst of back to back tcp frames in a single packet '''
+        msg = "\x00\x01\x00\x00\x00\x06\x01\x03\x00\x00\x00\x01"
+        results = []
+        self._tcp.processIncomingPacket(msg * 1000, results.append)
+        self.assertEqual(1000, len(results))
+        self.assertEqual(0, len(self._tcp._ModbusSocketFramer__buffer))
+        for result in results:
+            self.assertEqual(3, result.function_code)
+            self.assertEqual((0, 1), (result.address, result.count))
+
+    def testTCPFramerTransactionPartial(self):
+        ''' Test that a frame is not ready until all of it has arrived '''
+        msg = "\x00\x01\x12\x34\x00\x06\xff\x02\x01\x02\x00\x08"
+        self._tcp.addToFrame(msg[:-1])
+        self.assertFalse(self._tcp.checkFrame())
+        self._tcp.addToFrame(msg[-1:])
+        self.assertTrue(self._tcp.checkFrame())
+        self.assertEqual(msg[7:], self._tcp.getFrame())
+
     def testTCPFramerTransactionReady(self):
         ''' Test a tcp frame transaction '''
         msg = "\x00\x01\x12\x34\x00\x04\xff\x02\x12\x34"
@@ -119,7 +317,7 @@ class ModbusTransactionTest(unittest.TestCase):
     def testTCPFramerTransactionShort(self):
         ''' Test that we can get back on track after an invalid message '''
         msg1 = "\x99\x99\x99\x99\x00\x01\x00\x01"
-        msg2 = "\x00\x01\x12\x34\x00\x05\xff\x02\x12\x34"
+        msg2 = "\x00\x01\x12\x34\x00\x04\xff\x02\x12\x34"
         self._tcp.addToFrame(msg1)
         self.assertFalse(self._tcp.checkFrame())
         result = self._tcp.getFrame()
@@ -215,6 +413,85 @@ class ModbusTransactionTest(unittest.TestCase):
 
         self.assertEqual(0x00, request.unit_id)
 
+    def testRTUFramerByteAtATime(self):
+        ''' Test a rtu frame trickling in a byte at a time '''
+        msg, result = "\x00\x01\x00\x00\x00\x01\xfc\x1b", []
+        for byte in msg[:-1]:
+            self._rtu.processIncomingPacket(byte, result.append)
+            self.assertEqual([], result)
+        self._rtu.processIncomingPacket(msg[-1], result.append)
+        self.assertEqual(1, len(result))
+
+        bad = msg[:-1] + '\x1c'
+        self._rtu.addToFrame(bad)
+        self.assertFalse(self._rtu.checkFrame())
+
+    def testRTUFramerResynchronize(self):
+        ''' Test that the timing rtu framer skips a corrupt frame '''
+        framer, result = ModbusRtuFramer(self.decoder, baudrate=9600), []
+        request = ReadHoldingRegistersRequest(0x10, 2)
+        request.unit_id = 0x01
+        packet = framer.buildPacket(request)
+        corrupt = packet[:3] + '\xff' + packet[4:]
+
+        framer.processIncomingPacket(corrupt + packet + packet, result.append)
+        self.assertEqual(2, len(result))
+        self.assertEqual((0x10, 2), (result[0].address, result[0].count))
+        self.assertEqual(0x01, result[1].unit_id)
+
+        # the default framer waits on the corrupt frame
+        result = []
+        self._rtu.processIncomingPacket(corrupt + packet, result.append)
+        self.assertEqual([], result)
+
+    def testRTUFramerSplitOnSilence(self):
+        ''' Test that the timing rtu framer splits frames on silence '''
+        framer, result = ModbusRtuFramer(self.decoder, baudrate=1200), []
+        request = ReadHoldingRegistersRequest(0x10, 2)
+        request.unit_id = 0x01
+        packet  = framer.buildPacket(request)
+        unknown = '\x01\x41\x01\x02'
+        unknown += struct.pack('>H', computeCRC(unknown))
+
+        framer.processIncomingPacket(unknown, result.append)
+        self.assertEqual([], result)                # cannot be sized
+        time.sleep(0.05)                            # > 3.5 chars at 1200 baud
+        framer.processIncomingPacket(packet[:3], result.append)
+        self.assertEqual(1, len(result))            # ended by the silence
+        self.assertEqual(0x41, result[0].function_code)
+        self.assertEqual(0x01, result[0].unit_id)
+
+        time.sleep(0.05)                            # the partial frame is noise
+        framer.processIncomingPacket(packet, result.append)
+        self.assertEqual(2, len(result))
+        self.assertEqual(0x10, result[1].address)
+
+        # the default framer stalls on the unknown function code
+        result = []
+        self._rtu.processIncomingPacket(unknown + packet, result.append)
+        self.assertEqual([], result)
+        self._rtu.processSilence(result.append)
+        self.assertEqual([], result)
+
+    def testRTUFramerProcessSilence(self):
+        ''' Test that a read loop can end a frame on silence '''
+        framer, result = ModbusRtuFramer(self.decoder, baudrate=9600), []
+        unknown = '\x01\x41\x01\x02'
+        unknown += struct.pack('>H', computeCRC(unknown))
+        self.assertRaises(NotImplementedException,
+            lambda: framer.calculateFrameSize(unknown[:2]))
+
+        framer.processIncomingPacket(unknown, result.append)
+        self.assertEqual([], result)
+        framer.processSilence(result.append)        # no wait for more data
+        self.assertEqual(1, len(result))
+        self.assertEqual(0x41, result[0].function_code)
+
+        framer.processIncomingPacket(unknown[:3], result.append)
+        framer.processSilence(result.append)        # noise is dropped
+        framer.processSilence(result.append)
+        self.assertEqual(1, len(result))
+
     def testRTUFramerPacket(self):
         ''' Test a rtu frame packet build '''
         old_encode = ModbusRequest.encode
@@ -227,6 +504,25 @@ class ModbusTransactionTest(unittest.TestCase):
         self.assertEqual(expected, actual)
         ModbusRequest.encode = old_encode
 
+    def testPreparedRequestPacket(self):
+        ''' Test that a prepared request only patches the transaction id '''
+        request = ReadHoldingRegistersRequest(0x10, 0x02, unit=0x11)
+        prepared = ModbusPreparedRequest(request, self._tcp)
+        for tid in [0x0001, 0x1234, 0xffff]:
+            request.transaction_id = prepared.transaction_id = tid
+            self.assertEqual(self._tcp.buildPacket(request),
+                self._tcp.buildPacket(prepared))
+        self.assertEqual(0x11, prepared.unit_id)
+        self.assertEqual(0x03, prepared.function_code)
+
+        request.address = 0x20  # changes after preparing are not seen
+        self.assertEqual("\x00\x10", self._tcp.buildPacket(prepared)[8:10])
+
+        for framer in [self._rtu, self._ascii]:
+            prepared = ModbusPreparedRequest(request, framer)
+            prepared.transaction_id = 0x4321
+            self.assertEqual(framer.buildPacket(request), prepared.buildPacket())
+
     #---------------------------------------------------------------------------# 
     # ASCII tests
     #---------------------------------------------------------------------------# 
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 import unittest
 import struct
+from array import array
 from pymodbus.utilities import pack_bitstring, unpack_bitstring
-from pymodbus.utilities import checkCRC, checkLRC
+from pymodbus.utilities import checkCRC, checkLRC, computeCRC, updateCRC
 from pymodbus.utilities import dict_property, default
+from pymodbus.utilities import pack_registers, unpack_registers
+from pymodbus.utilities import BitArray, PackedRegisters
 
 _test_master = {4 : 'd'}
 class DictPropertyTester(object):
@@ -71,6 +74,86 @@ class SimpleUtilityTest(unittest.TestCase):
         self.assertEqual(unpack_bitstring('\x55'), self.bits)
         self.assertEqual(pack_bitstring(self.bits), '\x55')
 
+    def testBitPackingLarge(self):
+        ''' Test the bit packing functions on odd and large sizes '''
+        def reference(bits):  # a bit at a time
+            result = [0] * ((len(bits) + 7) / 8)
+            for index, bit in enumerate(bits):
+                if bit: result[index / 8] |= 1 << (index % 8)
+            return ''.join(map(chr, result))
+
+        bits = [(i * 7) % 3 == 0 for i in range(2000)]
+        for size in (0, 1, 7, 8, 9, 1999, 2000):
+            self.assertEqual(reference(bits[:size]), pack_bitstring(bits[:size]))
+        packed = pack_bitstring(bits)
+        self.assertEqual(bits, unpack_bitstring(packed))
+        self.assertEqual(bits, unpack_bitstring(memoryview(packed)))
+        self.assertEqual('\x05', pack_bitstring([1, 0, 7]))
+        self.assertEqual('\x05', pack_bitstring(['x', None, -1]))
+        self.assertEqual('', pack_bitstring([]))
+
+    def testBitUnpackingCompact(self):
+        ''' Test unpacking bits into a compact bit array '''
+        result = unpack_bitstring('\x55\x01', compact=True)
+        self.assertTrue(isinstance(result, bytearray))
+        self.assertEqual(self.bits + [True] + [False] * 7, [bool(b) for b in result])
+        self.assertEqual('\x55\x01', pack_bitstring(result))
+        self.assertEqual(bytearray(), unpack_bitstring('', compact=True))
+
+    def testBitArray(self):
+        ''' Test the packed bit array '''
+        bits = BitArray('\x55\xff', 10)
+        self.assertEqual(self.bits + [True, True], bits)
+        self.assertEqual(10, len(bits))
+        self.assertEqual('\x55\x03', bits.packed)
+        self.assertEqual('\x55\x03', pack_bitstring(bits))
+        self.assertEqual([True, False], bits[0:2])
+        self.assertTrue(bits[-1])
+        self.assertFalse(bits[1])
+        self.assertRaises(IndexError, lambda: bits[10])
+        bits[1] = True
+        bits[-1] = False
+        self.assertEqual('\x57\x01', bits.packed)
+        self.assertNotEqual(self.bits, bits)
+        self.assertEqual(BitArray('\x55'), self.bits)
+        self.assertEqual([], BitArray())
+
+        import pickle
+        self.assertEqual(bits, pickle.loads(pickle.dumps(bits)))
+
+    def testRegisterPacking(self):
+        ''' Test the register packing functions '''
+        values = [(i * 2654435761) & 0xffff for i in range(125)]
+        packed = struct.pack('>125H', *values)
+        self.assertEqual(packed, pack_registers(values))
+        self.assertEqual(packed, pack_registers(array('H', values)))
+        self.assertEqual('', pack_registers([]))
+        self.assertRaises(OverflowError, lambda: pack_registers([0x10000]))
+
+        registers = unpack_registers(packed)
+        self.assertTrue(isinstance(registers, list))
+        self.assertEqual(values, registers)
+        self.assertEqual(values, unpack_registers(memoryview(packed)))
+        self.assertEqual([], unpack_registers(''))
+
+    def testPackedRegisters(self):
+        ''' Test the register array kept in wire order '''
+        values    = [(i * 2654435761) & 0xffff for i in range(125)]
+        registers = PackedRegisters(pack_registers(values))
+        self.assertEqual(125, len(registers))
+        self.assertEqual(values, registers)
+        self.assertEqual(registers, array('H', values))
+        self.assertEqual(pack_registers(values), pack_registers(registers))
+        self.assertEqual(values[7], registers[7])
+        self.assertEqual(values[-1], registers[-1])
+        self.assertEqual(values[3:9], list(registers[3:9]))
+        self.assertRaises(IndexError, lambda: registers[125])
+        self.assertNotEqual(values[:-1], registers)
+        self.assertEqual([], PackedRegisters())
+
+        import pickle
+        self.assertEqual(values, pickle.loads(pickle.dumps(registers)))
+
     def testLongitudinalRedundancyCheck(self):
         ''' Test the longitudinal redundancy check code '''
         self.assertTrue(checkLRC(self.data, 0x1c))
@@ -81,6 +164,32 @@ class SimpleUtilityTest(unittest.TestCase):
         self.assertTrue(checkCRC(self.data, 0xe2db))
         self.assertTrue(checkCRC(self.string, 0x889e))
 
+    def testCyclicRedundancyCheckUpdate(self):
+        ''' Test the incremental cyclic redundancy check code '''
+        def reference(data):  # the classic byte at a time version
+            crc = 0xffff
+            for byte in bytearray(data):
+                crc ^= byte
+                for bit in range(8):
+                    if crc & 1: crc = (crc >> 1) ^ 0xa001
+                    else: crc >>= 1
+            return ((crc << 8) & 0xff00) | (crc >> 8)
+
+        data = ''.join(chr((i * 37 + 11) & 0xff) for i in range(300))
+        for size in (0, 1, 7, 8, 15, 16, 17, 255, 256, 300):
+            self.assertEqual(reference(data[:size]), computeCRC(data[:size]))
+            self.assertEqual(reference(data[:size]), computeCRC(memoryview(data)[:size]))
+            self.assertEqual(reference(data[:size]), computeCRC(bytearray(data[:size])))
+            self.assertEqual(reference(data[:size]),
+                computeCRC(memoryview(bytearray(data))[:size]))
+
+        crc = 0xffff
+        for start in range(0, 300, 13):
+            crc = updateCRC(crc, data[start:start + 13])
+        self.assertEqual(computeCRC(data), crc)
+        self.assertEqual(0, updateCRC(crc, struct.pack('>H', crc)))
+        self.assertEqual(0, updateCRC(0xffff, self.data + struct.pack('>H', 0xe2db)))
+
 #---------------------------------------------------------------------------#
 # Main
 #---------------------------------------------------------------------------#